@@ -0,0 +1,79 @@
+"""
+Tempo de importação dos módulos do pacote, cada um num interpretador novo,
+e quais dependências pesadas (Pillow, zbar, NumPy, Qt) cada um carrega.
+
+Falha (código de saída 1) se algum módulo não puder ser importado ou se um
+módulo que deveria ser leve passar a carregar alguma dependência proibida,
+para que a abertura do programa não volte a ficar lenta sem ninguém perceber.
+
+Uso: uv run python -m benchmarks.bench_import [--repeat N]
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+
+HEAVY_MODULES = ("PIL", "pyzbar", "numpy", "PySide6")
+
+# Módulo -> dependências pesadas que ele não pode carregar ao ser importado
+BUDGETS: dict[str, tuple[str, ...]] = {
+    "bar_code_reader.guides": HEAVY_MODULES,
+    "bar_code_reader.decode_types": HEAVY_MODULES,
+    "bar_code_reader.cli": HEAVY_MODULES,
+    "bar_code_reader.server": HEAVY_MODULES,
+    "bar_code_reader.main_window": ("PIL", "pyzbar", "numpy"),
+    "bar_code_reader.decode_bar": ("PySide6", "numpy"),
+}
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+heavy = sorted({{name.split(".")[0] for name in sys.modules}} & set({heavy!r}))
+print(json.dumps([elapsed, heavy]))
+"""
+
+
+def measure(module: str) -> tuple[float, list[str]]:
+    """Importa ``module`` num processo novo e mede só a importação."""
+    probe = _PROBE.format(module=module, heavy=HEAVY_MODULES)
+    output = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", probe], capture_output=True, text=True, check=True
+    ).stdout
+    elapsed, heavy = json.loads(output)
+    return elapsed, heavy
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", "-n", type=int, default=5)
+    args = parser.parse_args()
+
+    failed = False
+    print(f"{'módulo':<32} {'ms':>8}  carrega")
+    for module, forbidden in BUDGETS.items():
+        # Melhor de N execuções: a primeira também paga o cache de disco
+        try:
+            runs = [measure(module) for _ in range(args.repeat)]
+        except subprocess.CalledProcessError as e:
+            # Ex.: zbar ausente; os demais módulos continuam sendo medidos
+            print(f"{module:<32} {'-':>8}  ERRO: importação falhou")
+            print(e.stderr.rstrip(), file=sys.stderr)
+            failed = True
+            continue
+        elapsed = min(run[0] for run in runs) * 1000
+        heavy = runs[0][1]
+        violations = sorted(set(heavy) & set(forbidden))
+        status = f"  ERRO: não deveria carregar {', '.join(violations)}"
+        print(
+            f"{module:<32} {elapsed:>8.1f}  {', '.join(heavy) or '-'}"
+            f"{status if violations else ''}"
+        )
+        failed = failed or bool(violations)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,53 @@
+"""
+Tempo de leitura por perfil de simbologia, comparado ao ``pyzbar.decode``
+com todas as simbologias (o comportamento original do ``DecodeBar``).
+
+Uso: uv run python -m benchmarks.bench_profiles [--repeat N]
+"""
+
+import argparse
+import timeit
+from collections.abc import Callable
+
+from PIL import Image
+from pyzbar import pyzbar
+
+from bar_code_reader.zbar_decoder import DecodeProfile, get_decoder
+from benchmarks.synthetic import SAMPLE_TRANSFER_CODE, pad_canvas, render_i25
+
+
+def _fixtures() -> dict[str, Image.Image]:
+    code = render_i25(SAMPLE_TRANSFER_CODE)
+    return {
+        "seleção justa": code,
+        "captura 1280x720": pad_canvas(code, 1280, 720),
+        "captura 1920x1080": pad_canvas(code, 1920, 1080),
+    }
+
+
+def _measure(function: Callable[[], object], repeat: int) -> float:
+    # Melhor média entre 5 rodadas, em milissegundos
+    return min(timeit.repeat(function, number=repeat, repeat=5)) / repeat * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", "-n", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'imagem':<20} {'leitor':<16} {'ms':>8} {'ganho':>7}")
+    for name, image in _fixtures().items():
+        baseline = _measure(lambda image=image: pyzbar.decode(image), args.repeat)
+        print(f"{name:<20} {'pyzbar.decode':<16} {baseline:>8.2f} {'1.00x':>7}")
+        for profile in DecodeProfile:
+            decoder = get_decoder(profile)
+            elapsed = _measure(
+                lambda image=image, decoder=decoder: decoder.decode(image),
+                args.repeat,
+            )
+            speedup = f"{baseline / elapsed:.2f}x"
+            print(f"{name:<20} {profile.value:<16} {elapsed:>8.2f} {speedup:>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,287 @@
+"""
+Suíte de benchmarks dos caminhos críticos: dígitos verificadores, montagem
+das guias, pré-processamento e leitura de imagens sintéticas e a latência
+da captura até a linha digitável. As imagens são geradas em memória
+(``benchmarks.synthetic``).
+
+Os resultados podem ser salvos como linha de base em JSON e comparados em
+execuções seguintes; a comparação falha (código de saída 1) quando algum
+benchmark fica mais lento que o limite tolerado.
+
+Uso:
+    uv run python -m benchmarks.run --save baseline.json
+    uv run python -m benchmarks.run --compare baseline.json [--threshold 0.1]
+"""
+
+import argparse
+import json
+import platform
+import sys
+import timeit
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from bar_code_reader.guides import (
+    CollectionGuide,
+    LineCode,
+    TransferGuide,
+    convert_code,
+)
+
+if TYPE_CHECKING:
+    from bar_code_reader.decode_types import GrayImage
+
+SAMPLE_COLLECTION_CODE = "83680000000566780048100018097565731300158963"
+SAMPLE_TRANSFER_CODE = "23799552000003700003381260007827139500006330"
+
+# (largura, altura) da captura; None = seleção justa em volta do código
+DECODE_SIZES: tuple[tuple[int, int] | None, ...] = (
+    None,
+    (640, 480),
+    (1280, 720),
+    (1920, 1080),
+)
+DECODE_NOISE = (0.0, 20.0, 40.0)
+
+
+@dataclass(frozen=True, slots=True)
+class Benchmark:
+    group: str
+    name: str
+    function: Callable[[], object]
+    # Conferência feita uma vez antes da medição (ex.: o código foi lido?)
+    check: Callable[[], bool] | None = None
+
+
+def check_digit_benchmarks() -> Iterator[Benchmark]:
+    collection = CollectionGuide(SAMPLE_COLLECTION_CODE)
+    transfer = TransferGuide(SAMPLE_TRANSFER_CODE)
+    block = SAMPLE_COLLECTION_CODE[:11]
+    sem_dv = SAMPLE_TRANSFER_CODE[:4] + SAMPLE_TRANSFER_CODE[5:]
+    yield Benchmark(
+        "check_digit",
+        "collection.calc_modulo10",
+        lambda: collection.calc_modulo10(block),
+    )
+    yield Benchmark(
+        "check_digit",
+        "collection.calc_modulo11",
+        lambda: collection.calc_modulo11(block),
+    )
+    yield Benchmark(
+        "check_digit",
+        "transfer.calc_modulo10",
+        lambda: transfer.calc_modulo10(block),
+    )
+    yield Benchmark(
+        "check_digit",
+        "transfer.calc_modulo11",
+        lambda: transfer.calc_modulo11(sem_dv),
+    )
+
+
+def _build_str(cls: type[LineCode], code: str) -> str:
+    # Objeto novo a cada chamada: mede o cálculo dos campos, não o cache
+    return str(cls(code))
+
+
+def _build_repr(cls: type[LineCode], code: str) -> str:
+    return repr(cls(code))
+
+
+def guide_benchmarks() -> Iterator[Benchmark]:
+    for label, cls, code in (
+        ("collection", CollectionGuide, SAMPLE_COLLECTION_CODE),
+        ("transfer", TransferGuide, SAMPLE_TRANSFER_CODE),
+    ):
+        yield Benchmark("guides", f"{label}.init", partial(cls, code))
+        yield Benchmark("guides", f"{label}.str", partial(_build_str, cls, code))
+        yield Benchmark("guides", f"{label}.repr", partial(_build_repr, cls, code))
+        yield Benchmark(
+            "guides",
+            f"{label}.from_digitable_line",
+            partial(cls.from_digitable_line, str(cls(code))),
+        )
+
+
+def _decode(image: object, profile: str) -> list[str]:
+    from bar_code_reader.decode_bar import DecodeBar
+
+    return DecodeBar(image, profile=profile).decoded_codes()  # type: ignore[arg-type]
+
+
+def _reads(function: Callable[[], list[str]], expected: str) -> bool:
+    return expected in function()
+
+
+def decode_benchmarks() -> Iterator[Benchmark]:
+    # Importados aqui: os grupos acima não dependem de Pillow, NumPy nem zbar
+    from bar_code_reader.decode_types import DecodeProfile
+    from benchmarks.synthetic import pad_canvas, render_i25
+
+    for noise in DECODE_NOISE:
+        code_image = render_i25(SAMPLE_TRANSFER_CODE, noise=noise, seed=1)
+        for size in DECODE_SIZES:
+            image = code_image if size is None else pad_canvas(code_image, *size)
+            label = "justa" if size is None else f"{size[0]}x{size[1]}"
+            for profile in (DecodeProfile.BOLETO, DecodeProfile.ALL):
+                decode = partial(_decode, image, profile)
+                yield Benchmark(
+                    "decode",
+                    f"{label}.ruido{noise:.0f}.{profile.value}",
+                    decode,
+                    partial(_reads, decode, SAMPLE_TRANSFER_CODE),
+                )
+
+
+def _capture_to_line(capture: "GrayImage") -> list[str]:
+    from bar_code_reader.decode_bar import DecodeBar
+
+    decoder = DecodeBar(capture, scanline=capture.height // 2)
+    return [str(convert_code(code)) for code in decoder.decoded_codes()]
+
+
+def end_to_end_benchmarks() -> Iterator[Benchmark]:
+    from bar_code_reader.decode_types import GrayImage
+    from benchmarks.synthetic import pad_canvas, render_i25
+
+    # A captura chega como GrayImage (como a de ``qimage_to_gray``) e termina
+    # na linha digitável que vai para a área de transferência
+    line = str(convert_code(SAMPLE_TRANSFER_CODE))
+    for width, height in ((640, 200), (1920, 1080)):
+        canvas = pad_canvas(render_i25(SAMPLE_TRANSFER_CODE), width, height)
+        run = partial(_capture_to_line, GrayImage(canvas.tobytes(), width, height))
+        yield Benchmark(
+            "end_to_end", f"captura_{width}x{height}", run, partial(_reads, run, line)
+        )
+
+
+def preprocess_benchmarks() -> Iterator[Benchmark]:
+    # Só NumPy e Pillow: roda mesmo sem o zbar
+    from bar_code_reader.decode_types import GrayImage
+    from bar_code_reader.preprocess import Preprocessor
+    from benchmarks.synthetic import pad_canvas, render_i25
+
+    for width, height in ((1920, 1080), (3840, 2160)):
+        canvas = pad_canvas(render_i25(SAMPLE_TRANSFER_CODE), width, height)
+        capture = GrayImage(canvas.tobytes(), width, height)
+        preprocessor = Preprocessor()
+        yield Benchmark(
+            "preprocess",
+            f"localizacao_{width}x{height}",
+            partial(preprocessor.candidate_boxes, preprocessor.to_gray(capture)),
+        )
+
+
+def zbar_available() -> bool:
+    try:
+        from pyzbar import pyzbar  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def collect() -> Iterator[Benchmark]:
+    yield from check_digit_benchmarks()
+    yield from guide_benchmarks()
+    yield from preprocess_benchmarks()
+    if zbar_available():
+        yield from decode_benchmarks()
+        yield from end_to_end_benchmarks()
+    else:
+        print("zbar não encontrado: benchmarks de leitura ignorados", file=sys.stderr)
+
+
+def measure(function: Callable[[], object], repeat: int) -> float:
+    """Melhor tempo por chamada (em segundos) entre ``repeat`` rodadas."""
+    timer = timeit.Timer(function)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def format_time(seconds: float) -> str:
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.2f} ms"
+    return f"{seconds * 1e6:.2f} µs"
+
+
+def compare(
+    results: dict[str, dict[str, object]],
+    baseline: dict[str, dict[str, object]],
+    threshold: float,
+) -> bool:
+    """Mostra a variação em relação à linha de base; True se houve regressão."""
+    regressed = False
+    print(f"\n{'benchmark':<44} {'base':>11} {'atual':>11} {'variação':>9}")
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        before = float(baseline[name]["seconds"])  # type: ignore[arg-type]
+        after = float(result["seconds"])  # type: ignore[arg-type]
+        change = after / before - 1
+        flag = ""
+        if change > threshold:
+            flag = "  REGRESSÃO"
+            regressed = True
+        if baseline[name].get("ok") and not result.get("ok"):
+            flag += "  deixou de ler"
+            regressed = True
+        print(
+            f"{name:<44} {format_time(before):>11} {format_time(after):>11}"
+            f" {change:>+8.1%}{flag}"
+        )
+    return regressed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--repeat", "-n", type=int, default=5)
+    parser.add_argument(
+        "--filter", "-k", default="", help="Só os benchmarks cujo nome contém o texto"
+    )
+    parser.add_argument("--save", type=Path, help="Grava os resultados em JSON")
+    parser.add_argument(
+        "--compare", type=Path, help="Compara com uma linha de base salva"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.10,
+        help="Piora tolerada na comparação (padrão: 0.10 = 10%%)",
+    )
+    args = parser.parse_args()
+
+    results: dict[str, dict[str, object]] = {}
+    print(f"{'benchmark':<44} {'tempo':>11}  leitura")
+    for benchmark in collect():
+        name = f"{benchmark.group}.{benchmark.name}"
+        if args.filter not in name:
+            continue
+        ok = benchmark.check() if benchmark.check is not None else None
+        seconds = measure(benchmark.function, args.repeat)
+        results[name] = {"seconds": seconds, "ok": ok}
+        status = "" if ok is None else ("ok" if ok else "FALHOU")
+        print(f"{name:<44} {format_time(seconds):>11}  {status}", flush=True)
+
+    if args.save is not None:
+        report = {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "results": results,
+        }
+        args.save.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+    if args.compare is not None:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))["results"]
+        if compare(results, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,75 @@
+"""
+Imagens sintéticas de códigos Intercalado 2 de 5 (o padrão dos boletos),
+geradas em memória para os benchmarks não dependerem de arquivos externos.
+"""
+
+import numpy as np
+from PIL import Image
+
+# Larguras (N = estreita, W = larga) das barras/espaços de cada dígito
+_PADROES = {
+    "0": "NNWWN",
+    "1": "WNNNW",
+    "2": "NWNNW",
+    "3": "WWNNN",
+    "4": "NNWNW",
+    "5": "WNWNN",
+    "6": "NWWNN",
+    "7": "NNNWW",
+    "8": "WNNWN",
+    "9": "NWNWN",
+}
+_INICIO = "NNNN"
+_FIM = "WNN"
+
+
+def i25_modules(code: str, wide: int = 3) -> list[int]:
+    """
+    Larguras (em módulos) dos elementos do código, alternando barra e espaço
+    e começando por uma barra.
+    """
+    if len(code) % 2:
+        msg = f"O Intercalado 2 de 5 exige quantidade par de dígitos: {code}"
+        raise ValueError(msg)
+    elementos = _INICIO
+    for barras, espacos in zip(code[::2], code[1::2], strict=True):
+        elementos += "".join(
+            b + e for b, e in zip(_PADROES[barras], _PADROES[espacos], strict=True)
+        )
+    elementos += _FIM
+    return [wide if elemento == "W" else 1 for elemento in elementos]
+
+
+def render_i25(
+    code: str,
+    module_width: int = 2,
+    height: int = 80,
+    quiet_zone: int = 10,
+    noise: float = 0.0,
+    seed: int = 0,
+) -> Image.Image:
+    """
+    Desenha o código em tons de cinza. ``noise`` é o desvio padrão de um
+    ruído gaussiano somado aos pixels (0 = imagem limpa).
+    """
+    linha: list[int] = [255] * (quiet_zone * module_width)
+    for indice, largura in enumerate(i25_modules(code)):
+        cor = 0 if indice % 2 == 0 else 255
+        linha.extend([cor] * (largura * module_width))
+    linha.extend([255] * (quiet_zone * module_width))
+
+    pixels = np.tile(np.array(linha, dtype=np.float32), (height, 1))
+    if noise:
+        rng = np.random.default_rng(seed)
+        pixels += rng.normal(0, noise, pixels.shape).astype(np.float32)
+    return Image.fromarray(np.clip(pixels, 0, 255).astype(np.uint8))
+
+
+def pad_canvas(image: Image.Image, width: int, height: int) -> Image.Image:
+    """Centraliza a imagem numa tela branca maior (simula uma captura ampla)."""
+    canvas = Image.new("L", (width, height), 255)
+    canvas.paste(image, ((width - image.width) // 2, (height - image.height) // 2))
+    return canvas
+
+
+SAMPLE_TRANSFER_CODE = "23799552000003700003381260007827139500006330"
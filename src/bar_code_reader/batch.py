@@ -0,0 +1,124 @@
+import argparse
+import sys
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+
+from bar_code_reader.constants import IMAGE_EXTENSIONS, PDF_DEFAULT_DPI, PDF_EXTENSION
+from bar_code_reader.decode_bar import DecodeBar, convert_code
+from bar_code_reader.decode_types import DecodeProfile
+
+
+def expand_sources(paths: Iterable[str], *, recursive: bool = False) -> Iterator[Path]:
+    """
+    Expande diretórios nas imagens e PDFs que eles contêm, em ordem
+    alfabética. Os diretórios são lidos um de cada vez: só a listagem do
+    diretório atual (não a da árvore inteira) fica em memória para ser
+    ordenada. Arquivos informados diretamente são mantidos.
+    """
+    for raw_path in paths:
+        path = Path(raw_path)
+        if path.is_dir():
+            yield from _walk(path, recursive=recursive)
+        else:
+            yield path
+
+
+def _walk(directory: Path, *, recursive: bool) -> Iterator[Path]:
+    # Mesma ordem de sorted(rglob("*")): subdiretórios entram no lugar do
+    # nome. Como o rglob, não segue links para diretórios (evita ciclos)
+    extensions = IMAGE_EXTENSIONS | {PDF_EXTENSION}
+    for entry in sorted(directory.iterdir()):
+        if entry.is_dir():
+            if recursive and not entry.is_symlink():
+                yield from _walk(entry, recursive=recursive)
+        elif entry.suffix.lower() in extensions and entry.is_file():
+            yield entry
+
+
+def criar_parser_argumentos() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="bar-code-reader-batch",
+        description="Lê os códigos de barras de várias imagens e PDFs em paralelo",
+        epilog=(
+            "Saída: uma linha por código no formato 'arquivo;página;código;linha'."
+            " A página só é preenchida para PDFs."
+        ),
+    )
+    parser.add_argument(
+        "paths", nargs="+", help="Imagens, PDFs ou diretórios a processar"
+    )
+    parser.add_argument(
+        "--workers",
+        "-w",
+        type=int,
+        default=None,
+        help="Quantidade de processos (padrão: número de núcleos)",
+    )
+    parser.add_argument(
+        "--unordered",
+        "-u",
+        action="store_true",
+        help="Emite os resultados na ordem em que terminam, não na de entrada",
+    )
+    parser.add_argument(
+        "--recursive",
+        "-r",
+        action="store_true",
+        help="Percorre os subdiretórios",
+    )
+    parser.add_argument(
+        "--dpi",
+        type=int,
+        default=PDF_DEFAULT_DPI,
+        help=f"Resolução usada para rasterizar PDFs (padrão: {PDF_DEFAULT_DPI})",
+    )
+    parser.add_argument(
+        "--profile",
+        "-p",
+        type=DecodeProfile,
+        choices=list(DecodeProfile),
+        default=DecodeProfile.BOLETO,
+        help="Simbologias procuradas (padrão: boleto, só Intercalado 2 de 5)",
+    )
+    parser.add_argument(
+        "--cache",
+        metavar="ARQUIVO",
+        default=None,
+        help="Banco SQLite com os resultados já lidos, reaproveitado entre execuções",
+    )
+    return parser
+
+
+def main() -> int:
+    """
+    Processa o lote e retorna 0 se todos os arquivos foram lidos,
+    1 se algum falhou.
+    """
+    args = criar_parser_argumentos().parse_args()
+    sources = expand_sources(args.paths, recursive=args.recursive)
+    failed = False
+
+    results = DecodeBar.decode_many(
+        sources,
+        workers=args.workers,
+        ordered=not args.unordered,
+        dpi=args.dpi,
+        profile=args.profile,
+        cache_path=args.cache,
+    )
+    for result in results:
+        page = "" if result.page is None else result.page
+        if result.error is not None:
+            failed = True
+            print(f"{result.source};{page};ERRO;{result.error}", file=sys.stderr)
+            continue
+        if not result.codes:
+            print(f"{result.source};{page};;", flush=True)
+        for code in result.codes:
+            print(f"{result.source};{page};{code};{convert_code(code)}", flush=True)
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,170 @@
+import operator
+from collections.abc import Iterable, Iterator
+from decimal import Decimal
+from typing import cast, overload
+
+import numpy as np
+from numpy.typing import NDArray
+
+from bar_code_reader.constants import TAMANHO_CODIGO_BARRAS
+from bar_code_reader.guides import LineCode, convert_code
+from bar_code_reader.vectorized import (
+    DigitMatrix,
+    amounts_cents,
+    check_digits_valid,
+    digit_matrix,
+    due_dates,
+    has_amount,
+    is_collection,
+    is_numeric,
+    number_column,
+)
+
+_DTYPE = np.dtype(f"S{TAMANHO_CODIGO_BARRAS}")
+
+
+class BoletoBatch:
+    """
+    Lote de códigos de barras de 44 dígitos guardados num único buffer
+    contíguo de largura fixa (44 bytes por código, sem objetos por linha).
+
+    Os campos são lidos de forma vetorizada sobre o lote inteiro; objetos
+    ``CollectionGuide``/``TransferGuide`` só são criados quando uma linha é
+    acessada individualmente.
+    """
+
+    __slots__ = ("_codes",)
+
+    def __init__(self, codes: NDArray[np.bytes_]) -> None:
+        if codes.ndim != 1:
+            size = TAMANHO_CODIGO_BARRAS
+            msg = (
+                f"Esperado um vetor (n,) de códigos S{size}, recebido o formato "
+                f"{codes.shape}; para uma matriz (n, {size}) de caracteres use "
+                "from_buffer com os bytes dela"
+            )
+            raise ValueError(msg)
+        if codes.dtype != _DTYPE:
+            msg = f"Esperado um vetor de dtype {_DTYPE}, recebido {codes.dtype}"
+            raise ValueError(msg)
+        invalid = np.flatnonzero(~is_numeric(digit_matrix(codes)))
+        if invalid.size:
+            code = codes[invalid[0]].decode(errors="replace")
+            msg = f"Código inválido na linha {invalid[0]}: {code}"
+            raise ValueError(msg)
+        self._codes = codes
+
+    @classmethod
+    def from_codes(cls, codes: Iterable[str | bytes]) -> "BoletoBatch":
+        """Cria o lote a partir de códigos em texto, sem montar lista."""
+        # Um byte a mais que o código: textos mais longos (ex.: uma linha
+        # digitável) seriam cortados em 44 caracteres sem aviso
+        wide = np.fromiter(codes, dtype=f"S{TAMANHO_CODIGO_BARRAS + 1}")
+        invalid = np.flatnonzero(np.char.str_len(wide) != TAMANHO_CODIGO_BARRAS)
+        if invalid.size:
+            code = wide[invalid[0]].decode(errors="replace")
+            msg = f"Código inválido na linha {invalid[0]}: {code}"
+            raise ValueError(msg)
+        return cls(wide.astype(_DTYPE))
+
+    @classmethod
+    def from_buffer(cls, buffer: bytes | bytearray | memoryview) -> "BoletoBatch":
+        """
+        Usa diretamente um buffer com os códigos concatenados (44 bytes cada),
+        por exemplo o conteúdo de um arquivo de largura fixa, sem copiá-lo.
+        """
+        return cls(np.frombuffer(buffer, dtype=_DTYPE))
+
+    def __len__(self) -> int:
+        return len(self._codes)
+
+    @overload
+    def __getitem__(self, index: int) -> LineCode: ...
+
+    @overload
+    def __getitem__(self, index: slice | NDArray[np.bool_]) -> "BoletoBatch": ...
+
+    def __getitem__(
+        self, index: int | slice | NDArray[np.bool_]
+    ) -> "LineCode | BoletoBatch":
+        try:
+            # Aceita também inteiros do NumPy (ex.: saídas de flatnonzero)
+            position = operator.index(index)
+        except TypeError:
+            pass
+        else:
+            # Todos os códigos do lote têm 44 dígitos, então sempre viram guia
+            code = self._codes[position].decode("ascii")
+            return cast("LineCode", convert_code(code))
+        subset = BoletoBatch.__new__(BoletoBatch)
+        # Fatias com passo viram um buffer contíguo novo, como as máscaras
+        subset._codes = np.ascontiguousarray(self._codes[index])  # noqa: SLF001
+        return subset
+
+    def __iter__(self) -> Iterator[LineCode]:
+        for index in range(len(self._codes)):
+            yield self[index]
+
+    @property
+    def codes(self) -> NDArray[np.bytes_]:
+        """O buffer de códigos (somente leitura)."""
+        view = self._codes.view()
+        view.flags.writeable = False
+        return view
+
+    @property
+    def nbytes(self) -> int:
+        return self._codes.nbytes
+
+    @property
+    def digits(self) -> DigitMatrix:
+        """Matriz ``(n, 44)`` com o valor de cada dígito."""
+        return digit_matrix(self._codes)
+
+    @property
+    def is_collection(self) -> NDArray[np.bool_]:
+        """Máscara das guias de arrecadação (iniciadas em 8)."""
+        return is_collection(self.digits)
+
+    @property
+    def value_cents(self) -> NDArray[np.int64]:
+        """Valor de cada código em centavos."""
+        return amounts_cents(self.digits)
+
+    @property
+    def has_amount(self) -> NDArray[np.bool_]:
+        """Máscara dos códigos cujo valor é em reais (não uma referência)."""
+        return has_amount(self.digits)
+
+    def total_amount(self) -> Decimal:
+        """
+        Soma exata dos valores em reais do lote. A soma é feita em centavos
+        inteiros; só o total vira ``Decimal``.
+        """
+        digits = self.digits
+        cents = amounts_cents(digits)[has_amount(digits)].sum()
+        return Decimal(int(cents)).scaleb(-2)
+
+    @property
+    def due_date(self) -> NDArray[np.datetime64]:
+        """Vencimento dos boletos bancários; ``NaT`` nas guias de arrecadação."""
+        return due_dates(self.digits)
+
+    @property
+    def bank(self) -> NDArray[np.int16]:
+        """Código do banco dos boletos bancários; -1 nas guias de arrecadação."""
+        digits = self.digits
+        bank = number_column(digits, 0, 3).astype(np.int16)
+        return np.where(is_collection(digits), np.int16(-1), bank)
+
+    @property
+    def segment(self) -> NDArray[np.int8]:
+        """Segmento das guias de arrecadação; -1 nos boletos bancários."""
+        digits = self.digits
+        segment = digits[:, 1].astype(np.int8)
+        return np.where(is_collection(digits), segment, np.int8(-1))
+
+    @property
+    def check_digit_valid(self) -> NDArray[np.bool_]:
+        """Se o dígito verificador geral de cada código confere."""
+        return check_digits_valid(self.digits)
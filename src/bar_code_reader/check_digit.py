@@ -0,0 +1,70 @@
+"""
+Dígitos verificadores de boletos (módulo 10 e módulo 11).
+
+Os cálculos usam tabelas pré-computadas indexadas pelos bytes da sequência
+em ASCII: cada dígito vira o seu valor (ou o valor já multiplicado pelo
+peso da sua posição) sem ``int()`` por caractere nem fatias por chamada.
+"""
+
+from itertools import cycle
+from operator import getitem
+
+_DIGITOS = b"0123456789"
+
+# Valor de cada dígito ASCII (peso 1)
+_VALOR = bytes.maketrans(_DIGITOS, bytes(range(10)))
+
+# Soma dos algarismos do dígito multiplicado por 2 (ex.: 7 * 2 = 14 -> 1 + 4 = 5)
+_DOBRO = bytes.maketrans(_DIGITOS, bytes(sum(divmod(d * 2, 10)) for d in range(10)))
+
+# Módulo 11: pesos 2 a 9 aplicados da direita para a esquerda e repetidos.
+# Uma tabela por posição (contada da direita) com o produto peso * dígito
+# de cada caractere ASCII, cobrindo as sequências de até 64 dígitos
+_CICLO_MODULO11 = 8
+_PRODUTOS_MODULO11 = tuple(
+    bytes.maketrans(
+        _DIGITOS, bytes((2 + posicao % _CICLO_MODULO11) * d for d in range(10))
+    )
+    for posicao in range(64)
+)
+
+
+def _as_bytes(sequencia: str | bytes) -> bytes:
+    data = sequencia.encode("ascii") if isinstance(sequencia, str) else sequencia
+    if data and not data.isdigit():
+        msg = f"Sequência com caracteres não numéricos: {sequencia!r}"
+        raise ValueError(msg)
+    return data
+
+
+def modulo10(sequencia: str | bytes) -> int:
+    """
+    Módulo 10: pesos 2, 1, 2, 1... da direita para a esquerda, somando os
+    algarismos de cada produto. Usado nos campos da linha digitável.
+    """
+    data = _as_bytes(sequencia)
+    soma = sum(data[-1::-2].translate(_DOBRO)) + sum(data[-2::-2].translate(_VALOR))
+    return (10 - soma % 10) % 10
+
+
+def _resto_modulo11(sequencia: str | bytes) -> int:
+    data = _as_bytes(sequencia)
+    tabelas = (
+        _PRODUTOS_MODULO11
+        if len(data) <= len(_PRODUTOS_MODULO11)
+        else cycle(_PRODUTOS_MODULO11[:_CICLO_MODULO11])
+    )
+    # Uma passada só: cada caractere indexa a tabela da sua posição
+    return sum(map(getitem, tabelas, reversed(data))) % 11
+
+
+def modulo11_collection(sequencia: str | bytes) -> int:
+    """Módulo 11 das guias de arrecadação: restos 0 e 1 resultam em 0."""
+    resto = _resto_modulo11(sequencia)
+    return 0 if resto in (0, 1) else 11 - resto
+
+
+def modulo11_transfer(sequencia: str | bytes) -> int:
+    """Módulo 11 do código de barras bancário: restos 0, 1 e 10 resultam em 1."""
+    resto = _resto_modulo11(sequencia)
+    return 1 if resto in (0, 1, 10) else 11 - resto
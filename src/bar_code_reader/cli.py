@@ -0,0 +1,161 @@
+"""
+Interface de linha de comando sem interface gráfica (não importa o PySide6).
+
+Cada entrada é um caminho de imagem, um código de barras de 44 dígitos ou
+uma linha digitável (47 ou 48 dígitos, com ou sem pontuação), vinda dos
+argumentos ou da entrada padrão, uma por linha. Para cada código é escrita
+uma linha JSON na saída padrão, assim que fica pronta.
+"""
+
+import argparse
+import json
+import re
+import sys
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+from bar_code_reader.constants import (
+    TAMANHO_CODIGO_BARRAS,
+    TAMANHO_LINHA_ARRECADACAO,
+    TAMANHO_LINHA_BANCARIA,
+)
+from bar_code_reader.decode_types import DecodeProfile
+from bar_code_reader.guides import (
+    TransferGuide,
+    barcode_from_digitable_line,
+    convert_code,
+)
+
+# Códigos e linhas digitáveis podem vir formatados: "23790.12345 60000..."
+_CODIGO_DIGITADO = re.compile(r"[\d\s.\-]+")
+_NAO_DIGITOS = re.compile(r"\D")
+_TAMANHOS_DIGITADOS = (
+    TAMANHO_CODIGO_BARRAS,
+    TAMANHO_LINHA_BANCARIA,
+    TAMANHO_LINHA_ARRECADACAO,
+)
+
+
+def read_inputs(values: list[str]) -> Iterator[str]:
+    """Argumentos informados ou, sem nenhum (ou com "-"), a entrada padrão."""
+    sources: Iterable[str] = sys.stdin if values in ([], ["-"]) else values
+    for value in sources:
+        value = value.strip()
+        if value:
+            yield value
+
+
+def describe_code(code: str) -> dict[str, Any]:
+    """Campos da saída JSON para um código de barras de 44 dígitos."""
+    guide = convert_code(code)
+    record: dict[str, Any] = {
+        "barcode": code,
+        "type": None,
+        "line": None,
+        "formatted": None,
+        "amount": None,
+        "due_date": None,
+        "error": None,
+    }
+    if isinstance(guide, str):
+        record["error"] = "Código com tamanho ou caracteres inválidos"
+        return record
+
+    line = str(guide)
+    if line.startswith("Erro"):
+        record["error"] = line
+        return record
+
+    record["line"] = line
+    record["formatted"] = repr(guide)
+    # Texto, para não perder as casas decimais em quem lê o JSON
+    record["amount"] = None if guide.amount is None else str(guide.amount)
+    if isinstance(guide, TransferGuide):
+        record["type"] = "transfer"
+        # Fator zerado: boleto sem vencimento definido
+        if int(guide.expiration_factor):
+            record["due_date"] = guide.vencimento.isoformat()
+    else:
+        record["type"] = "collection"
+    return record
+
+
+def convert_input(value: str) -> dict[str, Any] | None:
+    """
+    Registro de um código de barras ou linha digitável informado como texto;
+    ``None`` se o texto não tiver o formato de um deles.
+    """
+    digits = _NAO_DIGITOS.sub("", value)
+    if not (_CODIGO_DIGITADO.fullmatch(value) and len(digits) in _TAMANHOS_DIGITADOS):
+        return None
+    try:
+        if len(digits) != TAMANHO_CODIGO_BARRAS:
+            digits = barcode_from_digitable_line(digits)
+    except ValueError as e:
+        return {"input": value, "barcode": None, "error": str(e)}
+    return {"input": value, **describe_code(digits)}
+
+
+def process_input(value: str, profile: DecodeProfile) -> Iterator[dict[str, Any]]:
+    """Um registro por código encontrado na entrada (um só para textos)."""
+    record = convert_input(value)
+    if record is not None:
+        yield record
+        return
+
+    try:
+        # Pillow e zbar só são carregados quando aparece a primeira imagem; sem
+        # a biblioteca do zbar, cada imagem vira um registro de erro
+        from bar_code_reader.decode_bar import DecodeBar, sorted_codes
+
+        codes = sorted_codes(DecodeBar(value, profile=profile).decoded_bar())
+    except Exception as e:  # noqa: BLE001
+        yield {"input": value, "barcode": None, "error": f"{type(e).__name__}: {e}"}
+        return
+    if not codes:
+        yield {"input": value, "barcode": None, "error": "Nenhum código encontrado"}
+    for code in codes:
+        yield {"input": value, **describe_code(code)}
+
+
+def criar_parser_argumentos() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="bar-code-reader",
+        description=(
+            "Converte códigos de barras, linhas digitáveis e imagens de boletos,"
+            " sem abrir a interface gráfica"
+        ),
+        epilog=(
+            "Sem entradas (ou com '-'), lê uma por linha da entrada padrão."
+            " Saída: uma linha JSON por código."
+        ),
+    )
+    parser.add_argument(
+        "inputs",
+        nargs="*",
+        help="Caminhos de imagens, códigos de 44 dígitos ou linhas digitáveis",
+    )
+    parser.add_argument(
+        "--profile",
+        "-p",
+        type=DecodeProfile,
+        choices=list(DecodeProfile),
+        default=DecodeProfile.BOLETO,
+        help="Simbologias procuradas nas imagens (padrão: boleto)",
+    )
+    return parser
+
+
+def main() -> int:
+    """Retorna 0 se todas as entradas foram convertidas, 1 se alguma falhou."""
+    args = criar_parser_argumentos().parse_args()
+    failed = False
+    for value in read_inputs(args.inputs):
+        for record in process_input(value, args.profile):
+            failed = failed or record["error"] is not None
+            print(json.dumps(record, ensure_ascii=False), flush=True)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
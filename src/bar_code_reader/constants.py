@@ -1,3 +1,4 @@
+from datetime import date
 from pathlib import Path
 
 ROOT_DIR = Path(__file__).parent.parent.parent
@@ -12,3 +13,72 @@ MODULO11_QUANTIDADE_MOEDA = 9
 
 
 CODIGO_ARRECADAO = 8
+TAMANHO_CODIGO_BARRAS = 44
+TAMANHO_LINHA_BANCARIA = 47
+TAMANHO_LINHA_ARRECADACAO = 48
+
+# Fator de vencimento: a partir de 22/02/2025 o fator volta a 1000
+DATA_BASE_VENCIMENTO = date(1997, 10, 7)
+DATA_BASE_VENCIMENTO_2025 = date(2022, 5, 29)
+FATOR_VENCIMENTO_MINIMO_2025 = 1000
+FATOR_VENCIMENTO_LIMITE_2025 = 5001
+
+
+# Processamento em lote
+IMAGE_EXTENSIONS = frozenset(
+    {".png", ".jpg", ".jpeg", ".bmp", ".gif", ".tif", ".tiff", ".webp"}
+)
+BATCH_PENDING_PER_WORKER = 4
+
+# Altura (em pixels) da faixa lida em volta da linha central da seleção
+SCANLINE_BAND_HEIGHT = 9
+# Estágios de ampliação e nitidez só rodam em imagens até este tamanho
+UPSCALE_MAX_PIXELS = 1_000_000
+
+# Leitura de PDF
+PDF_EXTENSION = ".pdf"
+PDF_DEFAULT_DPI = 200
+PDF_POINTS_PER_INCH = 72
+
+# Monitoramento contínuo de uma região da tela
+WATCH_INTERVAL_MS = 500
+DHASH_SIZE = 8
+# Bits diferentes (de 64) tolerados antes de considerar que o quadro mudou
+WATCH_HASH_TOLERANCE = 3
+
+# Cache de resultados de leitura. Incrementar DECODER_VERSION sempre que o
+# pipeline ou o perfil de leitura mudarem, para descartar resultados antigos
+DECODER_VERSION = "4"
+DECODE_CACHE_MAX_ENTRIES = 256
+DECODE_CACHE_TTL_SECONDS = 24 * 60 * 60
+DECODE_CACHE_BUSY_TIMEOUT_MS = 10_000  # Espera pelo banco travado por outro processo
+
+# Quantidade de leituras recentes guardadas pela medição de tempo
+TIMING_HISTORY = 100
+
+# Serviço HTTP local de leitura
+SERVER_HOST = "127.0.0.1"
+SERVER_PORT = 8765
+# Leituras aguardando um processo livre, por processo; além disso responde 503
+SERVER_PENDING_PER_WORKER = 4
+SERVER_MAX_BODY_BYTES = 20 * 1024 * 1024
+# Limites superiores (em ms) das faixas dos histogramas de latência
+SERVER_LATENCY_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+# Pré-processamento com NumPy (recorte e contraste)
+PREPROCESS_BOX_STEP = 4  # Amostra 1 a cada N pixels para localizar o código
+PREPROCESS_EDGE_MIN = 48  # Diferença mínima de cinza entre vizinhos numa borda
+PREPROCESS_BOX_MARGIN = 16  # Folga em volta do recorte (zona de silêncio)
+
+# Localização dos códigos antes da leitura (blocos da amostra reduzida)
+LOCATE_TILE = 8  # Lado dos blocos, em pixels da amostra
+# Lado maior da amostra a partir do qual o passo cresce (até PREPROCESS_BOX_STEP)
+LOCATE_SAMPLE_SIDE = 400
+LOCATE_TILE_DENSITY = 0.15  # Fração do bloco com mais bordas na direção das barras
+LOCATE_MIN_TILES = 3  # Comprimento mínimo de uma região, em blocos
+LOCATE_FILL = 0.5  # Fração mínima da região com blocos densos (antes de fechar)
+# Quantas vezes as bordas na direção das barras devem superar as da outra
+LOCATE_DOMINANCE = 2
+LOCATE_TOP_N = 3  # Regiões tentadas quando se procura um só código
+# Leitura de todos os códigos: com mais regiões que isso a imagem é lida inteira
+LOCATE_MAX_REGIONS = 12
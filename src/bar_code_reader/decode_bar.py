@@ -1,280 +1,230 @@
-from abc import ABC, abstractmethod
-from collections.abc import Callable
-from datetime import date, datetime, timedelta
+import os
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from os import PathLike
+from typing import NamedTuple
 
 from PIL import Image
-from pyzbar import pyzbar
+from pyzbar.pyzbar import Decoded
 
 from bar_code_reader.constants import (
-    MODULO10_QUANTIDADE_MOEDA,
-    MODULO10_VALOR_EFETIVO,
-    MODULO11_QUANTIDADE_MOEDA,
-    MODULO11_VALOR_EFETIVO,
+    BATCH_PENDING_PER_WORKER,
+    PDF_DEFAULT_DPI,
+    PDF_EXTENSION,
+)
+from bar_code_reader.decode_cache import DecodeCache
+from bar_code_reader.decode_pipeline import DecodePipeline, default_pipeline
+from bar_code_reader.decode_types import DecodeProfile, GrayImage
+
+# As guias ficam em ``guides`` (sem Pillow nem zbar) e são reexportadas aqui
+# para quem já importava tudo de ``decode_bar``
+from bar_code_reader.guides import (
+    CollectionGuide,
+    LineCode,
+    TransferGuide,
+    barcode_from_digitable_line,
+    barcodes_from_digitable_lines,
+    convert_code,
 )
 
-
-class DecodeBar:
-    def __init__(self, path) -> None:
-        self.image = Image.open(path)
-
-    def decoded_bar(self):
-        return pyzbar.decode(self.image)
+__all__ = [
+    "CollectionGuide",
+    "DecodeBar",
+    "DecodeResult",
+    "GrayImage",
+    "ImageSource",
+    "LineCode",
+    "TransferGuide",
+    "barcode_from_digitable_line",
+    "barcodes_from_digitable_lines",
+    "convert_code",
+    "sorted_codes",
+]
 
 
-class LineCode(ABC):
-    @abstractmethod
-    def calc_modulo10(self, field: str):
-        pass
+class DecodeResult(NamedTuple):
+    """
+    Resultado da leitura de um arquivo no processamento em lote.
+    Em PDFs há um resultado por página, identificada em ``page`` (a partir de 1).
+    """
 
-    @abstractmethod
-    def calc_modulo11(self, field: str):
-        pass
+    source: str
+    codes: list[str]
+    error: str | None = None
+    page: int | None = None
 
-    @abstractmethod
-    def __str__(self) -> str:
-        pass
 
-    @abstractmethod
-    def __repr__(self) -> str:
-        pass
+type ImageSource = str | PathLike[str] | Image.Image | GrayImage
 
 
-class CollectionGuide(LineCode):
-    def __init__(self, code: str) -> None:
-        """
-        Posição     Tamanho     Conteúdo
-        01 a 01     01          Identificação do Produto
-        02 a 02     01          Identificação do Segmento
-        03 a 03     01          Identificação do valor real ou referência
-        04 a 04     01          Dígito verificador geral (módulo 10 ou 11)
-        05 a 15     11          Valor
-        16 a 19     04          Identificação da Empresa/Órgão
-        20 a 44     25          Campo livre de utilização da Empresa/Órgão
+class DecodeBar:
+    def __init__(
+        self,
+        source: ImageSource,
+        pipeline: DecodePipeline = default_pipeline,
+        scanline: int | None = None,
+        profile: DecodeProfile = DecodeProfile.ALL,
+        cache: DecodeCache | None = None,
+    ) -> None:
         """
-        self.product = code[0:1]
-        self.segment = code[1:2]
-        self.currency_code = code[2:3]
-        self.check_digit = code[3:4]
-        self.value = code[4:15]
-        self.company_identify = code[15:19]
-        self.free_field = code[19:44]
-
-        self.modulo = self.module_func()
-
-    @property
-    def field_1(self) -> str:
-        field = (
-            self.product
-            + self.segment
-            + self.currency_code
-            + self.check_digit
-            + self.value[:7]
-        )
-        check_digit = self.modulo(field)
-        return field + check_digit
-
-    @property
-    def field_2(self) -> str:
-        field = self.value[7:] + self.company_identify + self.free_field[:3]
-        check_digit = self.modulo(field)
-        return field + check_digit
-
-    @property
-    def field_3(self) -> str:
-        field = self.free_field[3:14]
-        check_digit = self.modulo(field)
-        return field + check_digit
-
-    @property
-    def field_4(self) -> str:
-        field = self.free_field[14:]
-        check_digit = self.modulo(field)
-        return field + check_digit
-
-    def module_func(self) -> Callable:
-        codigo_moeda = self.currency_code
-
-        if (
-            int(codigo_moeda) == MODULO10_VALOR_EFETIVO
-            or int(codigo_moeda) == MODULO10_QUANTIDADE_MOEDA
-        ):
-            return self.calc_modulo10
-        if (
-            int(codigo_moeda) == MODULO11_VALOR_EFETIVO
-            or int(codigo_moeda) == MODULO11_QUANTIDADE_MOEDA
-        ):
-            return self.calc_modulo11
-        return lambda x: "Error"
-
-    def calc_modulo10(self, sequencia: str) -> str:
-        multiplicador_atual = 2
-        soma = 0
-
-        for element in sequencia[::-1]:
-            resultado = int(element) * multiplicador_atual
-            multiplicador_atual = 1 if multiplicador_atual == 2 else 2
-            if resultado < 10:
-                soma += resultado
-            else:
-                soma += int(resultado / 10)
-                soma += resultado % 10
-
-        resto_divisao = soma % 10
-        if resto_divisao == 0:
-            return str(resto_divisao)
-        return str(10 - resto_divisao)
-
-    def calc_modulo11(self, sequencia: str) -> str:
-        multiplicador_atual = 2
-        soma = 0
-
-        for element in sequencia[::-1]:
-            resultado = int(element) * multiplicador_atual
-            multiplicador_atual = (
-                2 if multiplicador_atual == 9 else multiplicador_atual + 1
-            )
-            soma += resultado
-
-        resto_divisao = soma % 11
-        if resto_divisao in (0, 1):
-            return "0"
-        if resto_divisao == 10:
-            return "1"
-        return str(11 - resto_divisao)
+        Aceita um caminho de arquivo, uma imagem PIL ou um ``GrayImage``
+        já em memória (ex.: captura de tela convertida por ``qimage_to_gray``).
 
-    def __str__(self) -> str:
-        if hasattr(self.modulo, "__name__") and self.modulo.__name__ == "<lambda>":
-            return f"Erro: Código moeda inválido {self.currency_code}"
-        return f"{self.field_1}{self.field_2}{self.field_3}{self.field_4}"
-
-    def __repr__(self) -> str:
-        if hasattr(self.modulo, "__name__") and self.modulo.__name__ == "<lambda>":
-            return f"Erro: Código moeda inválido {self.currency_code}"
-        return (
-            f"{self.field_1[:-1]} {self.field_1[-1:]} "
-            f"{self.field_2[:-1]} {self.field_2[-1:]} "
-            f"{self.field_3[:-1]} {self.field_3[-1:]} "
-            f"{self.field_4[:-1]} {self.field_4[-1:]}"
-        )
-
-
-class TransferGuide(LineCode):
-    def __init__(self, code: str) -> None:
+        ``scanline`` indica a linha da imagem onde o usuário mirou; a leitura
+        começa por uma faixa fina em volta dela. ``profile`` restringe as
+        simbologias procuradas (ex.: só boletos). Com ``cache``, imagens já
+        lidas antes não passam de novo pelo zbar.
         """
-        Posição     Tamanho     Picture     Conteúdo
-        01 a 03     03          9(03)       Código do Banco na Câmara
-                                            de Compensação = '001'
-        04 a 04     01          9(01)       Código da Moeda = 9 (Real)
-        05 a 05     01          9(01)       Digito Verificador (DV) do
-                                            código de Barras*
-        06 a 09     04          9(04)       Fator de Vencimento **
-        10 a 19     10          9(08)V(2)   Valor
-        20 a 44     03          9(03)       Campo Livre ***
+        self.pipeline = pipeline
+        self.scanline = scanline
+        self.profile = profile
+        self.cache = cache
+        if isinstance(source, GrayImage | Image.Image):
+            self.image = source
+        else:
+            self.image = Image.open(source)
+
+    def decoded_bar(self) -> list[Decoded]:
+        if self.cache is None:
+            # Tenta os estágios do pipeline até o primeiro que ler algum código
+            return self.pipeline.run(self.image, self.scanline, self.profile)
+
+        key = self.cache.key(self.image, self.profile, self.scanline)
+        barcodes = self.cache.get(key)
+        if barcodes is None:
+            barcodes = self.pipeline.run(self.image, self.scanline, self.profile)
+            self.cache.put(key, barcodes)
+        return barcodes
+
+    def decoded_codes(self) -> list[str]:
+        return [barcode.data.decode("utf-8") for barcode in self.decoded_bar()]
+
+    @staticmethod
+    def decode_pdf(
+        path: str | PathLike[str],
+        dpi: int = PDF_DEFAULT_DPI,
+        profile: DecodeProfile = DecodeProfile.ALL,
+        cache: DecodeCache | None = None,
+    ) -> Iterator[DecodeResult]:
         """
-        self.bank = code[0:3]
-        self.currency_code = code[3:4]
-        self.check_digit = code[4:5]
-        self.expiration_factor = code[5:9]
-        self.value = code[9:19]
-        self.free_field = code[19:44]
-        self.date_fixed = self.fator_vencimento()
-
-    @property
-    def vencimento(self) -> date:
-        return self.date_fixed + timedelta(days=int(self.expiration_factor))
-
-    @property
-    def field_1(self) -> str:
-        field = self.bank + self.currency_code + self.free_field[:5]
-        check_digit = self.calc_modulo10(field)
-        return field + check_digit
-
-    @property
-    def field_2(self):
-        field = self.free_field[5:15]
-        check_digit = self.calc_modulo10(field)
-        return field + check_digit
-
-    @property
-    def field_3(self):
-        field = self.free_field[15:25]
-        check_digit = self.calc_modulo10(field)
-        return field + check_digit
-
-    @property
-    def field_4(self):
-        return self.check_digit
-
-    @property
-    def field_5(self):
-        return self.expiration_factor + self.value
-
-    def fator_vencimento(self) -> date:
+        Lê os códigos de um PDF página a página, rasterizando cada uma só
+        quando for decodificada. Gera um ``DecodeResult`` por página; se uma
+        página não puder ser rasterizada, o erro vem no resultado dela e as
+        seguintes não são lidas. Erros ao abrir o PDF são levantados.
         """
-        Calcula-se o número de dias corridos entre a data base
-        (“Fixada” em 07/10/1997) e a do vencimento desejado.
-
-        A partir de 22.02.2025, o fator retorna para “1000”
-        adicionando-se “1” a cada dia subsequente a este fator.
+        # Importado aqui para que a leitura de imagens não dependa do Qt
+        from bar_code_reader.pdf_pages import iter_pdf_pages
+
+        source = os.fspath(path)
+        pages = iter_pdf_pages(path, dpi)
+        page = 1  # Página sendo rasterizada
+        try:
+            for page, image in pages:
+                try:
+                    decoder = DecodeBar(image, profile=profile, cache=cache)
+                    codes = decoder.decoded_codes()
+                except Exception as e:  # noqa: BLE001
+                    yield DecodeResult(source, [], f"{type(e).__name__}: {e}", page)
+                else:
+                    yield DecodeResult(source, codes, None, page)
+                page += 1
+        except Exception as e:  # noqa: BLE001
+            yield DecodeResult(source, [], f"{type(e).__name__}: {e}", page)
+
+    @staticmethod
+    def decode_many(
+        sources: Iterable[str | PathLike[str]],
+        *,
+        workers: int | None = None,
+        ordered: bool = True,
+        dpi: int = PDF_DEFAULT_DPI,
+        profile: DecodeProfile = DecodeProfile.ALL,
+        cache_path: str | PathLike[str] | None = None,
+    ) -> Iterator[DecodeResult]:
         """
-        if 1000 <= int(self.expiration_factor) < 5001:
-            return datetime.strptime("29/05/2022", "%d/%m/%Y").date()
-        return datetime.strptime("07/10/1997", "%d/%m/%Y").date()
-
-    def calc_modulo10(self, sequencia: str) -> str:
-        multiplicador_atual = 2
-        soma = 0
-
-        for element in sequencia[::-1]:
-            resultado = int(element) * multiplicador_atual
-            multiplicador_atual = 1 if multiplicador_atual == 2 else 2
-            if resultado <= 9:
-                soma += resultado
-            else:
-                soma += int(str(resultado)[0]) + int(str(resultado)[1])
-
-        dezena_superior = (int(str(soma)[0]) + 1) * 10
-        resto_divisao = soma % 10
-
-        digito_verificador = dezena_superior - resto_divisao
-        if digito_verificador == 10:
-            digito_verificador = 0
-        return str(digito_verificador)[-1]
+        Lê vários arquivos (imagens ou PDFs) em paralelo, um processo por
+        núcleo, devolvendo os resultados conforme ficam prontos.
 
-    def calc_modulo11(self, sequencia: str) -> str:
-        multiplicador_atual = 2
-        soma = 0
+        Com ``ordered=True`` os resultados saem na ordem de entrada; caso
+        contrário, na ordem em que terminam. Erros de um arquivo não
+        interrompem o lote: vêm no campo ``error`` do ``DecodeResult``.
 
-        for element in sequencia[::-1]:
-            resultado = int(element) * multiplicador_atual
-            multiplicador_atual = (
-                2 if multiplicador_atual == 9 else multiplicador_atual + 1
-            )
-            soma += resultado
-
-        resto_divisao = soma % 11
-        if resto_divisao in (0, 1):
-            return "1"
-        if resto_divisao in (10, 11):
-            return "1"
-        return str(11 - resto_divisao)
-
-    def __str__(self) -> str:
-        if self.currency_code != "9":
-            return f"Erro: Código moeda inválido {self.currency_code}"
-        if self.check_digit == "0":
-            return f"Erro: Digito verificado {self.check_digit}"
-        return f"{self.field_1}{self.field_2}{self.field_3}{self.field_4}{self.field_5}"
-
-    def __repr__(self) -> str:
-        if self.currency_code != "9":
-            return f"Erro: Código moeda inválido {self.currency_code}"
-        if self.check_digit == "0":
-            return f"Erro: Digito verificador {self.check_digit}"
-        return (
-            f"{self.field_1[:5]}.{self.field_1[5:]} "
-            f"{self.field_2[:5]}.{self.field_2[5:]} "
-            f"{self.field_3[:5]}.{self.field_3[5:]} "
-            f"{self.field_4} "
-            f"{self.field_5}"
-        )
+        ``cache_path`` aponta para um banco SQLite compartilhado pelos
+        processos, onde ficam os resultados de arquivos já processados.
+        """
+        if cache_path is not None:
+            cache_path = os.fspath(cache_path)
+        workers = workers or os.cpu_count() or 1
+        max_pending = workers * BATCH_PENDING_PER_WORKER
+        executor = ProcessPoolExecutor(max_workers=workers)
+        pending: deque[Future[list[DecodeResult]]] = deque()
+        try:
+            for source in sources:
+                if len(pending) >= max_pending:
+                    yield from _drain(pending, ordered=ordered, keep=max_pending - 1)
+                pending.append(
+                    executor.submit(
+                        _decode_file, os.fspath(source), dpi, profile, cache_path
+                    )
+                )
+            yield from _drain(pending, ordered=ordered, keep=0)
+        finally:
+            executor.shutdown(cancel_futures=True)
+
+
+_process_caches: dict[str, DecodeCache] = {}
+
+
+def _process_cache(cache_path: str | None) -> DecodeCache | None:
+    # Uma conexão com o banco por processo filho, aberta na primeira tarefa
+    if cache_path is None:
+        return None
+    if cache_path not in _process_caches:
+        _process_caches[cache_path] = DecodeCache(path=cache_path)
+    return _process_caches[cache_path]
+
+
+def _decode_file(
+    path: str, dpi: int, profile: DecodeProfile, cache_path: str | None = None
+) -> list[DecodeResult]:
+    # Executa no processo filho; qualquer erro fica isolado neste arquivo.
+    # Num PDF, o erro ao rasterizar uma página já vem no resultado dela,
+    # depois das páginas lidas antes
+    try:
+        cache = _process_cache(cache_path)
+        if path.lower().endswith(PDF_EXTENSION):
+            return list(DecodeBar.decode_pdf(path, dpi, profile, cache))
+        decoder = DecodeBar(path, profile=profile, cache=cache)
+        return [DecodeResult(path, decoder.decoded_codes())]
+    except Exception as e:  # noqa: BLE001
+        return [DecodeResult(path, [], f"{type(e).__name__}: {e}")]
+
+
+def _drain(
+    pending: deque[Future[list[DecodeResult]]], *, ordered: bool, keep: int
+) -> Iterator[DecodeResult]:
+    # Esvazia a fila de tarefas até restarem no máximo ``keep`` pendentes
+    while len(pending) > keep:
+        if ordered:
+            yield from pending.popleft().result()
+            continue
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            pending.remove(future)
+            yield from future.result()
+
+
+def sorted_codes(barcodes: Iterable[Decoded]) -> list[str]:
+    """
+    Conteúdo dos códigos lidos, sem repetições, na ordem em que aparecem
+    na imagem (de cima para baixo, da esquerda para a direita).
+    """
+    positions: dict[str, tuple[int, int]] = {}
+    for barcode in barcodes:
+        code = barcode.data.decode("utf-8")
+        position = (barcode.rect.top, barcode.rect.left)
+        # O mesmo código lido duas vezes fica na posição mais acima
+        if code not in positions or position < positions[code]:
+            positions[code] = position
+    return sorted(positions, key=positions.__getitem__)
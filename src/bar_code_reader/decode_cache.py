@@ -0,0 +1,190 @@
+"""
+Cache dos resultados de leitura, indexado pelo conteúdo da imagem.
+
+A chave é um hash dos pixels (mais dimensões, perfil e versão do leitor),
+então a mesma captura ou o mesmo arquivo lido de novo não passa pelo zbar.
+O cache fica em memória (LRU com limite de entradas e validade) e pode ser
+espelhado num arquivo SQLite para ser compartilhado entre execuções.
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import time
+from collections import OrderedDict
+from os import PathLike
+from threading import Lock
+from typing import TYPE_CHECKING
+
+from PIL import Image
+from pyzbar.pyzbar import Decoded, Point, Rect
+
+from bar_code_reader.constants import (
+    DECODE_CACHE_BUSY_TIMEOUT_MS,
+    DECODE_CACHE_MAX_ENTRIES,
+    DECODE_CACHE_TTL_SECONDS,
+    DECODER_VERSION,
+)
+
+if TYPE_CHECKING:
+    from bar_code_reader.decode_types import GrayImage
+
+_logger = logging.getLogger(__name__)
+
+
+class DecodeCache:
+    def __init__(
+        self,
+        max_entries: int = DECODE_CACHE_MAX_ENTRIES,
+        ttl: float | None = DECODE_CACHE_TTL_SECONDS,
+        path: str | PathLike[str] | None = None,
+    ) -> None:
+        """
+        ``ttl`` é a validade de cada entrada em segundos (None = sem validade).
+        Com ``path``, os resultados também são gravados num banco SQLite.
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, tuple[float, list[Decoded]]] = OrderedDict()
+        self._lock = Lock()
+        self._db = self._open_db(path) if path is not None else None
+
+    @staticmethod
+    def key(
+        image: "Image.Image | GrayImage",
+        profile: str = "all",
+        scanline: int | None = None,
+    ) -> str:
+        """Hash do conteúdo da imagem e dos parâmetros que alteram a leitura."""
+        if isinstance(image, Image.Image):
+            pixels = image.tobytes()
+            header = f"{image.mode}:{image.width}x{image.height}"
+        else:
+            pixels, width, height = image
+            header = f"L:{width}x{height}"
+        digest = hashlib.blake2b(pixels, digest_size=16)
+        digest.update(f"|{header}|{profile}|{scanline}|{DECODER_VERSION}".encode())
+        return digest.hexdigest()
+
+    def get(self, key: str) -> list[Decoded] | None:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and not self._expired(entry[0], now):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self._entries.pop(key, None)
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT stored_at, barcodes FROM decode_cache WHERE key = ?",
+                    (key,),
+                ).fetchone()
+                if row is not None and not self._expired(row[0], now):
+                    barcodes = _loads(row[1])
+                    self._remember(key, row[0], barcodes)
+                    self.hits += 1
+                    return barcodes
+
+            self.misses += 1
+            return None
+
+    def put(self, key: str, barcodes: list[Decoded]) -> None:
+        """
+        Guarda o resultado. A gravação no SQLite é só um atalho para a
+        próxima vez: se falhar (ex.: banco travado por outros processos do
+        lote), o resultado continua valendo e fica ao menos na memória.
+
+        Leituras sem nenhum código não são guardadas: uma captura desfocada
+        ou cortada não deve impedir a próxima tentativa pela validade inteira.
+        """
+        if not barcodes:
+            return
+        now = time.time()
+        with self._lock:
+            self._remember(key, now, barcodes)
+            if self._db is not None:
+                try:
+                    with self._db:
+                        self._db.execute(
+                            "INSERT OR REPLACE INTO decode_cache VALUES (?, ?, ?)",
+                            (key, now, _dumps(barcodes)),
+                        )
+                except sqlite3.Error as e:
+                    _logger.warning("Resultado não gravado no cache: %s", e)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                with self._db:
+                    self._db.execute("DELETE FROM decode_cache")
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remember(self, key: str, stored_at: float, barcodes: list[Decoded]) -> None:
+        self._entries[key] = (stored_at, barcodes)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _expired(self, stored_at: float, now: float) -> bool:
+        return self.ttl is not None and now - stored_at > self.ttl
+
+    @staticmethod
+    def _open_db(path: str | PathLike[str]) -> sqlite3.Connection:
+        db = sqlite3.connect(path, check_same_thread=False)
+        # Vários processos do lote gravam no mesmo banco: espera o outro
+        # terminar em vez de falhar na hora com "database is locked"
+        db.execute(f"PRAGMA busy_timeout = {DECODE_CACHE_BUSY_TIMEOUT_MS:d}")
+        with db:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS decode_cache ("
+                "key TEXT PRIMARY KEY, stored_at REAL, barcodes TEXT)"
+            )
+            db.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value)")
+            row = db.execute("SELECT value FROM meta WHERE name = 'version'").fetchone()
+            if row is None or row[0] != DECODER_VERSION:
+                # Resultados de outra versão do leitor não valem mais
+                db.execute("DELETE FROM decode_cache")
+                db.execute(
+                    "INSERT OR REPLACE INTO meta VALUES ('version', ?)",
+                    (DECODER_VERSION,),
+                )
+        return db
+
+
+def _dumps(barcodes: list[Decoded]) -> str:
+    return json.dumps(
+        [
+            {
+                "data": barcode.data.decode("latin-1"),
+                "type": barcode.type,
+                "rect": list(barcode.rect),
+                "polygon": [list(point) for point in barcode.polygon],
+                "quality": barcode.quality,
+                "orientation": barcode.orientation,
+            }
+            for barcode in barcodes
+        ]
+    )
+
+
+def _loads(payload: str) -> list[Decoded]:
+    return [
+        Decoded(
+            data=item["data"].encode("latin-1"),
+            type=item["type"],
+            rect=Rect(*item["rect"]),
+            polygon=[Point(*point) for point in item["polygon"]],
+            quality=item["quality"],
+            orientation=item["orientation"],
+        )
+        for item in json.loads(payload)
+    ]
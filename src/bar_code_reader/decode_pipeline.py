@@ -0,0 +1,275 @@
+"""
+Pipeline de decodificação em estágios.
+
+Quando se sabe a linha para onde o usuário mirou (a linha vermelha da
+seleção), a primeira tentativa lê só uma faixa fina em volta dela,
+procurando apenas códigos lineares, e a segunda só os recortes em volta
+dos códigos, localizados numa versão reduzida da imagem e ajustados com
+NumPy (``preprocess``). Assim uma captura da tela inteira ou uma página
+escaneada não passa inteira pelo zbar. Em seguida cada
+estágio prepara a imagem de um jeito diferente (binarização, ampliação,
+nitidez, rotação) e tenta decodificar. A execução para no primeiro
+estágio que encontrar algum código, então imagens boas pagam só pela
+primeira tentativa. Cada estágio registra tentativas, acertos e tempo gasto.
+"""
+
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from threading import Lock
+from time import perf_counter
+from typing import TYPE_CHECKING
+
+from PIL import Image, ImageFilter
+from pyzbar.pyzbar import Decoded, Point, Rect
+
+from bar_code_reader.constants import (
+    LOCATE_MAX_REGIONS,
+    LOCATE_TOP_N,
+    SCANLINE_BAND_HEIGHT,
+    UPSCALE_MAX_PIXELS,
+)
+from bar_code_reader.zbar_decoder import DecodeProfile, ZbarDecoder, get_decoder
+
+if TYPE_CHECKING:
+    from bar_code_reader.decode_types import GrayImage
+
+
+@dataclass(slots=True)
+class StageStats:
+    attempts: int = 0
+    hits: int = 0
+    seconds: float = 0.0
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.attempts if self.attempts else 0.0
+
+    @property
+    def mean_ms(self) -> float:
+        return self.seconds * 1000 / self.attempts if self.attempts else 0.0
+
+
+@dataclass(frozen=True, slots=True)
+class Stage:
+    name: str
+    prepare: Callable[[Image.Image], Image.Image]
+    # Imagens com mais pixels que isso pulam o estágio (None: sem limite)
+    max_pixels: int | None = None
+
+
+def otsu_threshold(gray: Image.Image) -> int:
+    """Limiar de Otsu calculado sobre o histograma da imagem em tons de cinza."""
+    histogram = gray.histogram()
+    total = sum(histogram)
+    total_sum = sum(level * count for level, count in enumerate(histogram))
+
+    background = background_sum = 0
+    best_level, best_variance = 0, -1.0
+    for level, count in enumerate(histogram):
+        background += count
+        if background == 0:
+            continue
+        foreground = total - background
+        if foreground == 0:
+            break
+        background_sum += level * count
+        mean_background = background_sum / background
+        mean_foreground = (total_sum - background_sum) / foreground
+        variance = background * foreground * (mean_background - mean_foreground) ** 2
+        if variance > best_variance:
+            best_level, best_variance = level, variance
+    return best_level
+
+
+def binarize(gray: Image.Image) -> Image.Image:
+    threshold = otsu_threshold(gray)
+    return gray.point([0] * (threshold + 1) + [255] * (255 - threshold))
+
+
+def upscale(factor: int) -> Callable[[Image.Image], Image.Image]:
+    def prepare(gray: Image.Image) -> Image.Image:
+        size = (gray.width * factor, gray.height * factor)
+        return gray.resize(size, Image.Resampling.BICUBIC)
+
+    return prepare
+
+
+def sharpen(gray: Image.Image) -> Image.Image:
+    # Amplia antes de realçar: em seleções pequenas o filtro sozinho só gera ruído
+    return upscale(2)(gray).filter(ImageFilter.SHARPEN)
+
+
+def rotate(degrees: int) -> Callable[[Image.Image], Image.Image]:
+    def prepare(gray: Image.Image) -> Image.Image:
+        return gray.rotate(degrees, expand=True)
+
+    return prepare
+
+
+DEFAULT_STAGES = (
+    Stage("grayscale", lambda gray: gray),
+    Stage("otsu", binarize),
+    # Ampliar só resgata seleções pequenas; numa tela ou página inteira
+    # geraria imagens de dezenas de megapixels
+    Stage("upscale_2x", upscale(2), UPSCALE_MAX_PIXELS),
+    Stage("upscale_3x", upscale(3), UPSCALE_MAX_PIXELS),
+    Stage("sharpen", sharpen, UPSCALE_MAX_PIXELS),
+    Stage("rotate_90", rotate(90)),
+    Stage("rotate_-90", rotate(-90)),
+)
+
+
+SCANLINE_STAGE = "scanline"
+LOCATE_STAGE = "locate"
+
+
+class DecodePipeline:
+    def __init__(self, stages: Sequence[Stage] = DEFAULT_STAGES) -> None:
+        self.stages = tuple(stages)
+        self._stats = {
+            name: StageStats()
+            for name in (
+                SCANLINE_STAGE,
+                LOCATE_STAGE,
+                *(stage.name for stage in self.stages),
+            )
+        }
+        self._lock = Lock()
+
+    def run(
+        self,
+        image: "Image.Image | GrayImage",
+        scanline: int | None = None,
+        profile: DecodeProfile = DecodeProfile.ALL,
+    ) -> list[Decoded]:
+        """
+        Executa os estágios em ordem e devolve os códigos do primeiro acerto.
+
+        ``scanline`` é a linha (em pixels) onde o usuário mirou; se informada,
+        uma faixa fina em volta dela é lida antes da imagem inteira, só com
+        o leitor de boletos, e depois as ``LOCATE_TOP_N`` regiões mais
+        prováveis de conter o código. Sem ``scanline`` (leitura de vários
+        códigos) só o perfil de boletos passa pela localização, lendo todas
+        as regiões encontradas; nos outros perfis a imagem é lida inteira.
+        ``profile`` define as simbologias procuradas.
+        """
+        decoder = get_decoder(profile)
+        if scanline is not None and profile != DecodeProfile.QRCODE:
+            start = perf_counter()
+            barcodes = get_decoder(DecodeProfile.BOLETO).decode(
+                _scanline_band(image, scanline)
+            )
+            self._record(SCANLINE_STAGE, perf_counter() - start, hit=bool(barcodes))
+            if barcodes:
+                return barcodes
+
+        if (scanline is not None and profile != DecodeProfile.QRCODE) or (
+            scanline is None and profile == DecodeProfile.BOLETO
+        ):
+            start = perf_counter()
+            barcodes = _decode_located(image, decoder, every=scanline is None)
+            self._record(LOCATE_STAGE, perf_counter() - start, hit=bool(barcodes))
+            if barcodes:
+                return barcodes
+
+        gray = _as_gray(image)
+        pixels = gray.width * gray.height
+        for stage in self.stages:
+            if stage.max_pixels is not None and pixels > stage.max_pixels:
+                continue
+            start = perf_counter()
+            barcodes = decoder.decode(stage.prepare(gray))
+            self._record(stage.name, perf_counter() - start, hit=bool(barcodes))
+            if barcodes:
+                return barcodes
+        return []
+
+    def stats(self) -> dict[str, StageStats]:
+        """Cópia dos contadores de cada estágio."""
+        with self._lock:
+            return {
+                name: StageStats(stat.attempts, stat.hits, stat.seconds)
+                for name, stat in self._stats.items()
+            }
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            for stat in self._stats.values():
+                stat.attempts = stat.hits = 0
+                stat.seconds = 0.0
+
+    def _record(self, name: str, seconds: float, *, hit: bool) -> None:
+        with self._lock:
+            stat = self._stats[name]
+            stat.attempts += 1
+            stat.hits += hit
+            stat.seconds += seconds
+
+
+def _scanline_band(
+    image: "Image.Image | GrayImage", row: int
+) -> "Image.Image | tuple[bytes, int, int]":
+    # Faixa com a largura toda e poucas linhas de altura, centrada em ``row``
+    height = image.height if isinstance(image, Image.Image) else image[2]
+    top = min(max(row - SCANLINE_BAND_HEIGHT // 2, 0), height - 1)
+    bottom = min(top + SCANLINE_BAND_HEIGHT, height)
+    if isinstance(image, Image.Image):
+        return _as_gray(image).crop((0, top, image.width, bottom))
+    # As linhas são contíguas no buffer: a faixa é uma fatia dele
+    pixels, width, _ = image
+    return pixels[top * width : bottom * width], width, bottom - top
+
+
+def _decode_located(
+    image: "Image.Image | GrayImage", decoder: ZbarDecoder, *, every: bool
+) -> list[Decoded]:
+    """
+    Lê só os recortes, em resolução cheia, das regiões que parecem códigos.
+
+    Com ``every`` lê todas as regiões e junta os códigos distintos; senão
+    tenta as ``LOCATE_TOP_N`` mais prováveis e para no primeiro acerto.
+    Uma imagem com regiões demais (ex.: uma foto) é deixada para os
+    estágios seguintes.
+    """
+    # NumPy só é carregado na primeira leitura que chega a este estágio
+    from bar_code_reader.preprocess import get_preprocessor
+
+    preprocessor = get_preprocessor()
+    gray = preprocessor.to_gray(image)
+    boxes = preprocessor.candidate_boxes(gray)
+    if every and len(boxes) > LOCATE_MAX_REGIONS:
+        return []
+
+    found: dict[bytes, Decoded] = {}
+    for top, bottom, left, right in boxes if every else boxes[:LOCATE_TOP_N]:
+        crop = preprocessor.crop(gray, (top, bottom, left, right))
+        preprocessor.stretch_contrast(crop)
+        for barcode in decoder.decode(crop):
+            found.setdefault(barcode.data, _shift(barcode, left, top))
+        if found and not every:
+            break
+    return list(found.values())
+
+
+def _shift(barcode: Decoded, left: int, top: int) -> Decoded:
+    # Posições relativas à imagem inteira, como nos outros estágios
+    return barcode._replace(
+        rect=Rect(
+            barcode.rect.left + left,
+            barcode.rect.top + top,
+            barcode.rect.width,
+            barcode.rect.height,
+        ),
+        polygon=[Point(point.x + left, point.y + top) for point in barcode.polygon],
+    )
+
+
+def _as_gray(image: "Image.Image | GrayImage") -> Image.Image:
+    if isinstance(image, Image.Image):
+        return image if image.mode == "L" else image.convert("L")
+    # GrayImage: usa o mesmo buffer, sem copiar os pixels
+    pixels, width, height = image
+    return Image.frombuffer("L", (width, height), pixels, "raw", "L", 0, 1)
+
+
+default_pipeline = DecodePipeline()
@@ -0,0 +1,26 @@
+"""
+Tipos compartilhados pela camada de leitura. Não dependem do Pillow nem do
+zbar, então podem ser importados pela interface e pela linha de comando sem
+carregar a pilha de decodificação.
+"""
+
+from enum import StrEnum
+from typing import NamedTuple
+
+
+class GrayImage(NamedTuple):
+    """
+    Imagem em tons de cinza (8 bits por pixel) em memória, linha a linha,
+    sem preenchimento entre as linhas. É o formato nativo do zbar, então
+    pode ser entregue ao ``pyzbar.decode`` sem nenhuma conversão.
+    """
+
+    pixels: bytes
+    width: int
+    height: int
+
+
+class DecodeProfile(StrEnum):
+    BOLETO = "boleto"  # Intercalado 2 de 5 com exatamente 44 dígitos
+    QRCODE = "qrcode"  # QR Code (ex.: PIX)
+    ALL = "all"  # Todas as simbologias suportadas pelo zbar
@@ -0,0 +1,119 @@
+from time import perf_counter
+
+from PySide6.QtCore import QCoreApplication, QObject, QRunnable, QThreadPool, Signal
+
+from bar_code_reader.decode_bar import DecodeBar, GrayImage
+from bar_code_reader.decode_cache import DecodeCache
+from bar_code_reader.timing import scan_timer
+
+
+class DecodeSignals(QObject):
+    # id da leitura, lista de códigos (ou a exceção), instante da captura
+    finished = Signal(int, object, float)
+
+
+class DecodeTask(QRunnable):
+    def __init__(
+        self,
+        scan_id: int,
+        image: GrayImage,
+        captured_at: float,
+        cache: DecodeCache | None = None,
+        scanline: int | None = None,
+    ) -> None:
+        super().__init__()
+        self.setAutoDelete(False)
+        self.scan_id = scan_id
+        self.image = image
+        self.captured_at = captured_at
+        self.cache = cache
+        self.scanline = scanline
+        self.submitted_at = perf_counter()
+        self.signals = DecodeSignals()
+
+    def run(self) -> None:
+        scan_timer.add(
+            self.captured_at, "queue_wait", perf_counter() - self.submitted_at
+        )
+        try:
+            with scan_timer.span(self.captured_at, "decode"):
+                decoder = DecodeBar(
+                    self.image, scanline=self.scanline, cache=self.cache
+                )
+                result = decoder.decoded_bar()
+        except Exception as e:  # noqa: BLE001
+            result = e
+        self.signals.finished.emit(self.scan_id, result, self.captured_at)
+
+
+class DecodeWorker(QObject):
+    """
+    Decodifica as capturas fora da thread da interface.
+
+    Só a captura mais recente interessa: uma nova leitura tira da fila a
+    anterior que ainda não começou, e o resultado de uma leitura que já
+    estava em andamento é descartado ao chegar. Capturas idênticas a uma
+    já lida (ex.: o mesmo boleto na tela) saem do cache, sem passar pelo zbar.
+    """
+
+    decoded = Signal(object, float)  # códigos lidos, instante da captura
+    failed = Signal(str)
+
+    def __init__(self, parent: QObject | None = None) -> None:
+        super().__init__(parent)
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(1)
+        self._scan_id = 0
+        self._tasks: dict[int, DecodeTask] = {}
+        self.cache = DecodeCache()
+
+        # Espera a leitura em andamento antes de o Qt destruir os objetos
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.shutdown)
+
+    def shutdown(self) -> None:
+        self._pool.clear()
+        self._pool.waitForDone()
+
+    def submit(
+        self,
+        image: GrayImage,
+        captured_at: float | None = None,
+        *,
+        multi: bool = False,
+    ) -> None:
+        """
+        Agenda a leitura da captura. Com ``multi=True`` a imagem inteira é
+        lida de uma vez, sem priorizar a linha central da seleção.
+        """
+        # Tarefas tiradas da fila nunca rodam, então nunca emitem ``finished``:
+        # saem daqui mesmo, liberando a captura e os sinais
+        for scan_id, task in list(self._tasks.items()):
+            if self._pool.tryTake(task):
+                del self._tasks[scan_id]
+                scan_timer.discard(task.captured_at)
+                task.signals.finished.disconnect(self._on_finished)
+                task.signals.deleteLater()
+
+        self._scan_id += 1
+        task = DecodeTask(
+            self._scan_id,
+            image,
+            perf_counter() if captured_at is None else captured_at,
+            self.cache,
+            # A captura é recortada da seleção: a linha vermelha fica no centro
+            None if multi else image.height // 2,
+        )
+        task.signals.finished.connect(self._on_finished)
+        self._tasks[self._scan_id] = task
+        self._pool.start(task)
+
+    def _on_finished(self, scan_id: int, result: object, captured_at: float) -> None:
+        self._tasks.pop(scan_id, None)
+        if scan_id != self._scan_id:
+            return  # Resultado de uma captura antiga
+        if isinstance(result, Exception):
+            self.failed.emit(f"{type(result).__name__}: {result}")
+        else:
+            self.decoded.emit(result, captured_at)
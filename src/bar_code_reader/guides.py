@@ -0,0 +1,426 @@
+"""
+Guias de pagamento (boletos bancários e de arrecadação) a partir do código
+de barras ou da linha digitável. Só depende da biblioteca padrão, então pode
+ser importado sem carregar o Pillow nem o zbar.
+"""
+
+import re
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Iterable, Iterator
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Self
+
+from bar_code_reader.check_digit import (
+    modulo10,
+    modulo11_collection,
+    modulo11_transfer,
+)
+from bar_code_reader.constants import (
+    CODIGO_ARRECADAO,
+    DATA_BASE_VENCIMENTO,
+    DATA_BASE_VENCIMENTO_2025,
+    FATOR_VENCIMENTO_LIMITE_2025,
+    FATOR_VENCIMENTO_MINIMO_2025,
+    MODULO10_QUANTIDADE_MOEDA,
+    MODULO10_VALOR_EFETIVO,
+    MODULO11_QUANTIDADE_MOEDA,
+    MODULO11_VALOR_EFETIVO,
+    TAMANHO_CODIGO_BARRAS,
+    TAMANHO_LINHA_ARRECADACAO,
+    TAMANHO_LINHA_BANCARIA,
+)
+
+_NAO_DIGITOS = re.compile(r"\D")
+
+
+class LineCode(ABC):
+    __slots__ = ()
+
+    @abstractmethod
+    def calc_modulo10(self, field: str):
+        pass
+
+    @abstractmethod
+    def calc_modulo11(self, field: str):
+        pass
+
+    @property
+    @abstractmethod
+    def amount(self) -> Decimal | None:
+        pass
+
+    @abstractmethod
+    def __str__(self) -> str:
+        pass
+
+    @abstractmethod
+    def __repr__(self) -> str:
+        pass
+
+
+class CollectionGuide(LineCode):
+    __slots__ = (
+        "_fields",
+        "check_digit",
+        "company_identify",
+        "currency_code",
+        "free_field",
+        "modulo",
+        "product",
+        "segment",
+        "value",
+    )
+
+    def __init__(self, code: str) -> None:
+        """
+        Posição     Tamanho     Conteúdo
+        01 a 01     01          Identificação do Produto
+        02 a 02     01          Identificação do Segmento
+        03 a 03     01          Identificação do valor real ou referência
+        04 a 04     01          Dígito verificador geral (módulo 10 ou 11)
+        05 a 15     11          Valor
+        16 a 19     04          Identificação da Empresa/Órgão
+        20 a 44     25          Campo livre de utilização da Empresa/Órgão
+        """
+        self.product = code[0:1]
+        self.segment = code[1:2]
+        self.currency_code = code[2:3]
+        self.check_digit = code[3:4]
+        self.value = code[4:15]
+        self.company_identify = code[15:19]
+        self.free_field = code[19:44]
+
+        self.modulo = self.module_func()
+        self._fields: tuple[str, str, str, str] | None = None
+
+    @property
+    def fields(self) -> tuple[str, str, str, str]:
+        """Campos da linha digitável, calculados só na primeira leitura."""
+        if self._fields is None:
+            blocks = (
+                self.product
+                + self.segment
+                + self.currency_code
+                + self.check_digit
+                + self.value[:7],
+                self.value[7:] + self.company_identify + self.free_field[:3],
+                self.free_field[3:14],
+                self.free_field[14:],
+            )
+            self._fields = (
+                blocks[0] + self.modulo(blocks[0]),
+                blocks[1] + self.modulo(blocks[1]),
+                blocks[2] + self.modulo(blocks[2]),
+                blocks[3] + self.modulo(blocks[3]),
+            )
+        return self._fields
+
+    @property
+    def amount(self) -> Decimal | None:
+        """
+        Valor em reais, ou None quando o campo valor é uma referência
+        (quantidade de moeda) e não um valor efetivo.
+        """
+        if int(self.currency_code) not in (
+            MODULO10_VALOR_EFETIVO,
+            MODULO11_VALOR_EFETIVO,
+        ):
+            return None
+        return Decimal(int(self.value)).scaleb(-2)
+
+    @property
+    def field_1(self) -> str:
+        return self.fields[0]
+
+    @property
+    def field_2(self) -> str:
+        return self.fields[1]
+
+    @property
+    def field_3(self) -> str:
+        return self.fields[2]
+
+    @property
+    def field_4(self) -> str:
+        return self.fields[3]
+
+    @classmethod
+    def from_digitable_line(cls, line: str) -> Self:
+        """
+        Cria a guia a partir da linha digitável de 48 dígitos, validando os
+        dígitos verificadores. Os campos já vêm prontos da própria linha.
+        """
+        digits = _NAO_DIGITOS.sub("", line)
+        guide = cls(cls.barcode_from_digitable_line(digits))
+        guide._fields = (digits[0:12], digits[12:24], digits[24:36], digits[36:48])
+        return guide
+
+    @staticmethod
+    def barcode_from_digitable_line(line: str) -> str:
+        """
+        Converte a linha digitável de 48 dígitos (4 blocos de 11 dígitos + DV)
+        no código de barras de 44 dígitos, conferindo o DV de cada bloco e o
+        DV geral. Levanta ``ValueError`` se algum não conferir.
+        """
+        digits = _NAO_DIGITOS.sub("", line)
+        if len(digits) != TAMANHO_LINHA_ARRECADACAO:
+            msg = f"Linha digitável de arrecadação com {len(digits)} dígitos"
+            raise ValueError(msg)
+
+        codigo_moeda = int(digits[2])
+        if codigo_moeda in (MODULO10_VALOR_EFETIVO, MODULO10_QUANTIDADE_MOEDA):
+            modulo = modulo10
+        elif codigo_moeda in (MODULO11_VALOR_EFETIVO, MODULO11_QUANTIDADE_MOEDA):
+            modulo = modulo11_collection
+        else:
+            msg = f"Código moeda inválido {codigo_moeda}"
+            raise ValueError(msg)
+
+        blocks = (digits[0:11], digits[12:23], digits[24:35], digits[36:47])
+        for number, (block, dv) in enumerate(
+            zip(blocks, digits[11::12], strict=True), 1
+        ):
+            if modulo(block) != int(dv):
+                msg = f"Dígito verificador do campo {number} não confere: {line}"
+                raise ValueError(msg)
+
+        barcode = "".join(blocks)
+        if modulo(barcode[:3] + barcode[4:]) != int(barcode[3]):
+            msg = f"Dígito verificador geral não confere: {line}"
+            raise ValueError(msg)
+        return barcode
+
+    def module_func(self) -> Callable:
+        codigo_moeda = self.currency_code
+
+        if (
+            int(codigo_moeda) == MODULO10_VALOR_EFETIVO
+            or int(codigo_moeda) == MODULO10_QUANTIDADE_MOEDA
+        ):
+            return self.calc_modulo10
+        if (
+            int(codigo_moeda) == MODULO11_VALOR_EFETIVO
+            or int(codigo_moeda) == MODULO11_QUANTIDADE_MOEDA
+        ):
+            return self.calc_modulo11
+        return lambda x: "Error"
+
+    def calc_modulo10(self, sequencia: str) -> str:
+        return str(modulo10(sequencia))
+
+    def calc_modulo11(self, sequencia: str) -> str:
+        return str(modulo11_collection(sequencia))
+
+    def __str__(self) -> str:
+        if hasattr(self.modulo, "__name__") and self.modulo.__name__ == "<lambda>":
+            return f"Erro: Código moeda inválido {self.currency_code}"
+        return "".join(self.fields)
+
+    def __repr__(self) -> str:
+        if hasattr(self.modulo, "__name__") and self.modulo.__name__ == "<lambda>":
+            return f"Erro: Código moeda inválido {self.currency_code}"
+        return " ".join(f"{field[:-1]} {field[-1:]}" for field in self.fields)
+
+
+class TransferGuide(LineCode):
+    __slots__ = (
+        "_fields",
+        "bank",
+        "check_digit",
+        "currency_code",
+        "date_fixed",
+        "expiration_factor",
+        "free_field",
+        "value",
+    )
+
+    def __init__(self, code: str) -> None:
+        """
+        Posição     Tamanho     Picture     Conteúdo
+        01 a 03     03          9(03)       Código do Banco na Câmara
+                                            de Compensação = '001'
+        04 a 04     01          9(01)       Código da Moeda = 9 (Real)
+        05 a 05     01          9(01)       Digito Verificador (DV) do
+                                            código de Barras*
+        06 a 09     04          9(04)       Fator de Vencimento **
+        10 a 19     10          9(08)V(2)   Valor
+        20 a 44     03          9(03)       Campo Livre ***
+        """
+        self.bank = code[0:3]
+        self.currency_code = code[3:4]
+        self.check_digit = code[4:5]
+        self.expiration_factor = code[5:9]
+        self.value = code[9:19]
+        self.free_field = code[19:44]
+        self.date_fixed = self.fator_vencimento()
+        self._fields: tuple[str, str, str, str, str] | None = None
+
+    @property
+    def vencimento(self) -> date:
+        return self.date_fixed + timedelta(days=int(self.expiration_factor))
+
+    @property
+    def amount(self) -> Decimal:
+        """Valor do boleto em reais (zero quando o valor fica em aberto)."""
+        return Decimal(int(self.value)).scaleb(-2)
+
+    @property
+    def fields(self) -> tuple[str, str, str, str, str]:
+        """Campos da linha digitável, calculados só na primeira leitura."""
+        if self._fields is None:
+            field_1 = self.bank + self.currency_code + self.free_field[:5]
+            field_2 = self.free_field[5:15]
+            field_3 = self.free_field[15:25]
+            self._fields = (
+                field_1 + self.calc_modulo10(field_1),
+                field_2 + self.calc_modulo10(field_2),
+                field_3 + self.calc_modulo10(field_3),
+                self.check_digit,
+                self.expiration_factor + self.value,
+            )
+        return self._fields
+
+    @property
+    def field_1(self) -> str:
+        return self.fields[0]
+
+    @property
+    def field_2(self) -> str:
+        return self.fields[1]
+
+    @property
+    def field_3(self) -> str:
+        return self.fields[2]
+
+    @property
+    def field_4(self) -> str:
+        return self.fields[3]
+
+    @property
+    def field_5(self) -> str:
+        return self.fields[4]
+
+    @classmethod
+    def from_digitable_line(cls, line: str) -> Self:
+        """
+        Cria o boleto a partir da linha digitável de 47 dígitos, validando os
+        dígitos verificadores. Os campos já vêm prontos da própria linha.
+        """
+        digits = _NAO_DIGITOS.sub("", line)
+        guide = cls(cls.barcode_from_digitable_line(digits))
+        guide._fields = (
+            digits[0:10],
+            digits[10:21],
+            digits[21:32],
+            digits[32],
+            digits[33:47],
+        )
+        return guide
+
+    @staticmethod
+    def barcode_from_digitable_line(line: str) -> str:
+        """
+        Converte a linha digitável de 47 dígitos no código de barras de 44
+        dígitos, conferindo o DV dos três primeiros campos e o DV geral.
+        Levanta ``ValueError`` se algum não conferir.
+
+        Campo 1: banco, moeda, campo livre 1-5 e DV
+        Campo 2: campo livre 6-15 e DV
+        Campo 3: campo livre 16-25 e DV
+        Campo 4: DV geral do código de barras
+        Campo 5: fator de vencimento e valor
+        """
+        digits = _NAO_DIGITOS.sub("", line)
+        if len(digits) != TAMANHO_LINHA_BANCARIA:
+            msg = f"Linha digitável bancária com {len(digits)} dígitos"
+            raise ValueError(msg)
+
+        blocks = (digits[0:9], digits[10:20], digits[21:31])
+        for number, (block, dv) in enumerate(
+            zip(blocks, digits[9:32:11], strict=True), 1
+        ):
+            if modulo10(block) != int(dv):
+                msg = f"Dígito verificador do campo {number} não confere: {line}"
+                raise ValueError(msg)
+
+        sem_dv = digits[0:4] + digits[33:47] + digits[4:9] + blocks[1] + blocks[2]
+        if modulo11_transfer(sem_dv) != int(digits[32]):
+            msg = f"Dígito verificador geral não confere: {line}"
+            raise ValueError(msg)
+        return sem_dv[:4] + digits[32] + sem_dv[4:]
+
+    def fator_vencimento(self) -> date:
+        """
+        Calcula-se o número de dias corridos entre a data base
+        (“Fixada” em 07/10/1997) e a do vencimento desejado.
+
+        A partir de 22.02.2025, o fator retorna para “1000”
+        adicionando-se “1” a cada dia subsequente a este fator.
+        """
+        fator = int(self.expiration_factor)
+        if FATOR_VENCIMENTO_MINIMO_2025 <= fator < FATOR_VENCIMENTO_LIMITE_2025:
+            return DATA_BASE_VENCIMENTO_2025
+        return DATA_BASE_VENCIMENTO
+
+    def calc_modulo10(self, sequencia: str) -> str:
+        return str(modulo10(sequencia))
+
+    def calc_modulo11(self, sequencia: str) -> str:
+        return str(modulo11_transfer(sequencia))
+
+    def __str__(self) -> str:
+        if self.currency_code != "9":
+            return f"Erro: Código moeda inválido {self.currency_code}"
+        if self.check_digit == "0":
+            return f"Erro: Digito verificado {self.check_digit}"
+        return "".join(self.fields)
+
+    def __repr__(self) -> str:
+        if self.currency_code != "9":
+            return f"Erro: Código moeda inválido {self.currency_code}"
+        if self.check_digit == "0":
+            return f"Erro: Digito verificador {self.check_digit}"
+        field_1, field_2, field_3, field_4, field_5 = self.fields
+        return (
+            f"{field_1[:5]}.{field_1[5:]} "
+            f"{field_2[:5]}.{field_2[5:]} "
+            f"{field_3[:5]}.{field_3[5:]} "
+            f"{field_4} "
+            f"{field_5}"
+        )
+
+
+def convert_code(code: str) -> LineCode | str:
+    """
+    Converte o conteúdo lido do código de barras na guia correspondente.
+    Códigos que não têm 44 dígitos são devolvidos sem alteração.
+    """
+    if len(code) != TAMANHO_CODIGO_BARRAS or not code.isdigit():
+        return code
+    if int(code[0]) == CODIGO_ARRECADAO:
+        return CollectionGuide(code)
+    return TransferGuide(code)
+
+
+def barcode_from_digitable_line(line: str) -> str:
+    """
+    Converte uma linha digitável (47 ou 48 dígitos, com ou sem formatação)
+    no código de barras de 44 dígitos. Levanta ``ValueError`` se inválida.
+    """
+    digits = _NAO_DIGITOS.sub("", line)
+    if len(digits) == TAMANHO_LINHA_ARRECADACAO:
+        return CollectionGuide.barcode_from_digitable_line(digits)
+    return TransferGuide.barcode_from_digitable_line(digits)
+
+
+def barcodes_from_digitable_lines(lines: Iterable[str]) -> Iterator[str | None]:
+    """
+    Versão em lote de ``barcode_from_digitable_line`` para colunas inteiras
+    (ex.: de um CSV). Linhas inválidas geram ``None`` em vez de interromper.
+    """
+    for line in lines:
+        try:
+            yield barcode_from_digitable_line(line)
+        except ValueError:
+            yield None
@@ -1,20 +1,29 @@
-import os
-import tempfile
-from pathlib import Path
+from time import perf_counter
+from typing import TYPE_CHECKING
 
-from PySide6.QtCore import Qt
-from PySide6.QtGui import QClipboard
+from PySide6.QtCore import QRect, Qt, QTimer
+from PySide6.QtGui import QClipboard, QKeySequence, QScreen, QShortcut, QShowEvent
 from PySide6.QtWidgets import (
     QApplication,
+    QFileDialog,
     QLabel,
+    QListWidget,
     QMainWindow,
+    QPlainTextEdit,
     QPushButton,
     QVBoxLayout,
     QWidget,
 )
 
-from bar_code_reader.decode_bar import CollectionGuide, DecodeBar, TransferGuide
+from bar_code_reader.constants import TIMING_HISTORY
+from bar_code_reader.decode_types import GrayImage
+from bar_code_reader.guides import LineCode, convert_code
 from bar_code_reader.other_window import OtherWindow
+from bar_code_reader.region_watch import RegionWatcher
+from bar_code_reader.timing import ScanTiming, scan_timer
+
+if TYPE_CHECKING:
+    from bar_code_reader.decode_worker import DecodeWorker
 
 
 class MainWindow(QMainWindow):
@@ -33,11 +42,89 @@ class MainWindow(QMainWindow):
         self.button1.clicked.connect(self.openWindows)
         self.vLayout.addWidget(self.button1, alignment=Qt.AlignmentFlag.AlignHCenter)
 
+        # Monitora a última região selecionada, relendo quando o conteúdo muda
+        self.watchButton = self.makeButton("Monitorar região")
+        self.watchButton.setCheckable(True)
+        self.watchButton.setEnabled(False)
+        self.watchButton.toggled.connect(self.toggleWatch)
+        self.vLayout.addWidget(
+            self.watchButton, alignment=Qt.AlignmentFlag.AlignHCenter
+        )
+
+        # Lê todos os códigos da seleção de uma vez (ex.: folha de remessa)
+        self.multiButton = self.makeButton("Vários códigos")
+        self.multiButton.setCheckable(True)
+        self.vLayout.addWidget(
+            self.multiButton, alignment=Qt.AlignmentFlag.AlignHCenter
+        )
+
         self.label1 = self.makeLabel("Press the button to scan the code.")
         self.vLayout.addWidget(self.label1, alignment=Qt.AlignmentFlag.AlignHCenter)
 
-        self.listWindows: list[QMainWindow] = []
-        self.temp_file_path = None
+        self.statusLabel = self.makeLabel("")
+        self.statusLabel.setStyleSheet("font-size: 11; color: gray; padding: 4;")
+        self.vLayout.addWidget(
+            self.statusLabel, alignment=Qt.AlignmentFlag.AlignHCenter
+        )
+
+        self.resultList = QListWidget()
+        self.resultList.setMinimumWidth(480)
+        self.resultList.hide()
+        self.vLayout.addWidget(self.resultList)
+
+        self.copyCsvButton = self.makeButton("Copiar CSV")
+        self.copyCsvButton.clicked.connect(self.copyCsv)
+        self.copyCsvButton.hide()
+        self.vLayout.addWidget(
+            self.copyCsvButton, alignment=Qt.AlignmentFlag.AlignHCenter
+        )
+        self.listCodes: list[tuple[str, LineCode | str]] = []
+
+        # Painel de depuração (F12): tempo de cada etapa das leituras
+        self.debugPanel = QPlainTextEdit()
+        self.debugPanel.setReadOnly(True)
+        self.debugPanel.setMaximumBlockCount(TIMING_HISTORY)
+        self.debugPanel.setMinimumWidth(480)
+        self.debugPanel.hide()
+        self.vLayout.addWidget(self.debugPanel)
+
+        self.saveTimingButton = self.makeButton("Salvar tempos")
+        self.saveTimingButton.clicked.connect(self.saveTiming)
+        self.saveTimingButton.hide()
+        self.vLayout.addWidget(
+            self.saveTimingButton, alignment=Qt.AlignmentFlag.AlignHCenter
+        )
+        QShortcut(QKeySequence("F12"), self, self.toggleDebugPanel)
+
+        # Janelas de seleção, uma por tela, criadas uma vez e reaproveitadas
+        self.listWindows: list[OtherWindow] = []
+        app = QApplication.instance()
+        app.screenAdded.connect(self.discardWindows)
+        app.screenRemoved.connect(self.discardWindows)
+        self.lastRegion: tuple[QScreen, QRect] | None = None
+        self.lastCode: str | None = None
+
+        self.regionWatcher = RegionWatcher(self)
+        self.regionWatcher.frameChanged.connect(self.readCodeBar)
+
+        # Decodificação fora da thread da interface. A pilha de leitura
+        # (Pillow, zbar) é carregada depois que a janela aparece (showEvent)
+        self.decodeWorker: DecodeWorker | None = None
+
+    def showEvent(self, event: QShowEvent) -> None:  # noqa: N802
+        super().showEvent(event)
+        # Agendado para depois da primeira pintura, que já está na fila
+        if self.decodeWorker is None:
+            QTimer.singleShot(0, self.loadDecodeWorker)
+
+    def loadDecodeWorker(self) -> "DecodeWorker":
+        if self.decodeWorker is None:
+            from bar_code_reader.decode_worker import DecodeWorker
+
+            self.decodeWorker = DecodeWorker(self)
+            self.decodeWorker.decoded.connect(self.showDecoded)
+            self.decodeWorker.failed.connect(self.showDecodeError)
+        return self.decodeWorker
 
     def adjustFixedSize(self) -> None:
         self.adjustSize()
@@ -59,52 +146,133 @@ class MainWindow(QMainWindow):
         return label
 
     def openWindows(self):
-        # Cria arquivo temporário na raiz do projeto
-        temp_dir = Path(__file__).parent.parent.parent
-        temp_file = tempfile.NamedTemporaryFile(
-            dir=temp_dir, suffix=".png", delete=True
-        )
-        self.temp_file_path = temp_file.name
-        temp_file.close()
-
-        screens = QApplication.screens()
-        for screen in screens:
-            self.otherWindow = OtherWindow(
-                mainWindow=self, screen=screen, temp_file_path=self.temp_file_path
-            )
-            self.otherWindow.setGeometry(screen.geometry())
-            self.otherWindow.closeSignal.connect(self.closeBothWindows)
-            self.otherWindow.codeBarSignal.connect(self.readCodeBar)
-            self.otherWindow.show()
-            self.listWindows.append(self.otherWindow)
+        if not self.listWindows:
+            for screen in QApplication.screens():
+                window = OtherWindow(mainWindow=self, screen=screen)
+                window.closeSignal.connect(self.closeBothWindows)
+                window.codeBarSignal.connect(self.readCodeBar)
+                window.regionSignal.connect(self.rememberRegion)
+                self.listWindows.append(window)
+        for window in self.listWindows:
+            window.show()
         self.hide()
 
     def closeBothWindows(self):
-        # Fecha ambas as janelas
-        for _window in self.listWindows:
-            _window.close()
-            _window = None
-
-    def readCodeBar(self):
-        # Usa o arquivo temporário gerado
-        barcodes = DecodeBar(self.temp_file_path).decoded_bar()
+        # Só esconde: as janelas são reaproveitadas na próxima leitura.
+        # hide() não dispara closeEvent, então o sinal não volta para cá
+        for window in self.listWindows:
+            window.hide()
+
+    def discardWindows(self):
+        # As telas mudaram: as janelas são recriadas na próxima leitura
+        for window in self.listWindows:
+            window.deleteLater()
+        self.listWindows.clear()
+
+    def rememberRegion(self, screen: QScreen, rect: QRect):
+        self.lastRegion = (screen, rect)
+        self.lastCode = None
+        self.watchButton.setEnabled(True)
+        if self.regionWatcher.isActive():
+            self.regionWatcher.start(screen, rect)
+
+    def toggleWatch(self, checked: bool):  # noqa: FBT001
+        if checked and self.lastRegion is not None:
+            self.regionWatcher.start(*self.lastRegion)
+            self.statusLabel.setText("Monitorando a região selecionada...")
+        else:
+            self.regionWatcher.stop()
+            self.statusLabel.setText("")
+
+    def readCodeBar(self, image: GrayImage, captured_at: float):
+        # A captura chega já em memória e é lida em segundo plano. Quadros
+        # do monitoramento mantêm o último resultado até chegar um novo
+        if not self.regionWatcher.isActive():
+            self.label1.setText("Lendo código...")
+        self.loadDecodeWorker().submit(
+            image, captured_at, multi=self.multiButton.isChecked()
+        )
+
+    def showDecoded(self, barcodes: list, captured_at: float):
+        try:
+            with scan_timer.span(captured_at, "convert"):
+                self.showBarcodes(barcodes, captured_at)
+        finally:
+            scan_timer.finish(captured_at)
+
+    def showBarcodes(self, barcodes: list, captured_at: float):
         if not barcodes:
+            # O código sumiu: quando voltar, é mostrado de novo
+            self.lastCode = None
             self.label1.setText("Nenhum código de barras foi detectado na imagem.")
+        elif self.multiButton.isChecked():
+            from bar_code_reader.decode_bar import sorted_codes  # já carregado
+
+            codes = sorted_codes(barcodes)
+            if self.regionWatcher.isActive() and ";".join(codes) == self.lastCode:
+                return  # Mesmos códigos de antes: nada novo a mostrar
+            self.lastCode = ";".join(codes)
+            self.showList(codes)
         else:
-            code = self.codeCovert(barcodes[0].data.decode("utf-8"))
-            self.showLabel(code)
-        # Exclui o arquivo temporário após leitura
-        try:
-            os.remove(self.temp_file_path)
-        except Exception as e:
-            print(f"Erro ao remover arquivo temporário: {e}")
-
-    def codeCovert(self, code: str) -> object | str:
-        if code[0] == "8" and len(code) == 44:
-            return CollectionGuide(code)
-        if code[0] != "8" and len(code) == 44:
-            return TransferGuide(code)
-        return code
+            data = barcodes[0].data.decode("utf-8")
+            if self.regionWatcher.isActive() and data == self.lastCode:
+                return  # Mesmo código de antes: nada novo a mostrar
+            self.lastCode = data
+            self.resultList.hide()
+            self.copyCsvButton.hide()
+            self.showLabel(self.codeCovert(data))
+        elapsed_ms = (perf_counter() - captured_at) * 1000
+        self.statusLabel.setText(f"Tempo de leitura: {elapsed_ms:.0f} ms")
+
+    def toggleDebugPanel(self):
+        enabled = not self.debugPanel.isVisible()
+        scan_timer.enabled = enabled
+        if enabled:
+            scan_timer.add_hook(self.showTiming)
+        else:
+            scan_timer.remove_hook(self.showTiming)
+        self.debugPanel.setVisible(enabled)
+        self.saveTimingButton.setVisible(enabled)
+
+    def showTiming(self, scan: ScanTiming):
+        spans = " | ".join(
+            f"{span.name} {span.seconds * 1000:.1f}" for span in scan.spans
+        )
+        self.debugPanel.appendPlainText(f"{scan.total * 1000:.1f} ms: {spans}")
+
+    def saveTiming(self):
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Salvar tempos", "tempos.json", "JSON (*.json)"
+        )
+        if path:
+            scan_timer.dump_json(path)
+
+    def showDecodeError(self, message: str):
+        self.label1.setText(f"Erro ao ler o código: {message}")
+        self.statusLabel.setText("")
+
+    def codeCovert(self, code: str) -> LineCode | str:
+        return convert_code(code)
+
+    def showList(self, codes: list[str]):
+        self.listCodes = [(code, self.codeCovert(code)) for code in codes]
+        self.resultList.clear()
+        self.resultList.addItems(
+            [
+                f"{index}. {converted!r}"
+                for index, (_, converted) in enumerate(self.listCodes, start=1)
+            ]
+        )
+        self.resultList.show()
+        self.copyCsvButton.show()
+        self.copyCsv()
+        self.label1.setText(f"{len(codes)} códigos lidos (copiados como CSV).")
+
+    def copyCsv(self):
+        # Mesmo formato do processamento em lote: código;linha digitável
+        rows = [f"{code};{converted}" for code, converted in self.listCodes]
+        clipboard = QApplication.clipboard()
+        clipboard.setText("\n".join(rows), mode=QClipboard.Mode.Clipboard)
 
     def showLabel(self, codeConverted):
         clipboard = QApplication.clipboard()
@@ -1,26 +1,42 @@
+from time import perf_counter
+
 from PySide6.QtCore import QPoint, QRect, QSize, Qt, Signal
 from PySide6.QtGui import QColor, QKeyEvent, QPainter, QPen
 from PySide6.QtWidgets import QMainWindow, QRubberBand
 
+from bar_code_reader.qt_image import qimage_to_gray
+from bar_code_reader.timing import scan_timer
+
 
 class OtherWindow(QMainWindow):
-    closeSignal = Signal()  # Sinal para fechar ambas as janelas
-    codeBarSignal = Signal()
+    closeSignal = Signal()  # Sinal para esconder as janelas de todas as telas
+    # GrayImage com a área capturada e o instante (perf_counter) da captura
+    codeBarSignal = Signal(object, float)
+    regionSignal = Signal(object, QRect)  # Tela e região selecionadas
 
-    def __init__(self, mainWindow: QMainWindow, screen, temp_file_path: str):
+    def __init__(self, mainWindow: QMainWindow, screen):
         super().__init__()
         self.mainWindow = mainWindow
         self._screen = screen
-        self.temp_file_path = temp_file_path
         self.setWindowOpacity(0.5)  # Torna a janela semi-transparente
         self.setWindowFlags(
             Qt.WindowType.FramelessWindowHint | Qt.WindowType.WindowStaysOnTopHint
         )
 
+        self.setGeometry(screen.geometry())
+
         self.rubber_band = QRubberBand(QRubberBand.Shape.Rectangle, self)
         self.origin = QPoint()
         self.selection_rect = QRect()
 
+    def showEvent(self, event):
+        # A janela é reaproveitada entre leituras: cada uma começa sem seleção
+        self.origin = QPoint()
+        self.selection_rect = QRect()
+        self.rubber_band.hide()
+        self.setGeometry(self._screen.geometry())
+        super().showEvent(event)
+
     def closeEvent(self, event):
         self.closeSignal.emit()  # Emite o sinal quando a janela é fechada
         super().closeEvent(event)
@@ -33,34 +49,50 @@ class OtherWindow(QMainWindow):
 
     def mouseMoveEvent(self, event):
         if not self.origin.isNull():
-            # Atualiza o retângulo de seleção com as novas coordenadas
-            self.selection_rect = QRect(self.origin, event.pos()).normalized()
+            # Atualiza o retângulo de seleção, limitado à tela desta janela
+            self.selection_rect = (
+                QRect(self.origin, event.pos()).normalized().intersected(self.rect())
+            )
             self.rubber_band.setGeometry(self.selection_rect)
             self.update()
 
     def mouseReleaseEvent(self, event):
-        if event.button() == Qt.MouseButton.LeftButton:
+        if event.button() == Qt.MouseButton.LeftButton and not self.origin.isNull():
             self.rubber_band.hide()
-            self.close()
+            self.origin = QPoint()
+            # Esconde as janelas de todas as telas antes de capturar
+            self.closeSignal.emit()
+            if self.selection_rect.isEmpty():
+                # Clique sem arrastar: captura a tela toda e localiza o código
+                self.selection_rect = self.rect()
             self.capture_area()
             self.mainWindow.show()
 
     def capture_area(self):
-        screenshot = self._screen.grabWindow(
-            0,
-            self.selection_rect.x(),
-            self.selection_rect.y(),
-            self.selection_rect.width(),
-            self.selection_rect.height(),
+        # Só a tela onde a seleção foi feita é capturada. As coordenadas são
+        # lógicas e relativas à tela; o Qt aplica a escala (high-DPI) e
+        # devolve a captura na resolução física
+        captured_at = perf_counter()
+        scan_timer.begin(captured_at)
+        region = QRect(
+            self.mapToGlobal(self.selection_rect.topLeft())
+            - self._screen.geometry().topLeft(),
+            self.selection_rect.size(),
         )
-        # Salva no caminho temporário recebido da MainWindow
-        screenshot.save(self.temp_file_path, "png")
-        self.codeBarSignal.emit()
+        with scan_timer.span(captured_at, "grab_window"):
+            screenshot = self._screen.grabWindow(
+                0, region.x(), region.y(), region.width(), region.height()
+            )
+        with scan_timer.span(captured_at, "to_gray"):
+            image = qimage_to_gray(screenshot)
+        # Entrega a captura em memória, sem salvar PNG em disco
+        self.codeBarSignal.emit(image, captured_at)
+        self.regionSignal.emit(self._screen, region)
 
     def keyPressEvent(self, event: QKeyEvent):
         if event.key() == Qt.Key.Key_Escape:
             self.mainWindow.show()
-            self.close()  # Fecha a janela ao pressionar Esc
+            self.closeSignal.emit()  # Esconde as janelas ao pressionar Esc
         else:
             super().keyPressEvent(event)
 
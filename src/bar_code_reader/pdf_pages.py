@@ -0,0 +1,42 @@
+from collections.abc import Iterator
+from os import PathLike
+
+from PySide6.QtCore import QSize
+from PySide6.QtPdf import QPdfDocument
+
+from bar_code_reader.constants import PDF_DEFAULT_DPI, PDF_POINTS_PER_INCH
+from bar_code_reader.decode_types import GrayImage
+from bar_code_reader.qt_image import qimage_to_gray
+
+
+def iter_pdf_pages(
+    path: str | PathLike[str], dpi: int = PDF_DEFAULT_DPI
+) -> Iterator[tuple[int, GrayImage]]:
+    """
+    Rasteriza as páginas de um PDF uma de cada vez, sob demanda.
+
+    Devolve pares (número da página começando em 1, imagem em tons de cinza).
+    Só a página atual fica em memória, então o consumo não cresce com o
+    tamanho do documento. O PDF é aberto já na chamada: um arquivo inválido
+    levanta ``ValueError`` aqui, e não na primeira página.
+    """
+    document = QPdfDocument(None)
+    error = document.load(str(path))
+    if error != QPdfDocument.Error.None_:
+        msg = f"Não foi possível abrir o PDF {path}: {error.name}"
+        raise ValueError(msg)
+    return _render_pages(document, dpi / PDF_POINTS_PER_INCH)
+
+
+def _render_pages(
+    document: QPdfDocument, scale: float
+) -> Iterator[tuple[int, GrayImage]]:
+    try:
+        for index in range(document.pageCount()):
+            page_size = document.pagePointSize(index)
+            size = QSize(
+                round(page_size.width() * scale), round(page_size.height() * scale)
+            )
+            yield index + 1, qimage_to_gray(document.render(index, size))
+    finally:
+        document.close()
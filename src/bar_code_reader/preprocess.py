@@ -0,0 +1,250 @@
+"""
+Pré-processamento das capturas com NumPy, sem criar uma imagem nova do
+Pillow a cada operação.
+
+Cada thread tem um ``Preprocessor`` com buffers ``uint8`` reaproveitados
+entre as leituras: a captura é copiada uma vez para o buffer de trabalho,
+recortada em volta de cada região que parece um código de barras
+(localizadas numa amostra reduzida da imagem) e tem o contraste ajustado
+no lugar. O resultado é um array contíguo que o ``ZbarDecoder`` lê direto,
+sem outra conversão. Os buffers só crescem
+quando chega uma captura maior, então a memória por leitura fica estável.
+"""
+
+from collections.abc import Iterator
+from threading import local
+
+import numpy as np
+from numpy.typing import NDArray
+from PIL import Image
+
+from bar_code_reader.constants import (
+    LOCATE_DOMINANCE,
+    LOCATE_FILL,
+    LOCATE_MIN_TILES,
+    LOCATE_SAMPLE_SIDE,
+    LOCATE_TILE,
+    LOCATE_TILE_DENSITY,
+    PREPROCESS_BOX_MARGIN,
+    PREPROCESS_BOX_STEP,
+    PREPROCESS_EDGE_MIN,
+)
+from bar_code_reader.decode_types import GrayImage
+
+type GrayArray = NDArray[np.uint8]
+# (topo, base, esquerda, direita) em pixels, com base e direita exclusivas
+type Box = tuple[int, int, int, int]
+
+# Pesos (ITU-R BT.601, em 1/256) da conversão de RGB para tons de cinza
+_PESO_R, _PESO_G, _PESO_B = 77, 150, 29
+
+
+class Preprocessor:
+    def __init__(self) -> None:
+        self._work = np.empty(0, np.uint8)
+        self._out = np.empty(0, np.uint8)
+        self._wide = np.empty(0, np.uint16)
+        self._channel = np.empty(0, np.uint16)
+        self._edges = np.empty(0, np.int16)
+        self._vertical = np.empty(0, np.bool_)
+        self._horizontal = np.empty(0, np.bool_)
+        self._mask = np.empty(0, np.bool_)
+
+    def to_gray(self, image: GrayImage | Image.Image | GrayArray) -> GrayArray:
+        """Copia a imagem para o buffer de trabalho, em tons de cinza."""
+        if isinstance(image, GrayImage):
+            pixels, width, height = image
+            source = np.frombuffer(pixels, np.uint8, width * height).reshape(
+                height, width
+            )
+        elif isinstance(image, Image.Image):
+            if image.mode not in {"L", "RGB", "RGBA"}:
+                image = image.convert("RGB")
+            source = np.asarray(image)
+        else:
+            source = image
+        height, width = source.shape[:2]
+        gray = _view(self._grow("_work", height * width), height, width)
+        if source.ndim == 2:
+            np.copyto(gray, source)
+            return gray
+
+        # Soma ponderada dos canais em 16 bits, sem arrays temporários
+        wide = _view(self._grow("_wide", height * width), height, width)
+        channel = _view(self._grow("_channel", height * width), height, width)
+        np.multiply(source[..., 0], _PESO_R, out=wide, dtype=np.uint16)
+        for index, weight in ((1, _PESO_G), (2, _PESO_B)):
+            np.multiply(source[..., index], weight, out=channel, dtype=np.uint16)
+            wide += channel
+        np.right_shift(wide, 8, out=wide)
+        np.copyto(gray, wide, casting="unsafe")
+        return gray
+
+    def candidate_boxes(self, gray: GrayArray) -> list[Box]:
+        """
+        Regiões que parecem códigos de barras lineares, da mais para a menos
+        provável, localizadas numa amostra de 1 a cada ``step`` pixels (até
+        ``PREPROCESS_BOX_STEP``, menor em imagens pequenas).
+
+        As barras geram bordas fortes numa só direção (texto e fotos geram
+        nas duas). A amostra é dividida em blocos de ``LOCATE_TILE`` pixels;
+        os blocos com bem mais bordas na direção das barras que na outra são
+        unidos ao longo do código e agrupados em regiões, em qualquer das
+        duas orientações, descartando as com muitas falhas ou sem uma direção
+        dominante.
+        """
+        height, width = gray.shape
+        # Imagens pequenas são amostradas com passo menor (barras mais finas)
+        step = min(
+            max(max(height, width) // LOCATE_SAMPLE_SIDE, 1), PREPROCESS_BOX_STEP
+        )
+        tile = LOCATE_TILE
+        sample = gray[::step, ::step]
+        rows, columns = sample.shape[0] - 1, sample.shape[1] - 1
+        if rows < tile or columns < tile:
+            return []
+
+        # Bordas verticais e horizontais fortes em cada pixel da amostra
+        edges = _view(self._grow("_edges", rows * columns), rows, columns)
+        vertical = _view(self._grow("_vertical", rows * columns), rows, columns)
+        horizontal = _view(self._grow("_horizontal", rows * columns), rows, columns)
+        np.subtract(sample[:-1, 1:], sample[:-1, :-1], out=edges, dtype=np.int16)
+        np.abs(edges, out=edges)
+        np.greater_equal(edges, PREPROCESS_EDGE_MIN, out=vertical)
+        np.subtract(sample[1:, :-1], sample[:-1, :-1], out=edges, dtype=np.int16)
+        np.abs(edges, out=edges)
+        np.greater_equal(edges, PREPROCESS_EDGE_MIN, out=horizontal)
+
+        # Bordas só verticais (barras em pé) e só horizontais (deitadas)
+        only = _view(self._grow("_mask", rows * columns), rows, columns)
+        np.greater(vertical, horizontal, out=only)
+        only_vertical = _tile_sums(only, tile)
+        np.greater(horizontal, vertical, out=only)
+        only_horizontal = _tile_sums(only, tile)
+
+        scored: list[tuple[int, Box]] = []
+        for scores, other, axis in (
+            (only_vertical, only_horizontal, 1),
+            (only_horizontal, only_vertical, 0),
+        ):
+            active = scores - other >= LOCATE_TILE_DENSITY * tile * tile
+            # Fecha as falhas de um bloco entre grupos de barras
+            closed = active.copy()
+            if axis == 1:
+                closed[:, 1:] |= active[:, :-1]
+                closed[:, :-1] |= active[:, 1:]
+            else:
+                closed[1:] |= active[:-1]
+                closed[:-1] |= active[1:]
+            for top, bottom, left, right in _regions(closed):
+                size_across = (right - left) if axis == 1 else (bottom - top)
+                size_along = (bottom - top) if axis == 1 else (right - left)
+                # Códigos lineares são mais compridos que altos
+                if size_across < LOCATE_MIN_TILES or size_across < size_along:
+                    continue
+                # As barras preenchem a região; texto deixa muitas falhas
+                filled = int(active[top:bottom, left:right].sum())
+                if filled < LOCATE_FILL * size_across * size_along:
+                    continue
+                score = int(scores[top:bottom, left:right].sum())
+                # Texto também tem bordas só verticais, mas quase tantas
+                # quanto só horizontais; nas barras uma direção domina
+                if score < LOCATE_DOMINANCE * int(other[top:bottom, left:right].sum()):
+                    continue
+                scored.append(
+                    (score, _to_image((top, bottom, left, right), step, height, width))
+                )
+
+        scored.sort(key=lambda item: item[0], reverse=True)
+        return [box for _, box in scored]
+
+    def crop(self, gray: GrayArray, box: Box) -> GrayArray:
+        """Copia o recorte para o buffer de saída, com as linhas contíguas."""
+        top, bottom, left, right = box
+        height, width = bottom - top, right - left
+        out = _view(self._grow("_out", height * width), height, width)
+        np.copyto(out, gray[top:bottom, left:right])
+        return out
+
+    @staticmethod
+    def stretch_contrast(gray: GrayArray) -> None:
+        """Estica os níveis de cinza para ocupar de 0 a 255 (no lugar)."""
+        low, high = int(gray.min()), int(gray.max())
+        if high - low in {0, 255}:
+            return
+        levels = np.arange(256, dtype=np.int32)
+        table = np.clip((levels - low) * 255 // (high - low), 0, 255).astype(np.uint8)
+        np.take(table, gray, out=gray)
+
+    def _grow(self, name: str, size: int) -> NDArray[np.generic]:
+        # Reaproveita o buffer; só aloca um maior quando a imagem não cabe
+        buffer: NDArray[np.generic] = getattr(self, name)
+        if buffer.size < size:
+            buffer = np.empty(size, buffer.dtype)
+            setattr(self, name, buffer)
+        return buffer[:size]
+
+
+def _view(buffer: NDArray[np.generic], height: int, width: int) -> NDArray:
+    return buffer[: height * width].reshape(height, width)
+
+
+def _tile_sums(mask: NDArray[np.bool_], tile: int) -> NDArray[np.int32]:
+    # Quantidade de pixels marcados em cada bloco inteiro de ``tile`` x ``tile``
+    rows, columns = mask.shape[0] // tile, mask.shape[1] // tile
+    blocks = mask[: rows * tile, : columns * tile].reshape(rows, tile, columns, tile)
+    return blocks.sum(axis=(1, 3), dtype=np.int32)
+
+
+def _regions(active: NDArray[np.bool_]) -> Iterator[Box]:
+    # Retângulo envolvente de cada grupo de blocos vizinhos (4-conectados)
+    rows, columns = active.shape
+    seen = np.zeros_like(active)
+    for start_row, start_column in np.argwhere(active).tolist():
+        if seen[start_row, start_column]:
+            continue
+        seen[start_row, start_column] = True
+        stack = [(start_row, start_column)]
+        top, bottom, left, right = start_row, start_row, start_column, start_column
+        while stack:
+            row, column = stack.pop()
+            top, bottom = min(top, row), max(bottom, row)
+            left, right = min(left, column), max(right, column)
+            for r, c in (
+                (row - 1, column),
+                (row + 1, column),
+                (row, column - 1),
+                (row, column + 1),
+            ):
+                if (
+                    0 <= r < rows
+                    and 0 <= c < columns
+                    and active[r, c]
+                    and not seen[r, c]
+                ):
+                    seen[r, c] = True
+                    stack.append((r, c))
+        yield top, bottom + 1, left, right + 1
+
+
+def _to_image(tiles: Box, step: int, height: int, width: int) -> Box:
+    # Blocos da amostra -> pixels da imagem, com a folga da zona de silêncio
+    top, bottom, left, right = (value * LOCATE_TILE * step for value in tiles)
+    margin = PREPROCESS_BOX_MARGIN
+    return (
+        max(top - margin, 0),
+        min(bottom + margin, height),
+        max(left - margin, 0),
+        min(right + margin, width),
+    )
+
+
+_preprocessors = local()
+
+
+def get_preprocessor() -> Preprocessor:
+    """Pré-processador da thread atual, com os buffers dela."""
+    preprocessor: Preprocessor | None = getattr(_preprocessors, "instance", None)
+    if preprocessor is None:
+        preprocessor = _preprocessors.instance = Preprocessor()
+    return preprocessor
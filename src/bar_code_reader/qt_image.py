@@ -0,0 +1,65 @@
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QImage, QPainter, QPixmap
+
+from bar_code_reader.constants import DHASH_SIZE
+from bar_code_reader.decode_types import GrayImage
+
+
+def qimage_to_gray(image: QImage | QPixmap) -> GrayImage:
+    """
+    Converte uma imagem do Qt direto para um ``GrayImage`` em memória,
+    sem codificar PNG nem passar pelo disco.
+    """
+    if isinstance(image, QPixmap):
+        image = image.toImage()
+    if image.hasAlphaChannel():
+        image = _flatten_alpha(image)
+
+    gray = image.convertToFormat(QImage.Format.Format_Grayscale8)
+    width = gray.width()
+    height = gray.height()
+    stride = gray.bytesPerLine()
+    bits = gray.constBits()
+
+    if stride == width:
+        return GrayImage(bytes(bits), width, height)
+    # O Qt alinha cada linha em 4 bytes; o zbar espera as linhas contíguas
+    pixels = b"".join(
+        bits[row * stride : row * stride + width] for row in range(height)
+    )
+    return GrayImage(pixels, width, height)
+
+
+def difference_hash(image: QImage | QPixmap) -> int:
+    """
+    Hash perceptual (dHash) de 64 bits: reduz a imagem para 9x8 em tons de
+    cinza e marca, em cada linha, se cada pixel é mais claro que o vizinho.
+    Quadros quase iguais geram hashes com poucos bits diferentes.
+    """
+    if isinstance(image, QPixmap):
+        image = image.toImage()
+    small = image.scaled(
+        DHASH_SIZE + 1,
+        DHASH_SIZE,
+        Qt.AspectRatioMode.IgnoreAspectRatio,
+        Qt.TransformationMode.SmoothTransformation,
+    ).convertToFormat(QImage.Format.Format_Grayscale8)
+    stride = small.bytesPerLine()
+    bits = small.constBits()
+
+    value = 0
+    for row in range(DHASH_SIZE):
+        line = bits[row * stride : row * stride + DHASH_SIZE + 1]
+        for column in range(DHASH_SIZE):
+            value = (value << 1) | (line[column] > line[column + 1])
+    return value
+
+
+def _flatten_alpha(image: QImage) -> QImage:
+    # Pixels transparentes virariam preto na conversão; compõe sobre branco
+    flat = QImage(image.size(), QImage.Format.Format_RGB32)
+    flat.fill(Qt.GlobalColor.white)
+    painter = QPainter(flat)
+    painter.drawImage(0, 0, image)
+    painter.end()
+    return flat
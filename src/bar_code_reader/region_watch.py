@@ -0,0 +1,69 @@
+from time import perf_counter
+
+from PySide6.QtCore import QObject, QRect, QTimer, Signal
+from PySide6.QtGui import QScreen
+
+from bar_code_reader.constants import WATCH_HASH_TOLERANCE, WATCH_INTERVAL_MS
+from bar_code_reader.qt_image import difference_hash, qimage_to_gray
+from bar_code_reader.timing import scan_timer
+
+
+class RegionWatcher(QObject):
+    """
+    Recaptura periodicamente a última região selecionada e só entrega o
+    quadro para leitura quando ele mudou de verdade (pelo hash perceptual),
+    evitando decodificar o mesmo boleto a cada intervalo.
+    """
+
+    # GrayImage com o novo quadro e o instante (perf_counter) da captura
+    frameChanged = Signal(object, float)
+
+    def __init__(
+        self, parent: QObject | None = None, interval_ms: int = WATCH_INTERVAL_MS
+    ) -> None:
+        super().__init__(parent)
+        self._timer = QTimer(self)
+        self._timer.setInterval(interval_ms)
+        self._timer.timeout.connect(self._grab)
+        self._screen: QScreen | None = None
+        self._rect = QRect()
+        self._last_hash: int | None = None
+
+    def start(self, screen: QScreen, rect: QRect) -> None:
+        self._screen = screen
+        self._rect = QRect(rect)
+        self._last_hash = None
+        self._timer.start()
+
+    def stop(self) -> None:
+        self._timer.stop()
+
+    def isActive(self) -> bool:
+        return self._timer.isActive()
+
+    def _grab(self) -> None:
+        if self._screen is None or self._rect.isNull():
+            return
+        captured_at = perf_counter()
+        scan_timer.begin(captured_at)
+        with scan_timer.span(captured_at, "grab_window"):
+            image = self._screen.grabWindow(
+                0,
+                self._rect.x(),
+                self._rect.y(),
+                self._rect.width(),
+                self._rect.height(),
+            ).toImage()
+
+        with scan_timer.span(captured_at, "dhash"):
+            frame_hash = difference_hash(image)
+        if (
+            self._last_hash is not None
+            and (frame_hash ^ self._last_hash).bit_count() <= WATCH_HASH_TOLERANCE
+        ):
+            scan_timer.discard(captured_at)
+            return  # Mesmo conteúdo do quadro anterior
+        self._last_hash = frame_hash
+        with scan_timer.span(captured_at, "to_gray"):
+            gray = qimage_to_gray(image)
+        self.frameChanged.emit(gray, captured_at)
@@ -0,0 +1,456 @@
+"""
+Serviço HTTP local de leitura de boletos, para outros programas da mesma
+máquina (não importa o PySide6).
+
+Rotas (respostas em JSON, com os mesmos campos da linha de comando):
+    POST /decode?profile=boleto   corpo: a imagem (PNG, JPEG, ...)
+    POST /convert                 corpo: códigos ou linhas digitáveis, um por linha
+    GET  /metrics                 histogramas de latência de cada rota
+    GET  /health
+
+As imagens são lidas num conjunto de processos já aquecidos (Pillow e zbar
+carregados na partida). A fila de leituras é limitada: cheia, o serviço
+responde 503 na hora em vez de deixar as requisições acumulando espera.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import suppress
+from http import HTTPStatus
+from io import BytesIO
+from time import perf_counter
+from typing import Any, NamedTuple
+from urllib.parse import parse_qs, urlsplit
+
+from bar_code_reader.cli import convert_input, describe_code
+from bar_code_reader.constants import (
+    SERVER_HOST,
+    SERVER_LATENCY_BUCKETS_MS,
+    SERVER_MAX_BODY_BYTES,
+    SERVER_PENDING_PER_WORKER,
+    SERVER_PORT,
+)
+from bar_code_reader.decode_types import DecodeProfile
+
+_PERCENTILES = (0.5, 0.9, 0.99)
+
+
+type Headers = tuple[tuple[str, str], ...]
+
+
+class Response(NamedTuple):
+    status: HTTPStatus
+    body: bytes
+    headers: Headers = ()
+
+
+def json_response(status: HTTPStatus, data: object, headers: Headers = ()) -> Response:
+    body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+    return Response(status, body, (("Content-Type", "application/json"), *headers))
+
+
+def error_response(status: HTTPStatus, message: str, headers: Headers = ()) -> Response:
+    return json_response(status, {"error": message}, headers)
+
+
+class LatencyHistogram:
+    """Contagem de requisições por faixa de latência (limites em ms)."""
+
+    def __init__(
+        self, bounds_ms: tuple[float, ...] = SERVER_LATENCY_BUCKETS_MS
+    ) -> None:
+        self.bounds_ms = bounds_ms
+        # Uma faixa a mais para o que passar do último limite
+        self.counts = [0] * (len(bounds_ms) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+
+    def observe(self, seconds: float) -> None:
+        elapsed_ms = seconds * 1000
+        self.counts[bisect_left(self.bounds_ms, elapsed_ms)] += 1
+        self.count += 1
+        self.total_ms += elapsed_ms
+
+    def percentile(self, fraction: float) -> float | None:
+        """Limite superior da faixa do percentil; None se passar do último."""
+        if not self.count:
+            return None
+        target = fraction * self.count
+        seen = 0
+        for bound, count in zip(self.bounds_ms, self.counts, strict=False):
+            seen += count
+            if seen >= target:
+                return bound
+        return None
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum_ms": round(self.total_ms, 3),
+            "buckets_ms": {
+                **{
+                    str(bound): count
+                    for bound, count in zip(self.bounds_ms, self.counts, strict=False)
+                },
+                "+Inf": self.counts[-1],
+            },
+            **{
+                f"p{fraction * 100:g}_ms": self.percentile(fraction)
+                for fraction in _PERCENTILES
+            },
+        }
+
+
+class ServiceBusy(Exception):  # noqa: N818
+    """A fila de leituras está cheia."""
+
+
+def _warm_worker() -> None:
+    # Executa em cada processo filho ao nascer: carrega Pillow, zbar e os
+    # leitores, para que a primeira requisição não pague a importação
+    from bar_code_reader.decode_bar import DecodeBar  # noqa: F401
+    from bar_code_reader.zbar_decoder import get_decoder
+
+    for profile in DecodeProfile:
+        get_decoder(profile)
+
+
+def _ping() -> None:
+    # Tarefa vazia usada para subir todos os processos na partida
+    return
+
+
+def _decode_upload(data: bytes, profile: DecodeProfile) -> tuple[list[str], str | None]:
+    # Executa no processo filho; erros de uma imagem voltam como texto
+    from PIL import Image
+
+    from bar_code_reader.decode_bar import DecodeBar, sorted_codes
+
+    try:
+        with Image.open(BytesIO(data)) as image:
+            image.load()
+            return sorted_codes(DecodeBar(image, profile=profile).decoded_bar()), None
+    except Exception as e:  # noqa: BLE001
+        return [], f"{type(e).__name__}: {e}"
+
+
+class DecodeService:
+    def __init__(
+        self, workers: int | None = None, queue_size: int | None = None
+    ) -> None:
+        """
+        ``workers`` processos leem as imagens; até ``queue_size`` leituras
+        esperam por um deles (padrão: ``SERVER_PENDING_PER_WORKER`` por
+        processo). As rotas podem ser chamadas direto por ``handle``, sem
+        abrir nenhuma porta.
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.queue_size = queue_size or self.workers * SERVER_PENDING_PER_WORKER
+        self.histograms: dict[str, LatencyHistogram] = {}
+        self._queue: asyncio.Queue[
+            tuple[bytes, DecodeProfile, asyncio.Future[tuple[list[str], str | None]]]
+        ] = asyncio.Queue(self.queue_size)
+        self._executor: ProcessPoolExecutor | None = None
+        self._dispatchers: list[asyncio.Task[None]] = []
+
+    async def start(self) -> None:
+        """Sobe e aquece todos os processos antes de aceitar requisições."""
+        self._executor = self._new_executor()
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(
+            *(loop.run_in_executor(self._executor, _ping) for _ in range(self.workers))
+        )
+        # Um despachante por processo: nunca há mais leituras no executor do
+        # que processos, e o resto espera na fila limitada
+        self._dispatchers = [
+            asyncio.create_task(self._dispatch()) for _ in range(self.workers)
+        ]
+
+    async def close(self) -> None:
+        for task in self._dispatchers:
+            task.cancel()
+        await asyncio.gather(*self._dispatchers, return_exceptions=True)
+        self._dispatchers.clear()
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(self.workers, initializer=_warm_worker)
+
+    async def _dispatch(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            data, profile, future = await self._queue.get()
+            executor = self._executor
+            try:
+                if future.cancelled():
+                    continue  # O cliente desistiu enquanto esperava
+                result = await loop.run_in_executor(
+                    executor, _decode_upload, data, profile
+                )
+                if not future.cancelled():
+                    future.set_result(result)
+            except Exception as e:  # noqa: BLE001
+                # Um processo morreu (ex.: falha no zbar): o conjunto inteiro
+                # fica inutilizável e é recriado uma vez, pelo primeiro
+                # despachante que perceber
+                if isinstance(e, BrokenProcessPool) and executor is self._executor:
+                    self._executor = self._new_executor()
+                    if executor is not None:
+                        executor.shutdown(wait=False, cancel_futures=True)
+                if not future.done():
+                    future.set_exception(e)
+            finally:
+                self._queue.task_done()
+
+    async def decode_image(
+        self, data: bytes, profile: DecodeProfile
+    ) -> tuple[list[str], str | None]:
+        """Códigos lidos da imagem; ``ServiceBusy`` se a fila estiver cheia."""
+        future: asyncio.Future[tuple[list[str], str | None]] = (
+            asyncio.get_running_loop().create_future()
+        )
+        try:
+            self._queue.put_nowait((data, profile, future))
+        except asyncio.QueueFull:
+            raise ServiceBusy from None
+        return await future
+
+    async def handle(self, method: str, target: str, body: bytes) -> Response:
+        """Atende uma requisição e registra a latência da rota."""
+        start = perf_counter()
+        url = urlsplit(target)
+        route = {
+            "/decode": ("POST", self._decode),
+            "/convert": ("POST", self._convert),
+            "/metrics": ("GET", self._metrics),
+            "/health": ("GET", self._health),
+        }.get(url.path)
+        if route is None:
+            return error_response(HTTPStatus.NOT_FOUND, "Rota não encontrada")
+        expected_method, handler = route
+        if method != expected_method:
+            return error_response(
+                HTTPStatus.METHOD_NOT_ALLOWED,
+                f"Use {expected_method}",
+                (("Allow", expected_method),),
+            )
+        if len(body) > SERVER_MAX_BODY_BYTES:
+            return error_response(
+                HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Corpo grande demais"
+            )
+        try:
+            response = await handler(parse_qs(url.query), body)
+        except Exception as e:  # noqa: BLE001
+            response = error_response(
+                HTTPStatus.INTERNAL_SERVER_ERROR, f"{type(e).__name__}: {e}"
+            )
+        key = f"{method} {url.path}"
+        if key not in self.histograms:
+            self.histograms[key] = LatencyHistogram()
+        self.histograms[key].observe(perf_counter() - start)
+        return response
+
+    async def _decode(self, query: dict[str, list[str]], body: bytes) -> Response:
+        try:
+            profile = DecodeProfile(query.get("profile", ["boleto"])[0])
+        except ValueError:
+            choices = ", ".join(DecodeProfile)
+            return error_response(
+                HTTPStatus.BAD_REQUEST, f"Perfil inválido (use {choices})"
+            )
+        if not body:
+            return error_response(HTTPStatus.BAD_REQUEST, "Envie a imagem no corpo")
+        try:
+            codes, error = await self.decode_image(body, profile)
+        except ServiceBusy:
+            return error_response(
+                HTTPStatus.SERVICE_UNAVAILABLE,
+                "Fila de leitura cheia",
+                (("Retry-After", "1"),),
+            )
+        if error is not None:
+            return error_response(HTTPStatus.UNPROCESSABLE_ENTITY, error)
+        return json_response(
+            HTTPStatus.OK, {"codes": [describe_code(code) for code in codes]}
+        )
+
+    async def _convert(self, query: dict[str, list[str]], body: bytes) -> Response:
+        try:
+            text = body.decode("utf-8")
+        except UnicodeDecodeError:
+            return error_response(HTTPStatus.BAD_REQUEST, "Corpo deve estar em UTF-8")
+        records = []
+        for value in (line.strip() for line in text.splitlines()):
+            if not value:
+                continue
+            record = convert_input(value)
+            if record is None:
+                record = {
+                    "input": value,
+                    "barcode": None,
+                    "error": "Não é um código de barras nem uma linha digitável",
+                }
+            records.append(record)
+        return json_response(HTTPStatus.OK, {"codes": records})
+
+    async def _metrics(self, query: dict[str, list[str]], body: bytes) -> Response:
+        return json_response(
+            HTTPStatus.OK,
+            {
+                "workers": self.workers,
+                "queue": {"size": self._queue.qsize(), "max": self.queue_size},
+                "routes": {
+                    key: histogram.as_dict()
+                    for key, histogram in self.histograms.items()
+                },
+            },
+        )
+
+    async def _health(self, query: dict[str, list[str]], body: bytes) -> Response:
+        return json_response(HTTPStatus.OK, {"status": "ok"})
+
+    async def serve(
+        self, host: str = SERVER_HOST, port: int = SERVER_PORT
+    ) -> asyncio.Server:
+        """Abre a porta (use 0 para uma livre) e devolve o ``asyncio.Server``."""
+        return await asyncio.start_server(self._serve_connection, host, port)
+
+    async def _serve_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        # HTTP/1.1 mínimo: corpo por Content-Length e conexões mantidas abertas
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                if not request_line.strip():
+                    continue  # Linha em branco antes da requisição é tolerada
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                    headers = await _read_headers(reader)
+                    length = int(headers.get("content-length", "0"))
+                except ValueError:
+                    await _write_response(
+                        writer,
+                        error_response(HTTPStatus.BAD_REQUEST, "Requisição inválida"),
+                        keep_alive=False,
+                    )
+                    break
+                if "transfer-encoding" in headers:
+                    response = error_response(
+                        HTTPStatus.LENGTH_REQUIRED, "Informe o Content-Length"
+                    )
+                    await _write_response(writer, response, keep_alive=False)
+                    break
+                if length < 0:
+                    response = error_response(
+                        HTTPStatus.BAD_REQUEST, "Content-Length inválido"
+                    )
+                    await _write_response(writer, response, keep_alive=False)
+                    break
+                if length > SERVER_MAX_BODY_BYTES:
+                    response = error_response(
+                        HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Corpo grande demais"
+                    )
+                    await _write_response(writer, response, keep_alive=False)
+                    break
+                body = await reader.readexactly(length)
+                keep_alive = (
+                    version == "HTTP/1.1"
+                    and headers.get("connection", "").lower() != "close"
+                )
+                response = await self.handle(method, target, body)
+                await _write_response(writer, response, keep_alive=keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass  # Cliente fechou a conexão no meio da requisição
+        finally:
+            writer.close()
+
+
+async def _read_headers(reader: asyncio.StreamReader) -> dict[str, str]:
+    headers: dict[str, str] = {}
+    while True:
+        line = await reader.readline()
+        if line in {b"\r\n", b"\n", b""}:
+            return headers
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+
+async def _write_response(
+    writer: asyncio.StreamWriter, response: Response, *, keep_alive: bool
+) -> None:
+    head = [
+        f"HTTP/1.1 {response.status.value} {response.status.phrase}",
+        f"Content-Length: {len(response.body)}",
+        f"Connection: {'keep-alive' if keep_alive else 'close'}",
+        *(f"{name}: {value}" for name, value in response.headers),
+    ]
+    writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + response.body)
+    await writer.drain()
+
+
+def criar_parser_argumentos() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="bar-code-reader-server",
+        description="Serviço HTTP local de leitura de boletos (JSON)",
+    )
+    parser.add_argument(
+        "--host", default=SERVER_HOST, help=f"Endereço (padrão: {SERVER_HOST})"
+    )
+    parser.add_argument(
+        "--port", type=int, default=SERVER_PORT, help=f"Porta (padrão: {SERVER_PORT})"
+    )
+    parser.add_argument(
+        "--workers",
+        "-w",
+        type=int,
+        default=None,
+        help="Processos de leitura (padrão: número de núcleos)",
+    )
+    parser.add_argument(
+        "--queue",
+        type=int,
+        default=None,
+        help=(
+            "Leituras aguardando um processo antes de responder 503"
+            f" (padrão: {SERVER_PENDING_PER_WORKER} por processo)"
+        ),
+    )
+    return parser
+
+
+async def _run(args: argparse.Namespace) -> None:
+    service = DecodeService(args.workers, args.queue)
+    await service.start()
+    try:
+        server = await service.serve(args.host, args.port)
+        for sock in server.sockets:
+            host, port = sock.getsockname()[:2]
+            print(f"Atendendo em http://{host}:{port}", file=sys.stderr, flush=True)
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.close()
+
+
+def main() -> int:
+    args = criar_parser_argumentos().parse_args()
+    with suppress(KeyboardInterrupt):
+        asyncio.run(_run(args))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
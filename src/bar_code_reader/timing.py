@@ -0,0 +1,128 @@
+"""
+Medição do tempo gasto em cada etapa de uma leitura (captura, conversão
+para tons de cinza, espera na fila, decodificação, conversão da guia).
+
+Cada leitura é identificada pelo instante da captura (``perf_counter``),
+que já acompanha a imagem em todos os sinais. As leituras concluídas ficam
+num buffer circular com as mais recentes e são repassadas aos ganchos
+registrados (ex.: envio para um sistema de métricas).
+
+Desligada (o padrão), cada etapa custa só a verificação de um booleano.
+"""
+
+import json
+from collections import deque
+from collections.abc import Callable, Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from dataclasses import dataclass, field
+from pathlib import Path
+from threading import Lock
+from time import perf_counter, time
+from typing import Any, NamedTuple
+
+from bar_code_reader.constants import TIMING_HISTORY
+
+
+class Span(NamedTuple):
+    name: str
+    seconds: float
+
+
+@dataclass(slots=True)
+class ScanTiming:
+    key: float  # Instante da captura (perf_counter)
+    started_at: float  # Instante da captura no relógio de parede
+    spans: list[Span] = field(default_factory=list)
+    total: float = 0.0  # Da captura até o resultado na tela, em segundos
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "started_at": self.started_at,
+            "total_ms": round(self.total * 1000, 3),
+            "spans": {span.name: round(span.seconds * 1000, 3) for span in self.spans},
+        }
+
+
+type TimingHook = Callable[[ScanTiming], None]
+
+_NULL_SPAN = nullcontext()
+
+
+class ScanTimer:
+    def __init__(self, history: int = TIMING_HISTORY) -> None:
+        self.enabled = False
+        self._recent: deque[ScanTiming] = deque(maxlen=history)
+        self._open: dict[float, ScanTiming] = {}
+        self._hooks: list[TimingHook] = []
+        self._lock = Lock()
+
+    def begin(self, key: float) -> None:
+        """Abre a medição da leitura capturada no instante ``key``."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._open[key] = ScanTiming(key, time() - (perf_counter() - key))
+            # Leituras que nunca terminaram (ex.: descartadas) não acumulam
+            while len(self._open) > (self._recent.maxlen or TIMING_HISTORY):
+                del self._open[next(iter(self._open))]
+
+    def span(self, key: float, name: str) -> AbstractContextManager[object]:
+        """Mede o bloco ``with`` como a etapa ``name`` da leitura ``key``."""
+        if not self.enabled or key not in self._open:
+            return _NULL_SPAN
+        return self._measure(key, name)
+
+    @contextmanager
+    def _measure(self, key: float, name: str) -> Iterator[None]:
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.add(key, name, perf_counter() - start)
+
+    def add(self, key: float, name: str, seconds: float) -> None:
+        """Registra uma etapa já medida (ex.: tempo de espera na fila)."""
+        scan = self._open.get(key)
+        if scan is not None:
+            scan.spans.append(Span(name, seconds))
+
+    def discard(self, key: float) -> None:
+        with self._lock:
+            self._open.pop(key, None)
+
+    def finish(self, key: float) -> ScanTiming | None:
+        """Fecha a leitura, guarda no histórico e chama os ganchos."""
+        if not self.enabled:
+            return None
+        with self._lock:
+            scan = self._open.pop(key, None)
+            if scan is None:
+                return None
+            scan.total = perf_counter() - key
+            self._recent.append(scan)
+            hooks = list(self._hooks)
+        for hook in hooks:
+            hook(scan)
+        return scan
+
+    def add_hook(self, hook: TimingHook) -> None:
+        with self._lock:
+            self._hooks.append(hook)
+
+    def remove_hook(self, hook: TimingHook) -> None:
+        with self._lock:
+            self._hooks.remove(hook)
+
+    def recent(self) -> list[ScanTiming]:
+        with self._lock:
+            return list(self._recent)
+
+    def dump_json(self, path: str | Path | None = None) -> str:
+        """Histórico recente em JSON; grava em ``path`` se informado."""
+        data = json.dumps([scan.as_dict() for scan in self.recent()], indent=2)
+        if path is not None:
+            Path(path).write_text(data, encoding="utf-8")
+        return data
+
+
+scan_timer = ScanTimer()
@@ -0,0 +1,230 @@
+"""
+Versões vetorizadas (NumPy) dos cálculos sobre códigos de barras, para
+processar colunas inteiras de códigos de 44 dígitos de uma só vez.
+
+Os códigos são representados como uma matriz ``(n, 44)`` de ``uint8`` com o
+valor de cada dígito, criada por ``digit_matrix``.
+"""
+
+from collections.abc import Iterable
+
+import numpy as np
+from numpy.typing import NDArray
+
+from bar_code_reader.constants import (
+    CODIGO_ARRECADAO,
+    DATA_BASE_VENCIMENTO,
+    DATA_BASE_VENCIMENTO_2025,
+    FATOR_VENCIMENTO_LIMITE_2025,
+    FATOR_VENCIMENTO_MINIMO_2025,
+    MODULO10_QUANTIDADE_MOEDA,
+    MODULO10_VALOR_EFETIVO,
+    MODULO11_QUANTIDADE_MOEDA,
+    MODULO11_VALOR_EFETIVO,
+    TAMANHO_CODIGO_BARRAS,
+)
+
+type DigitMatrix = NDArray[np.uint8]
+
+# Soma dos algarismos de d * 2, indexada pelo dígito d
+_DOBRO = np.array([sum(divmod(d * 2, 10)) for d in range(10)], dtype=np.uint8)
+
+_DTYPE = np.dtype(f"S{TAMANHO_CODIGO_BARRAS}")
+_DTYPE_LARGO = np.dtype(f"S{TAMANHO_CODIGO_BARRAS + 1}")
+
+# Posição do dígito verificador geral em cada tipo de código
+_DV_ARRECADACAO = 3
+_DV_BANCARIO = 4
+
+# Datas base do fator de vencimento, convertidas uma única vez
+_BASE_VENCIMENTO = np.datetime64(DATA_BASE_VENCIMENTO, "D")
+_BASE_VENCIMENTO_2025 = np.datetime64(DATA_BASE_VENCIMENTO_2025, "D")
+
+
+def digit_matrix(codes: Iterable[str | bytes] | NDArray[np.generic]) -> DigitMatrix:
+    """
+    Converte uma coleção de códigos de 44 dígitos na matriz ``(n, 44)`` de
+    valores. Posições com caracteres não numéricos (ou códigos mais curtos)
+    ficam com valores maiores que 9; ``is_numeric`` identifica essas linhas.
+    Códigos mais longos (ex.: uma linha digitável) também, em vez de serem
+    cortados nos 44 primeiros caracteres.
+    """
+    if isinstance(codes, np.ndarray) and codes.dtype == _DTYPE:
+        # Fatias com passo (ex.: codes[::2]) não podem ser vistas como bytes
+        codes = np.ascontiguousarray(codes)
+        ascii_matrix = codes.view(np.uint8).reshape(-1, TAMANHO_CODIGO_BARRAS)
+        return ascii_matrix - np.uint8(ord("0"))
+
+    # Um byte a mais que o código: o que passar de 44 caracteres fica visível
+    if isinstance(codes, np.ndarray):
+        wide = codes.astype(_DTYPE_LARGO)
+    else:
+        wide = np.fromiter(codes, dtype=_DTYPE_LARGO)
+    ascii_matrix = wide.view(np.uint8).reshape(-1, TAMANHO_CODIGO_BARRAS + 1)
+    digits = ascii_matrix[:, :TAMANHO_CODIGO_BARRAS] - np.uint8(ord("0"))
+    digits[ascii_matrix[:, TAMANHO_CODIGO_BARRAS] != 0] = np.iinfo(np.uint8).max
+    return digits
+
+
+def is_numeric(digits: DigitMatrix) -> NDArray[np.bool_]:
+    """Linhas formadas apenas por dígitos."""
+    return (digits <= 9).all(axis=1)
+
+
+def _pesos_modulo10(
+    colunas: int, ignorar: int | None = None
+) -> tuple[NDArray[np.int32], NDArray[np.int32]]:
+    # Máscaras das colunas de peso 2 e de peso 1, alternando da direita
+    posicoes = [c for c in range(colunas) if c != ignorar]
+    dobra = np.zeros(colunas, dtype=np.int32)
+    simples = np.zeros(colunas, dtype=np.int32)
+    dobra[posicoes[-1::-2]] = 1
+    simples[posicoes[-2::-2]] = 1
+    return dobra, simples
+
+
+def _pesos_modulo11(colunas: int, ignorar: int | None = None) -> NDArray[np.int32]:
+    # Pesos 2 a 9 repetidos da direita para a esquerda; 0 na coluna ignorada
+    posicoes = [c for c in range(colunas) if c != ignorar]
+    pesos = np.zeros(colunas, dtype=np.int32)
+    pesos[posicoes[::-1]] = [2 + i % 8 for i in range(len(posicoes))]
+    return pesos
+
+
+def _soma_modulo10(
+    digits: DigitMatrix, pesos: tuple[NDArray[np.int32], NDArray[np.int32]]
+) -> NDArray[np.int32]:
+    # Colunas de peso 2 usam a tabela de soma dos algarismos; as demais, o valor
+    dobra, simples = pesos
+    dobradas = _DOBRO[np.minimum(digits, 9)].astype(np.int32)
+    return dobradas @ dobra + digits.astype(np.int32) @ simples
+
+
+def modulo10_many(digits: DigitMatrix) -> NDArray[np.uint8]:
+    """Módulo 10 de cada linha da matriz (todas as colunas)."""
+    soma = _soma_modulo10(digits, _pesos_modulo10(digits.shape[1]))
+    return ((10 - soma % 10) % 10).astype(np.uint8)
+
+
+def _resto_modulo11_many(digits: DigitMatrix) -> NDArray[np.int32]:
+    return (digits.astype(np.int32) @ _pesos_modulo11(digits.shape[1])) % 11
+
+
+def modulo11_collection_many(digits: DigitMatrix) -> NDArray[np.uint8]:
+    """Módulo 11 das guias de arrecadação para cada linha da matriz."""
+    resto = _resto_modulo11_many(digits)
+    return np.where(resto <= 1, 0, 11 - resto).astype(np.uint8)
+
+
+def modulo11_transfer_many(digits: DigitMatrix) -> NDArray[np.uint8]:
+    """Módulo 11 do código de barras bancário para cada linha da matriz."""
+    resto = _resto_modulo11_many(digits)
+    return np.where((resto <= 1) | (resto == 10), 1, 11 - resto).astype(np.uint8)
+
+
+def check_digits_valid(digits: DigitMatrix) -> NDArray[np.bool_]:
+    """
+    Confere o dígito verificador geral de cada código de 44 dígitos.
+
+    Guias de arrecadação (iniciadas em 8) usam o DV da posição 4 e o módulo
+    indicado pelo código de moeda; boletos bancários usam o DV da posição 5
+    com módulo 11. Linhas não numéricas ou com código de moeda desconhecido
+    são consideradas inválidas.
+    """
+    valores = digits.astype(np.int32)
+    colunas = digits.shape[1]
+
+    # Boleto bancário: módulo 11 sobre os 43 dígitos sem o DV
+    pesos_bancario = _pesos_modulo11(colunas, ignorar=_DV_BANCARIO)
+    resto = (valores @ pesos_bancario) % 11
+    dv_bancario = np.where((resto <= 1) | (resto == 10), 1, 11 - resto)
+
+    # Arrecadação: módulo 10 ou 11 sobre os 43 dígitos sem o DV
+    soma10 = _soma_modulo10(digits, _pesos_modulo10(colunas, _DV_ARRECADACAO))
+    dv_modulo10 = (10 - soma10 % 10) % 10
+    resto = (valores @ _pesos_modulo11(colunas, ignorar=_DV_ARRECADACAO)) % 11
+    dv_modulo11 = np.where(resto <= 1, 0, 11 - resto)
+
+    moeda = digits[:, 2]
+    usa_modulo10 = (moeda == MODULO10_VALOR_EFETIVO) | (
+        moeda == MODULO10_QUANTIDADE_MOEDA
+    )
+    usa_modulo11 = (moeda == MODULO11_VALOR_EFETIVO) | (
+        moeda == MODULO11_QUANTIDADE_MOEDA
+    )
+    valido_arrecadacao = (
+        usa_modulo10 & (dv_modulo10 == digits[:, _DV_ARRECADACAO])
+    ) | (usa_modulo11 & (dv_modulo11 == digits[:, _DV_ARRECADACAO]))
+    valido_bancario = dv_bancario == digits[:, _DV_BANCARIO]
+
+    arrecadacao = digits[:, 0] == CODIGO_ARRECADAO
+    return is_numeric(digits) & np.where(
+        arrecadacao, valido_arrecadacao, valido_bancario
+    )
+
+
+def number_column(digits: DigitMatrix, start: int, stop: int) -> NDArray[np.int64]:
+    """Interpreta as colunas ``[start, stop)`` de cada linha como um inteiro."""
+    potencias = 10 ** np.arange(stop - start - 1, -1, -1, dtype=np.int64)
+    return digits[:, start:stop].astype(np.int64) @ potencias
+
+
+def is_collection(digits: DigitMatrix) -> NDArray[np.bool_]:
+    """Linhas que são guias de arrecadação (iniciadas em 8)."""
+    return digits[:, 0] == CODIGO_ARRECADAO
+
+
+def due_dates(digits: DigitMatrix) -> NDArray[np.datetime64]:
+    """
+    Vencimento de cada boleto bancário a partir do fator de vencimento
+    (posições 6 a 9), com a mesma regra de ``TransferGuide.vencimento``:
+    fatores entre 1000 e 5000 usam a data base do novo ciclo (29/05/2022).
+    Guias de arrecadação e boletos com fator zerado (sem vencimento) ficam
+    como ``NaT``.
+    """
+    fator = number_column(digits, 5, 9)
+    novo_ciclo = (fator >= FATOR_VENCIMENTO_MINIMO_2025) & (
+        fator < FATOR_VENCIMENTO_LIMITE_2025
+    )
+    base = np.where(novo_ciclo, _BASE_VENCIMENTO_2025, _BASE_VENCIMENTO)
+    vencimento = base + fator.astype("timedelta64[D]")
+    sem_vencimento = is_collection(digits) | (fator == 0)
+    return np.where(sem_vencimento, np.datetime64("NaT", "D"), vencimento)
+
+
+def amounts_cents(digits: DigitMatrix) -> NDArray[np.int64]:
+    """
+    Valor de cada código em centavos: posições 10 a 19 no boleto bancário e
+    5 a 15 na guia de arrecadação. Nas guias com código de moeda 7 ou 9 o
+    campo é uma quantidade de moeda, não um valor em reais.
+    """
+    return np.where(
+        is_collection(digits),
+        number_column(digits, 4, 15),
+        number_column(digits, 9, 19),
+    )
+
+
+def has_amount(digits: DigitMatrix) -> NDArray[np.bool_]:
+    """
+    Máscara dos códigos cujo campo valor é um valor em reais: todos os
+    boletos bancários e as guias de arrecadação com código de moeda 6 ou 8.
+    """
+    moeda = digits[:, 2]
+    valor_efetivo = (moeda == MODULO10_VALOR_EFETIVO) | (
+        moeda == MODULO11_VALOR_EFETIVO
+    )
+    return ~is_collection(digits) | valor_efetivo
+
+
+def due_dates_and_amounts(
+    codes: Iterable[str | bytes] | NDArray[np.generic],
+) -> tuple[NDArray[np.datetime64], NDArray[np.int64]]:
+    """
+    Vencimentos (``datetime64[D]``) e valores em centavos de uma coluna de
+    códigos de 44 dígitos, convertendo os dígitos uma única vez. Onde não há
+    valor em reais (ver ``has_amount``) o valor fica como -1.
+    """
+    digits = digit_matrix(codes)
+    cents = np.where(has_amount(digits), amounts_cents(digits), -1)
+    return due_dates(digits), cents
@@ -0,0 +1,130 @@
+"""
+Leitores do zbar configurados por perfil de simbologia.
+
+``pyzbar.decode`` cria e configura um scanner novo a cada chamada, com todas
+as simbologias ligadas. Aqui cada perfil tem o seu scanner, configurado uma
+única vez e reaproveitado nas leituras seguintes (um por thread, já que o
+scanner do zbar não pode ser usado por duas threads ao mesmo tempo).
+"""
+
+from ctypes import c_void_p, cast
+from threading import local
+
+from pyzbar.pyzbar import (
+    _FOURCC,
+    Decoded,
+    ZBarSymbol,
+    _decode_symbols,
+    _image,
+    _pixel_data,
+    _symbols_for_image,
+)
+from pyzbar.pyzbar_error import PyZbarError
+from pyzbar.wrapper import (
+    ZBarConfig,
+    zbar_image_scanner_create,
+    zbar_image_scanner_destroy,
+    zbar_image_scanner_set_config,
+    zbar_image_set_data,
+    zbar_image_set_format,
+    zbar_image_set_size,
+    zbar_scan_image,
+)
+
+from bar_code_reader.constants import TAMANHO_CODIGO_BARRAS
+from bar_code_reader.decode_types import DecodeProfile
+
+# Simbologias habilitadas em cada perfil; None mantém o padrão do zbar (todas)
+PROFILE_SYMBOLS: dict[DecodeProfile, tuple[ZBarSymbol, ...] | None] = {
+    DecodeProfile.BOLETO: (ZBarSymbol.I25,),
+    DecodeProfile.QRCODE: (ZBarSymbol.QRCODE,),
+    DecodeProfile.ALL: None,
+}
+
+
+class ZbarDecoder:
+    def __init__(self, profile: DecodeProfile = DecodeProfile.ALL) -> None:
+        self.profile = DecodeProfile(profile)
+        self._scanner = zbar_image_scanner_create()
+        if not self._scanner:
+            msg = "Could not create image scanner"
+            raise PyZbarError(msg)
+        self._configure(PROFILE_SYMBOLS[self.profile])
+
+    def _configure(self, symbols: tuple[ZBarSymbol, ...] | None) -> None:
+        if symbols is None:
+            return
+        for symbol in set(ZBarSymbol).difference(symbols):
+            zbar_image_scanner_set_config(
+                self._scanner, symbol, ZBarConfig.CFG_ENABLE, 0
+            )
+        for symbol in symbols:
+            zbar_image_scanner_set_config(
+                self._scanner, symbol, ZBarConfig.CFG_ENABLE, 1
+            )
+        if self.profile is DecodeProfile.BOLETO:
+            # Descarta no próprio zbar leituras parciais do código de 44 dígitos
+            for config in (ZBarConfig.CFG_MIN_LEN, ZBarConfig.CFG_MAX_LEN):
+                zbar_image_scanner_set_config(
+                    self._scanner, ZBarSymbol.I25, config, TAMANHO_CODIGO_BARRAS
+                )
+
+    def decode(self, image: object) -> list[Decoded]:
+        """
+        Mesma interface de ``pyzbar.decode``, reaproveitando o scanner.
+        Arrays ``uint8`` 2D contíguos (ex.: os do ``Preprocessor``) são lidos
+        direto da memória deles, sem a cópia que o pyzbar faria.
+        """
+        contiguous = _contiguous_gray(image)
+        if contiguous is not None:
+            address, width, height = contiguous
+            data, size = c_void_p(address), width * height
+        else:
+            pixels, width, height = _pixel_data(image)
+            data, size = cast(pixels, c_void_p), len(pixels)
+        with _image() as img:
+            zbar_image_set_format(img, _FOURCC["L800"])
+            zbar_image_set_size(img, width, height)
+            zbar_image_set_data(img, data, size, None)
+            if zbar_scan_image(self._scanner, img) < 0:
+                msg = "Unsupported image format"
+                raise PyZbarError(msg)
+            return list(_decode_symbols(_symbols_for_image(img)))
+
+    def __del__(self) -> None:
+        if getattr(self, "_scanner", None):
+            zbar_image_scanner_destroy(self._scanner)
+
+
+def _contiguous_gray(image: object) -> tuple[int, int, int] | None:
+    # Endereço, largura e altura dos pixels de um array uint8 2D com as
+    # linhas contíguas. Não importa o NumPy: basta o objeto expor a interface
+    # de arrays. Imagens do Pillow também a expõem, mas com os pixels
+    # copiados em ``bytes`` em vez de um endereço: essas seguem o caminho normal
+    interface = getattr(image, "__array_interface__", None)
+    if (
+        interface is None
+        or not isinstance(interface.get("data"), tuple)
+        or interface["typestr"] != "|u1"
+        or len(interface["shape"]) != 2
+        or interface.get("strides") is not None
+    ):
+        return None
+    height, width = interface["shape"]
+    return interface["data"][0], width, height
+
+
+_decoders = local()
+
+
+def get_decoder(profile: DecodeProfile = DecodeProfile.ALL) -> ZbarDecoder:
+    """Leitor do perfil para a thread atual, criado na primeira chamada."""
+    decoders: dict[DecodeProfile, ZbarDecoder] | None = getattr(
+        _decoders, "by_profile", None
+    )
+    if decoders is None:
+        decoders = _decoders.by_profile = {}
+    profile = DecodeProfile(profile)
+    if profile not in decoders:
+        decoders[profile] = ZbarDecoder(profile)
+    return decoders[profile]
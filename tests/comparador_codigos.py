@@ -1,40 +1,63 @@
 import argparse
+import atexit
+import csv
 import logging
+import logging.handlers
+import os
 import re
 import sys
+import time
+from collections import Counter, deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
 from datetime import datetime
+from itertools import islice
 from pathlib import Path
+from queue import SimpleQueue
+
+# Linhas lidas e processadas por vez no modo de comparação em massa
+TAMANHO_LOTE_PADRAO = 50_000
+# Lotes aguardando processamento por processo (limita a memória usada)
+LOTES_PENDENTES_POR_PROCESSO = 2
+# Registros acumulados antes de cada escrita no arquivo de log
+REGISTROS_POR_ESCRITA = 500
+
+# Padrões compilados uma vez (usados a cada registro e a cada código)
+_PADRAO_ANSI_EMOJIS = re.compile(
+    # Códigos ANSI
+    r"\033\[[0-9;]*m"
+    # Emojis (faixa unicode comum)
+    r"|[\U0001F600-\U0001F64F\U0001F300-\U0001F5FF\U0001F680-\U0001F6FF\U0001F1E0-\U0001F1FF]"
+    # Alguns emojis simples (ex: rocket, check, cross, etc), tabs e relógio
+    r"|[\u2705\u274C\u26A0\u26D4\u26F7\u26F9\u26FD\u2708\u2709\u270A-\u270D\u2728\u2733\u2734\u2744\u2753-\u2755\u2757\u2764\t\u23F0]"
+)
+_PADRAO_NAO_DIGITOS = re.compile(r"\D")
+_PADRAO_CPF = re.compile(r"\d{11}")
+_PADRAO_CNPJ = re.compile(r"\d{14}")
+_PADRAO_TELEFONE = re.compile(r"\d{10,13}")
+_PADRAO_EVP = re.compile(r"[a-fA-F0-9]{32}")
 
 
 # Função para limpar ANSI e emojis
 def limpar_ansi_emojis(texto: str) -> str:
-    # Remove códigos ANSI
-    texto = re.sub(r"\033\[[0-9;]*m", "", texto)
-    # Remove emojis (faixa unicode comum)
-    texto = re.sub(
-        r"[\U0001F600-\U0001F64F\U0001F300-\U0001F5FF\U0001F680-\U0001F6FF\U0001F1E0-\U0001F1FF]",
-        "",
-        texto,
-    )
-    # Remove alguns emojis simples (ex: rocket, check, cross, etc)
-    texto = re.sub(
-        r"[\u2705\u274C\u26A0\u26D4\u26F7\u26F9\u26FD\u2708\u2709\u270A-\u270D\u2728\u2733\u2734\u2744\u2753-\u2755\u2757\u2764]",
-        "",
-        texto,
-    )
-    # Remove tabs
-    texto = texto.replace("\t", "").replace("⏰", "")
-    return texto
+    # Remove códigos ANSI, emojis e tabs numa única passada
+    return _PADRAO_ANSI_EMOJIS.sub("", texto)
 
 
 # Formatter customizado para arquivo
 class FormatterSemAnsi(logging.Formatter):
     def format(self, record):
-        # Não altera o record global, só a mensagem formatada para o arquivo
-        msg_original = str(record.msg)
-        record_copy = logging.makeLogRecord(record.__dict__.copy())
-        record_copy.msg = limpar_ansi_emojis(msg_original)
-        return super().format(record_copy)
+        # Limpa só a linha formatada: data e nível não têm ANSI nem emojis,
+        # então não é preciso copiar o record (compartilhado com o console)
+        return limpar_ansi_emojis(super().format(record))
+
+
+# QueueHandler que não formata na thread de quem registra
+class QueueHandlerSemFormatar(logging.handlers.QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # A fila é do próprio processo: o record segue intacto e a
+        # formatação fica com a thread do QueueListener
+        return record
 
 
 # Códigos ANSI para cor/negrito/itálico
@@ -53,6 +76,10 @@ def configurar_logging() -> logging.Logger:
     Configura o sistema de logging para salvar em arquivo e exibir na tela.
     Cria apenas um arquivo por dia usando a data no nome.
 
+    Os registros vão para uma fila e são formatados e gravados por uma
+    thread em segundo plano; o arquivo é escrito em blocos de
+    ``REGISTROS_POR_ESCRITA`` registros (erros são gravados na hora).
+
     Returns:
         Logger configurado
     """
@@ -66,11 +93,20 @@ def configurar_logging() -> logging.Logger:
 
     # Configurar logger
     logger = logging.getLogger("comparador_codigos")
+    # O nível é conferido no próprio logger: registros abaixo dele nem
+    # chegam a ser criados, enfileirados ou formatados
     logger.setLevel(logging.INFO)
+    logger.propagate = False
 
     # Limpar handlers existentes (evitar duplicação)
+    for handler in logger.handlers:
+        if isinstance(handler, logging.handlers.QueueHandler) and handler.listener:
+            handler.listener.stop()
     logger.handlers.clear()
 
+    # Verificar se é a primeira execução do dia (antes de o arquivo ser aberto)
+    arquivo_existe = log_file.exists()
+
     # Formatter para arquivo (sem ANSI/emojis)
     file_formatter = FormatterSemAnsi(
         fmt="%(asctime)s | %(levelname)-8s | %(message)s", datefmt="%Y-%m-%d %H:%M:%S"
@@ -78,17 +114,29 @@ def configurar_logging() -> logging.Logger:
     file_handler = logging.FileHandler(log_file, mode="a", encoding="utf-8")
     file_handler.setLevel(logging.INFO)
     file_handler.setFormatter(file_formatter)
-    logger.addHandler(file_handler)
+    # Acumula os registros e grava em blocos
+    buffered_handler = logging.handlers.MemoryHandler(
+        REGISTROS_POR_ESCRITA, flushLevel=logging.ERROR, target=file_handler
+    )
+    buffered_handler.setLevel(logging.INFO)
 
     # Formatter para console (mantém cores/emojis)
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(logging.INFO)
     console_formatter = logging.Formatter("%(message)s")
     console_handler.setFormatter(console_formatter)
-    logger.addHandler(console_handler)
 
-    # Verificar se é a primeira execução do dia
-    arquivo_existe = log_file.exists()
+    # Escrita em segundo plano: quem registra só enfileira o record
+    fila: SimpleQueue[logging.LogRecord] = SimpleQueue()
+    queue_handler = QueueHandlerSemFormatar(fila)
+    queue_handler.listener = logging.handlers.QueueListener(
+        fila, buffered_handler, console_handler, respect_handler_level=True
+    )
+    queue_handler.listener.start()
+    logger.addHandler(queue_handler)
+    # Esvazia a fila ao sair; o logging.shutdown depois grava o buffer
+    atexit.register(queue_handler.listener.stop)
+
     timestamp_atual = datetime.now().strftime("%H:%M:%S")
 
     if not arquivo_existe:
@@ -121,7 +169,7 @@ def extrair_somente_digitos_numericos(texto_com_formatacao: str) -> str:
         >>> extrair_somente_digitos_numericos("123-45.67 89")
         "12345678"
     """
-    return re.sub(r"\D", "", texto_com_formatacao)
+    return _PADRAO_NAO_DIGITOS.sub("", texto_com_formatacao)
 
 
 def analisar_tipo_codigo(codigo_limpo: str) -> str:
@@ -132,14 +180,14 @@ def analisar_tipo_codigo(codigo_limpo: str) -> str:
     tamanho = len(codigo_limpo)
 
     # Verifica se é chave PIX (CPF, CNPJ, telefone, EVP)
-    if re.fullmatch(r"\d{11}", codigo_limpo):
+    if _PADRAO_CPF.fullmatch(codigo_limpo):
         return "PIX (CPF)"
-    if re.fullmatch(r"\d{14}", codigo_limpo):
+    if _PADRAO_CNPJ.fullmatch(codigo_limpo):
         return "PIX (CNPJ)"
-    if re.fullmatch(r"\d{10,13}", codigo_limpo):
+    if _PADRAO_TELEFONE.fullmatch(codigo_limpo):
         return "PIX (Telefone)"
     # Verifica se é chave EVP (chave aleatória PIX)
-    if re.fullmatch(r"[a-fA-F0-9]{32}", codigo_limpo):
+    if _PADRAO_EVP.fullmatch(codigo_limpo):
         return "PIX (Chave Aleatória EVP)"
     # Verifica se é email (não só dígitos)
     if "@" in codigo_limpo:
@@ -164,11 +212,7 @@ def limpar_codigo(codigo: str) -> str:
     - Para PIX: mantém o original (apenas tira espaços nas pontas).
     """
     # Detecta tipo PIX antes de limpar
-    if (
-        "@" in codigo
-        or codigo.startswith("000201")
-        or re.fullmatch(r"[a-fA-F0-9]{32}", codigo)
-    ):
+    if "@" in codigo or codigo.startswith("000201") or _PADRAO_EVP.fullmatch(codigo):
         return codigo.strip()
     # Para CPF, CNPJ, telefone (só dígitos)
     return extrair_somente_digitos_numericos(codigo)
@@ -287,6 +331,229 @@ def exibir_resultado_resumido(detalhes: dict, logger: logging.Logger) -> None:
     )
 
 
+def ler_em_lotes(caminho: Path, tamanho_lote: int) -> Iterator[list[str]]:
+    """
+    Lê o arquivo em blocos de linhas, sem carregá-lo inteiro em memória.
+
+    Args:
+        caminho: Arquivo com um código por linha
+        tamanho_lote: Quantidade de linhas por bloco
+
+    Returns:
+        Iterador de blocos de linhas, sem a quebra de linha
+    """
+    with caminho.open(encoding="utf-8", errors="replace") as arquivo:
+        while lote := [linha.rstrip("\r\n") for linha in islice(arquivo, tamanho_lote)]:
+            yield lote
+
+
+def normalizar_lote(lote: list[str]) -> list[str]:
+    """Aplica ``limpar_codigo`` a um bloco de linhas (executa no processo filho)."""
+    return [limpar_codigo(linha) for linha in lote]
+
+
+def classificar_lote(codigos: list[str]) -> list[str]:
+    """Aplica ``analisar_tipo_codigo`` a um bloco (executa no processo filho)."""
+    return [analisar_tipo_codigo(codigo) for codigo in codigos]
+
+
+def mapear_em_paralelo[T, R](
+    executor: ProcessPoolExecutor,
+    funcao: Callable[[T], R],
+    lotes: Iterable[T],
+    max_pendentes: int,
+) -> Iterator[tuple[T, R]]:
+    """
+    Como ``executor.map``, mas lendo os lotes aos poucos: no máximo
+    ``max_pendentes`` ficam na fila, e os resultados saem na ordem de entrada.
+    """
+    pendentes: deque[tuple[T, Future[R]]] = deque()
+    for lote in lotes:
+        if len(pendentes) >= max_pendentes:
+            lote_pronto, futuro = pendentes.popleft()
+            yield lote_pronto, futuro.result()
+        pendentes.append((lote, executor.submit(funcao, lote)))
+    while pendentes:
+        lote_pronto, futuro = pendentes.popleft()
+        yield lote_pronto, futuro.result()
+
+
+def comparar_arquivos(
+    arquivo1: Path,
+    arquivo2: Path,
+    arquivo_diff: Path,
+    logger: logging.Logger,
+    processos: int | None = None,
+    tamanho_lote: int = TAMANHO_LOTE_PADRAO,
+) -> dict:
+    """
+    Compara dois arquivos com um código por linha (ex.: banco x ERP).
+
+    O primeiro arquivo vira um índice (código limpo -> números das linhas);
+    o segundo é lido em blocos e cada código é procurado no índice. A
+    limpeza e a classificação dos códigos rodam em paralelo, por blocos.
+    As divergências vão para ``arquivo_diff`` (CSV separado por ";") e só um
+    resumo é registrado no log.
+
+    Args:
+        arquivo1: Primeiro arquivo de códigos
+        arquivo2: Segundo arquivo de códigos
+        arquivo_diff: Onde gravar as linhas sem correspondente
+        logger: Logger para o resumo
+        processos: Quantidade de processos (padrão: número de núcleos)
+        tamanho_lote: Linhas por bloco processado
+
+    Returns:
+        Dicionário com o resumo da comparação
+    """
+    inicio = time.perf_counter()
+    processos = processos or os.cpu_count() or 1
+    max_pendentes = processos * LOTES_PENDENTES_POR_PROCESSO
+
+    indice: dict[str, list[int]] = {}
+    # Divergências do arquivo 2: (linha, original, limpo)
+    somente2: list[tuple[int, str, str]] = []
+    totais = [0, 0]
+    iguais = 0
+
+    with ProcessPoolExecutor(max_workers=processos) as executor:
+        numero = 0
+        for lote, limpos in mapear_em_paralelo(
+            executor,
+            normalizar_lote,
+            ler_em_lotes(arquivo1, tamanho_lote),
+            max_pendentes,
+        ):
+            for limpo in limpos:
+                numero += 1
+                if limpo:
+                    totais[0] += 1
+                    indice.setdefault(limpo, []).append(numero)
+            del lote
+
+        numero = 0
+        for lote, limpos in mapear_em_paralelo(
+            executor,
+            normalizar_lote,
+            ler_em_lotes(arquivo2, tamanho_lote),
+            max_pendentes,
+        ):
+            for original, limpo in zip(lote, limpos, strict=True):
+                numero += 1
+                if not limpo:
+                    continue
+                totais[1] += 1
+                linhas = indice.get(limpo)
+                if linhas:
+                    linhas.pop()
+                    iguais += 1
+                else:
+                    somente2.append((numero, original, limpo))
+
+        # O que sobrou no índice não tem correspondente no arquivo 2
+        somente1_linhas = {
+            linha: limpo for limpo, linhas in indice.items() for linha in linhas
+        }
+        del indice
+        somente1 = [
+            (numero, original, somente1_linhas[numero])
+            for numero, original in _linhas_selecionadas(
+                arquivo1, somente1_linhas.keys(), tamanho_lote
+            )
+        ]
+
+        divergentes = [limpo for _, _, limpo in somente1] + [
+            limpo for _, _, limpo in somente2
+        ]
+        lotes_divergentes = (
+            divergentes[i : i + tamanho_lote]
+            for i in range(0, len(divergentes), tamanho_lote)
+        )
+        tipos: list[str] = []
+        for _, tipos_lote in mapear_em_paralelo(
+            executor, classificar_lote, lotes_divergentes, max_pendentes
+        ):
+            tipos.extend(tipos_lote)
+
+    with arquivo_diff.open("w", encoding="utf-8", newline="") as diff:
+        escritor = csv.writer(diff, delimiter=";", lineterminator="\n")
+        escritor.writerow(
+            ["arquivo", "linha", "codigo_original", "codigo_limpo", "tipo"]
+        )
+        rotulos = ["1"] * len(somente1) + ["2"] * len(somente2)
+        escritor.writerows(
+            (rotulo, numero, original, limpo, tipo)
+            for rotulo, (numero, original, limpo), tipo in zip(
+                rotulos, somente1 + somente2, tipos, strict=True
+            )
+        )
+
+    resumo = {
+        "arquivo1": str(arquivo1),
+        "arquivo2": str(arquivo2),
+        "total_arquivo1": totais[0],
+        "total_arquivo2": totais[1],
+        "iguais": iguais,
+        "somente_arquivo1": len(somente1),
+        "somente_arquivo2": len(somente2),
+        "divergencias_por_tipo": dict(Counter(tipos).most_common()),
+        "arquivo_diff": str(arquivo_diff),
+        "segundos": round(time.perf_counter() - inicio, 3),
+    }
+    exibir_resumo_arquivos(resumo, logger)
+    return resumo
+
+
+def _linhas_selecionadas(
+    caminho: Path, numeros: Iterable[int], tamanho_lote: int
+) -> Iterator[tuple[int, str]]:
+    # Relê o arquivo em blocos devolvendo só as linhas pedidas, em ordem
+    procurados = sorted(numeros)
+    posicao = 0
+    numero = 0
+    for lote in ler_em_lotes(caminho, tamanho_lote):
+        for linha in lote:
+            numero += 1
+            if posicao < len(procurados) and procurados[posicao] == numero:
+                posicao += 1
+                yield numero, linha
+        if posicao == len(procurados):
+            return
+
+
+def exibir_resumo_arquivos(resumo: dict, logger: logging.Logger) -> None:
+    """
+    Exibe o resumo da comparação em massa (poucas linhas, sem uma por par).
+
+    Args:
+        resumo: Dicionário retornado por ``comparar_arquivos``
+        logger: Logger para registrar o resumo
+    """
+    logger.info("")
+    logger.info(f"{CYAN}{BOLD}📚 COMPARAÇÃO DE ARQUIVOS{RESET}")
+    logger.info(f"{GRAY}{'─' * 40}{RESET}")
+    logger.info(
+        f"  Arquivo 1: {resumo['arquivo1']} ({resumo['total_arquivo1']} códigos)"
+    )
+    logger.info(
+        f"  Arquivo 2: {resumo['arquivo2']} ({resumo['total_arquivo2']} códigos)"
+    )
+    logger.info(f"  ✅ {GREEN}Iguais: {resumo['iguais']}{RESET}")
+    divergencias = resumo["somente_arquivo1"] + resumo["somente_arquivo2"]
+    if divergencias:
+        logger.warning(
+            f"  🚫 {RED}Somente no arquivo 1: {resumo['somente_arquivo1']}{RESET}"
+        )
+        logger.warning(
+            f"  🚫 {RED}Somente no arquivo 2: {resumo['somente_arquivo2']}{RESET}"
+        )
+        for tipo, quantidade in resumo["divergencias_por_tipo"].items():
+            logger.warning(f"     {tipo}: {quantidade}")
+        logger.info(f"  {ITALIC}Divergências em:{RESET} {resumo['arquivo_diff']}")
+    logger.info(f"  Tempo: {resumo['segundos']:.1f} s")
+    logger.info(f"{GRAY}{'─' * 40}{RESET}")
+
+
 def criar_parser_argumentos() -> argparse.ArgumentParser:
     """
     Cria o parser para argumentos da linha de comando.
@@ -306,6 +573,9 @@ Exemplos de uso:
   
   # Argumentos curtos:
   python comparador_codigos.py -c1 '123-456' -c2 '123456' -d
+
+  # Comparação em massa de dois arquivos (um código por linha):
+  python comparador_codigos.py -a1 banco.txt -a2 erp.txt --diff divergencias.csv
         """,
         formatter_class=argparse.RawDescriptionHelpFormatter,
     )
@@ -332,6 +602,41 @@ Exemplos de uso:
         help="Segundo código para comparação (pode conter formatação)",
     )
 
+    parser.add_argument(
+        "--arquivo1",
+        "-a1",
+        type=Path,
+        help="Primeiro arquivo de códigos, um por linha (modo em massa)",
+    )
+
+    parser.add_argument(
+        "--arquivo2",
+        "-a2",
+        type=Path,
+        help="Segundo arquivo de códigos, um por linha (modo em massa)",
+    )
+
+    parser.add_argument(
+        "--diff",
+        type=Path,
+        help="CSV com as divergências do modo em massa (padrão: pasta logs)",
+    )
+
+    parser.add_argument(
+        "--processos",
+        "-p",
+        type=int,
+        default=None,
+        help="Processos usados no modo em massa (padrão: número de núcleos)",
+    )
+
+    parser.add_argument(
+        "--tamanho-lote",
+        type=int,
+        default=TAMANHO_LOTE_PADRAO,
+        help=f"Linhas processadas por bloco (padrão: {TAMANHO_LOTE_PADRAO})",
+    )
+
     parser.add_argument(
         "--silencioso",
         "-s",
@@ -367,6 +672,28 @@ def main() -> int:
         parser = criar_parser_argumentos()
         args = parser.parse_args()
 
+        # Modo em massa: compara dois arquivos inteiros
+        if args.arquivo1 or args.arquivo2:
+            if not args.arquivo1 or not args.arquivo2:
+                logger.error(
+                    "🚫 Erro: Informe os dois arquivos (--arquivo1 e --arquivo2)"
+                )
+                return 2
+            data_hoje = datetime.now().strftime("%Y-%m-%d_%H%M%S")
+            arquivo_diff = args.diff or (
+                Path(__file__).parent.parent / "logs" / f"divergencias_{data_hoje}.csv"
+            )
+            resumo = comparar_arquivos(
+                args.arquivo1,
+                args.arquivo2,
+                arquivo_diff,
+                logger,
+                processos=args.processos,
+                tamanho_lote=args.tamanho_lote,
+            )
+            divergencias = resumo["somente_arquivo1"] + resumo["somente_arquivo2"]
+            return 1 if divergencias else 0
+
         # Determinar códigos a usar (posicionais ou nomeados)
         codigo1 = args.codigo1 or args.codigo1_pos
         codigo2 = args.codigo2 or args.codigo2_pos
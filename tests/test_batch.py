@@ -0,0 +1,89 @@
+import sys
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+
+import pytest
+
+# O batch importa o decode_bar, que levanta ImportError sem o zbar
+pytest.importorskip("pyzbar.pyzbar", exc_type=ImportError)
+
+from bar_code_reader import batch
+from bar_code_reader.batch import expand_sources
+from bar_code_reader.decode_bar import DecodeBar, DecodeResult
+
+BOLETO_CODE = "23799552000003700003381260007827139500006330"
+BOLETO_LINE = "23793381286000782713695000063305955200000370000"
+
+
+@pytest.fixture
+def tree(tmp_path: Path) -> Path:
+    for name in (
+        "b.png",
+        "a.PDF",
+        "notas.txt",
+        "c/z.jpg",
+        "c/d/y.png",
+        "c/leia-me.md",
+        "bb.jpeg",
+    ):
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.touch()
+    (tmp_path / "c.png").mkdir()  # Diretório com extensão de imagem
+    return tmp_path
+
+
+def _names(paths: Iterable[Path], root: Path) -> list[str]:
+    return [path.relative_to(root).as_posix() for path in paths]
+
+
+def test_expands_directory_in_sorted_order(tree: Path):
+    assert _names(expand_sources([str(tree)]), tree) == ["a.PDF", "b.png", "bb.jpeg"]
+
+
+def test_recursive_walk_matches_sorted_rglob(tree: Path):
+    walked = _names(expand_sources([str(tree)], recursive=True), tree)
+    assert walked == ["a.PDF", "b.png", "bb.jpeg", "c/d/y.png", "c/z.jpg"]
+    extensions = {".pdf", ".png", ".jpg", ".jpeg"}
+    expected = [
+        path
+        for path in sorted(tree.rglob("*"))
+        if path.is_file() and path.suffix.lower() in extensions
+    ]
+    assert walked == _names(expected, tree)
+
+
+def test_files_given_directly_are_kept(tree: Path):
+    sources = [str(tree / "notas.txt"), str(tree / "c"), "faltando.png"]
+    assert list(expand_sources(sources)) == [
+        tree / "notas.txt",
+        tree / "c" / "z.jpg",
+        Path("faltando.png"),
+    ]
+
+
+def _fake_decode_many(
+    sources: Iterable[Path], **kwargs: object
+) -> Iterator[DecodeResult]:
+    for source in sources:
+        name = source.as_posix()
+        if name.endswith(".pdf"):
+            yield DecodeResult(name, [BOLETO_CODE, "https://pix"], None, 1)
+            yield DecodeResult(name, [], "RuntimeError: falhou", 2)
+        else:
+            yield DecodeResult(name, [])
+
+
+def test_output_format(
+    monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+):
+    monkeypatch.setattr(DecodeBar, "decode_many", staticmethod(_fake_decode_many))
+    monkeypatch.setattr(sys, "argv", ["batch", "doc.pdf", "foto.png"])
+    assert batch.main() == 1
+    out, err = capsys.readouterr()
+    assert out.splitlines() == [
+        f"doc.pdf;1;{BOLETO_CODE};{BOLETO_LINE}",
+        "doc.pdf;1;https://pix;https://pix",
+        "foto.png;;;",
+    ]
+    assert err.splitlines() == ["doc.pdf;2;ERRO;RuntimeError: falhou"]
@@ -0,0 +1,47 @@
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from bar_code_reader.boleto_batch import BoletoBatch
+from bar_code_reader.guides import CollectionGuide, TransferGuide, convert_code
+from bar_code_reader.vectorized import digit_matrix
+
+TRANSFER_CODE = "23799552000003700003381260007827139500006330"
+COLLECTION_CODE = "83680000000566780048100018097565731300158963"
+CODES = [TRANSFER_CODE, COLLECTION_CODE] * 3
+
+
+def test_slice_with_step_keeps_vectorized_fields():
+    batch = BoletoBatch.from_codes(CODES)
+    subset = batch[::2]
+    assert len(subset) == 3
+    assert subset.check_digit_valid.all()
+    assert subset.value_cents.tolist() == [370000] * 3
+    assert subset.due_date.tolist() == batch.due_date[::2].tolist()
+    assert subset.total_amount() == Decimal("11100.00")
+    assert all(isinstance(guide, TransferGuide) for guide in subset)
+
+
+def test_digit_matrix_accepts_strided_views():
+    codes = np.array(CODES, dtype="S44")
+    np.testing.assert_array_equal(digit_matrix(codes[1::2]), digit_matrix(codes)[1::2])
+
+
+def test_numpy_index_returns_single_guide():
+    batch = BoletoBatch.from_codes(CODES)
+    position = np.flatnonzero(batch.is_collection)[0]
+    guide = batch[position]
+    assert isinstance(guide, CollectionGuide)
+    assert str(guide) == str(convert_code(COLLECTION_CODE))
+    assert len(batch[batch.is_collection]) == 3
+
+
+def test_rejects_codes_that_are_not_44_digits():
+    line = str(convert_code(TRANSFER_CODE))
+    with pytest.raises(ValueError, match="linha 1"):
+        BoletoBatch.from_codes([TRANSFER_CODE, line])
+    with pytest.raises(ValueError, match="linha 0"):
+        BoletoBatch.from_codes([TRANSFER_CODE[:-1]])
+    with pytest.raises(ValueError, match=r"\(n, 44\)"):
+        BoletoBatch(np.zeros((2, 44), np.uint8))
@@ -0,0 +1,73 @@
+import pytest
+
+from bar_code_reader.check_digit import (
+    modulo10,
+    modulo11_collection,
+    modulo11_transfer,
+)
+
+TRANSFER_CODE = "23799552000003700003381260007827139500006330"
+COLLECTION_MODULO10 = "83680000000566780048100018097565731300158963"
+COLLECTION_MODULO11 = [
+    "83800000000566780048100018097565731300158963",
+    "83990000000566780048100018097565731300158963",
+]
+
+
+def _resto_por_extenso(sequencia: str) -> int:
+    # Pesos 2 a 9 da direita para a esquerda, sem as tabelas do módulo
+    pesos = (2 + posicao % 8 for posicao in range(len(sequencia)))
+    return sum(int(d) * p for d, p in zip(reversed(sequencia), pesos, strict=True)) % 11
+
+
+def _sem_dv(code: str, position: int) -> str:
+    return code[:position] + code[position + 1 :]
+
+
+def test_known_barcode_check_digits():
+    assert modulo11_transfer(_sem_dv(TRANSFER_CODE, 4)) == int(TRANSFER_CODE[4])
+    assert modulo10(_sem_dv(COLLECTION_MODULO10, 3)) == int(COLLECTION_MODULO10[3])
+    for code in COLLECTION_MODULO11:
+        assert modulo11_collection(_sem_dv(code, 3)) == int(code[3])
+
+
+@pytest.mark.parametrize(
+    ("field", "digit"),
+    [("237933812", 8), ("6000782713", 6), ("9500006330", 5), ("8360000000", 0)],
+)
+def test_known_line_field_check_digits(field: str, digit: int):
+    assert modulo10(field) == digit
+    assert modulo10(field.encode()) == digit
+
+
+@pytest.mark.parametrize(
+    ("sequencia", "resto", "transfer", "collection"),
+    [
+        ("14", 0, 1, 0),  # 4 * 2 + 1 * 3 = 11
+        ("6", 1, 1, 0),  # 6 * 2 = 12
+        ("5", 10, 1, 1),  # 5 * 2 = 10
+        ("7", 3, 8, 8),  # 7 * 2 = 14
+    ],
+)
+def test_modulo11_remainder_edge_cases(
+    sequencia: str, resto: int, transfer: int, collection: int
+):
+    assert _resto_por_extenso(sequencia) == resto
+    assert modulo11_transfer(sequencia) == transfer
+    assert modulo11_collection(sequencia) == collection
+
+
+@pytest.mark.parametrize("length", [1, 43, 64, 65, 130])
+def test_modulo11_matches_reference_beyond_table(length: int):
+    # Acima de 64 dígitos os pesos vêm do ciclo, não das tabelas por posição
+    sequencia = ("9876543210" * 13)[:length]
+    resto = _resto_por_extenso(sequencia)
+    assert modulo11_collection(sequencia) == (0 if resto in (0, 1) else 11 - resto)
+    assert modulo11_transfer(sequencia) == (1 if resto in (0, 1, 10) else 11 - resto)
+
+
+def test_rejects_non_digits():
+    with pytest.raises(ValueError, match="não numéricos"):
+        modulo10("2379.3")
+    with pytest.raises(ValueError, match="não numéricos"):
+        modulo11_transfer(b"12a")
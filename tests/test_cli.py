@@ -0,0 +1,27 @@
+import sys
+
+import pytest
+
+from bar_code_reader.cli import process_input
+from bar_code_reader.decode_types import DecodeProfile
+
+BOLETO_CODE = "23799552000003700003381260007827139500006330"
+
+
+def test_text_inputs_skip_the_decoder(monkeypatch: pytest.MonkeyPatch):
+    # Uma entrada None em sys.modules faz o import levantar ImportError
+    monkeypatch.setitem(sys.modules, "bar_code_reader.decode_bar", None)
+    (record,) = process_input(BOLETO_CODE, DecodeProfile.BOLETO)
+    assert record["barcode"] == BOLETO_CODE
+    assert record["error"] is None
+
+
+def test_missing_decoder_yields_error_per_image(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setitem(sys.modules, "bar_code_reader.decode_bar", None)
+    records = [
+        record
+        for path in ("a.png", "b.pdf")
+        for record in process_input(path, DecodeProfile.BOLETO)
+    ]
+    assert [record["input"] for record in records] == ["a.png", "b.pdf"]
+    assert all("import" in record["error"] for record in records)
@@ -0,0 +1,45 @@
+from collections.abc import Iterator
+
+import pytest
+
+# O decode_bar importa o pyzbar, que levanta ImportError sem o zbar
+pytest.importorskip("pyzbar.pyzbar", exc_type=ImportError)
+
+from bar_code_reader import decode_bar, pdf_pages
+from bar_code_reader.decode_bar import DecodeResult
+from bar_code_reader.decode_types import DecodeProfile, GrayImage
+
+BLANK = GrayImage(bytes(64 * 64), 64, 64)
+
+
+def _pages_failing_at(failing: int, total: int = 3) -> Iterator[tuple[int, GrayImage]]:
+    for page in range(1, total + 1):
+        if page == failing:
+            msg = f"página {page} não rasterizada"
+            raise RuntimeError(msg)
+        yield page, BLANK
+
+
+@pytest.mark.parametrize("failing", [1, 2, 3])
+def test_pdf_error_reported_on_the_failing_page(
+    monkeypatch: pytest.MonkeyPatch, failing: int
+):
+    monkeypatch.setattr(
+        pdf_pages, "iter_pdf_pages", lambda path, dpi: _pages_failing_at(failing)
+    )
+    results = decode_bar._decode_file("doc.pdf", 100, DecodeProfile.ALL)  # noqa: SLF001
+    assert [result.page for result in results] == list(range(1, failing + 1))
+    assert all(result.error is None for result in results[:-1])
+    assert results[-1].error == f"RuntimeError: página {failing} não rasterizada"
+
+
+def test_pdf_that_does_not_open_has_no_page(monkeypatch: pytest.MonkeyPatch):
+    def broken(path: str, dpi: int) -> Iterator[tuple[int, GrayImage]]:
+        msg = "Não foi possível abrir o PDF"
+        raise ValueError(msg)
+
+    monkeypatch.setattr(pdf_pages, "iter_pdf_pages", broken)
+    results = decode_bar._decode_file("doc.pdf", 100, DecodeProfile.ALL)  # noqa: SLF001
+    assert results == [
+        DecodeResult("doc.pdf", [], "ValueError: Não foi possível abrir o PDF")
+    ]
@@ -0,0 +1,100 @@
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+# O cache guarda objetos do pyzbar, que levanta ImportError sem o zbar
+pytest.importorskip("pyzbar.pyzbar", exc_type=ImportError)
+
+from pyzbar.pyzbar import Decoded, Point, Rect
+
+from bar_code_reader import constants, decode_cache
+from bar_code_reader.decode_cache import DecodeCache, _dumps, _loads
+
+BOLETO = Decoded(
+    data=b"23799552000003700003381260007827139500006330",
+    type="I25",
+    rect=Rect(10, 20, 300, 40),
+    polygon=[Point(10, 20), Point(10, 60), Point(310, 60), Point(310, 20)],
+    quality=1,
+    orientation="UP",
+)
+PIX = Decoded(
+    data="00020126çã".encode("latin-1"),
+    type="QRCODE",
+    rect=Rect(0, 0, 50, 50),
+    polygon=[Point(0, 0), Point(0, 50), Point(50, 50)],
+    quality=1,
+    orientation=None,
+)
+
+
+def test_dumps_and_loads_round_trip():
+    assert _loads(_dumps([BOLETO, PIX])) == [BOLETO, PIX]
+    assert _loads(_dumps([])) == []
+
+
+def test_evicts_least_recently_used():
+    cache = DecodeCache(max_entries=2, ttl=None)
+    cache.put("a", [BOLETO])
+    cache.put("b", [BOLETO])
+    assert cache.get("a") == [BOLETO]  # "b" passa a ser o mais antigo
+    cache.put("c", [PIX])
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == ([BOLETO], [PIX])
+    assert (cache.hits, cache.misses) == (3, 1)
+
+
+def test_entries_expire_after_ttl(monkeypatch: pytest.MonkeyPatch):
+    now = 1000.0
+    monkeypatch.setattr(decode_cache.time, "time", lambda: now)
+    cache = DecodeCache(ttl=60)
+    cache.put("a", [BOLETO])
+    now += 60
+    assert cache.get("a") == [BOLETO]
+    now += 1
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_empty_results_are_not_cached(tmp_path: Path):
+    cache = DecodeCache(path=tmp_path / "cache.db")
+    cache.put("a", [])
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_database_shared_between_instances(tmp_path: Path):
+    path = tmp_path / "cache.db"
+    DecodeCache(path=path).put("a", [BOLETO, PIX])
+    assert DecodeCache(path=path).get("a") == [BOLETO, PIX]
+
+
+def test_new_decoder_version_wipes_database(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    path = tmp_path / "cache.db"
+    DecodeCache(path=path).put("a", [BOLETO])
+    monkeypatch.setattr(
+        decode_cache, "DECODER_VERSION", constants.DECODER_VERSION + "x"
+    )
+    assert DecodeCache(path=path).get("a") is None
+    with sqlite3.connect(path) as db:
+        assert db.execute("SELECT count(*) FROM decode_cache").fetchone() == (0,)
+
+
+def test_failed_database_write_keeps_result_in_memory(
+    tmp_path: Path, caplog: pytest.LogCaptureFixture
+):
+    path = tmp_path / "cache.db"
+    cache = DecodeCache(path=path)
+    # Outro processo segura o banco: a gravação desiste sem derrubar a leitura
+    cache._db.execute("PRAGMA busy_timeout = 0")  # noqa: SLF001
+    with sqlite3.connect(path) as other:
+        other.execute("BEGIN EXCLUSIVE")
+        cache.put("a", [BOLETO])
+        other.rollback()
+    assert "não gravado" in caplog.text
+    assert cache.get("a") == [BOLETO]
+    assert DecodeCache(path=path).get("a") is None
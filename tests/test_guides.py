@@ -0,0 +1,94 @@
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from bar_code_reader.guides import (
+    CollectionGuide,
+    TransferGuide,
+    barcode_from_digitable_line,
+    barcodes_from_digitable_lines,
+    convert_code,
+)
+
+TRANSFER_CODE = "23799552000003700003381260007827139500006330"
+TRANSFER_LINE = "23793381286000782713695000063305955200000370000"
+
+# Guias de arrecadação com cada código moeda: 6 e 7 usam módulo 10,
+# 8 e 9 módulo 11
+COLLECTION_CASES = [
+    (
+        "83680000000566780048100018097565731300158963",
+        "836800000009566780048104001809756578313001589636",
+    ),
+    (
+        "83760000000566780048100018097565731300158963",
+        "837600000009566780048104001809756578313001589636",
+    ),
+    (
+        "83800000000566780048100018097565731300158963",
+        "838000000009566780048100001809756577313001589637",
+    ),
+    (
+        "83990000000566780048100018097565731300158963",
+        "839900000003566780048100001809756577313001589637",
+    ),
+]
+
+
+def test_transfer_code_to_digitable_line():
+    guide = convert_code(TRANSFER_CODE)
+    assert isinstance(guide, TransferGuide)
+    assert str(guide) == TRANSFER_LINE
+    assert repr(guide) == "23793.38128 60007.827136 95000.063305 9 55200000370000"
+    assert guide.amount == Decimal("3700.00")
+    assert guide.vencimento == date(2012, 11, 17)
+
+
+def test_transfer_digitable_line_to_code():
+    formatted = "23793.38128 60007.827136 95000.063305 9 55200000370000"
+    assert barcode_from_digitable_line(TRANSFER_LINE) == TRANSFER_CODE
+    assert barcode_from_digitable_line(formatted) == TRANSFER_CODE
+    assert str(TransferGuide.from_digitable_line(formatted)) == TRANSFER_LINE
+
+
+@pytest.mark.parametrize(("code", "line"), COLLECTION_CASES)
+def test_collection_round_trip(code: str, line: str):
+    guide = convert_code(code)
+    assert isinstance(guide, CollectionGuide)
+    assert str(guide) == line
+    assert barcode_from_digitable_line(line) == code
+    assert str(CollectionGuide.from_digitable_line(line)) == line
+
+
+def test_collection_amount_only_for_effective_value():
+    assert convert_code(COLLECTION_CASES[0][0]).amount == Decimal("56.67")
+    assert convert_code(COLLECTION_CASES[1][0]).amount is None
+
+
+@pytest.mark.parametrize(
+    ("line", "message"),
+    [
+        # DV do primeiro campo trocado
+        ("836800000008566780048104001809756578313001589636", "campo 1"),
+        # Campos corretos, DV geral trocado (e o DV do campo 1 recalculado)
+        ("836900000008566780048104001809756578313001589636", "geral"),
+        ("835800000000566780048104001809756578313001589636", "moeda"),
+        ("23793381286000782713795000063305955200000370000", "campo 2"),
+        ("23793381286000782713695000063305855200000370000", "geral"),
+        ("2379338128600078271369500006330595520000037000", "46 dígitos"),
+    ],
+)
+def test_rejects_invalid_check_digits(line: str, message: str):
+    with pytest.raises(ValueError, match=message):
+        barcode_from_digitable_line(line)
+
+
+def test_batch_conversion_marks_invalid_lines():
+    lines = [TRANSFER_LINE, TRANSFER_LINE.replace("6000782713", "6000782714")]
+    assert list(barcodes_from_digitable_lines(lines)) == [TRANSFER_CODE, None]
+
+
+def test_convert_code_keeps_other_contents():
+    assert convert_code("https://exemplo.com.br") == "https://exemplo.com.br"
+    assert convert_code(TRANSFER_CODE[:-1]) == TRANSFER_CODE[:-1]
@@ -0,0 +1,92 @@
+import numpy as np
+import pytest
+from PIL import Image, ImageDraw
+
+from bar_code_reader.decode_types import GrayImage
+from bar_code_reader.preprocess import Box, Preprocessor
+from benchmarks.synthetic import render_i25
+
+BOLETO_CODE = "23799552000003700003381260007827139500006330"
+
+
+def capture(
+    width: int, height: int, *, rotated: bool = False, code: bool = True
+) -> tuple[Image.Image, Box]:
+    """Tela com linhas de texto e um código no centro; devolve a posição dele."""
+    canvas = Image.new("L", (width, height), 255)
+    draw = ImageDraw.Draw(canvas)
+    for y in range(40, height, 34):
+        draw.text((40, y), "Pagamento referente a fatura 123/2025 " * 4, fill=0)
+    barcode = render_i25(BOLETO_CODE, noise=15)
+    if rotated:
+        barcode = barcode.rotate(90, expand=True)
+    left, top = (width - barcode.width) // 2, (height - barcode.height) // 2
+    right, bottom = left + barcode.width, top + barcode.height
+    # Zona de silêncio em volta do código
+    draw.rectangle((left - 30, top - 30, right + 30, bottom + 30), fill=255)
+    if code:
+        canvas.paste(barcode, (left, top))
+    return canvas, (top, bottom, left, right)
+
+
+def covers(box: Box, target: Box) -> bool:
+    top, bottom, left, right = box
+    return (
+        top <= target[0]
+        and bottom >= target[1]
+        and left <= target[2]
+        and right >= target[3]
+    )
+
+
+@pytest.mark.parametrize(
+    ("width", "height", "rotated"),
+    [(1920, 1080, False), (3840, 2160, False), (1920, 1080, True)],
+)
+def test_best_candidate_covers_the_code(width: int, height: int, *, rotated: bool):
+    image, target = capture(width, height, rotated=rotated)
+    preprocessor = Preprocessor()
+    gray = preprocessor.to_gray(GrayImage(image.tobytes(), width, height))
+    boxes = preprocessor.candidate_boxes(gray)
+    assert boxes
+    assert covers(boxes[0], target)
+    # O recorte fica perto do código, não pega a tela inteira
+    top, bottom, left, right = boxes[0]
+    assert (bottom - top) * (right - left) < width * height // 8
+
+
+@pytest.mark.parametrize("mode", ["L", "RGB", "RGBA", "1"])
+def test_other_image_modes_locate_the_same_code(mode: str):
+    image, target = capture(1920, 1080)
+    preprocessor = Preprocessor()
+    boxes = preprocessor.candidate_boxes(preprocessor.to_gray(image.convert(mode)))
+    assert boxes
+    assert covers(boxes[0], target)
+
+
+def test_to_gray_matches_pillow_luma():
+    rng = np.random.default_rng(0)
+    rgb = Image.fromarray(rng.integers(0, 256, (40, 60, 3), dtype=np.uint8))
+    gray = Preprocessor().to_gray(rgb)
+    difference = gray.astype(int) - np.asarray(rgb.convert("L"), dtype=int)
+    assert np.abs(difference).max() <= 1
+
+
+def test_text_and_blank_captures_have_no_candidates():
+    preprocessor = Preprocessor()
+    blank = np.full((1080, 1920), 255, np.uint8)
+    assert preprocessor.candidate_boxes(preprocessor.to_gray(blank)) == []
+    text, _ = capture(1920, 1080, code=False)
+    assert preprocessor.candidate_boxes(preprocessor.to_gray(text)) == []
+    tiny = np.zeros((20, 20), np.uint8)
+    assert preprocessor.candidate_boxes(tiny) == []
+
+
+def test_crop_and_stretch_contrast():
+    preprocessor = Preprocessor()
+    gray = preprocessor.to_gray(np.arange(100, dtype=np.uint8).reshape(10, 10) + 50)
+    crop = preprocessor.crop(gray, (2, 5, 3, 9))
+    assert crop.shape == (3, 6)
+    assert crop.flags.c_contiguous
+    preprocessor.stretch_contrast(crop)
+    assert (crop.min(), crop.max()) == (0, 255)
@@ -0,0 +1,144 @@
+import asyncio
+import json
+import os
+from collections.abc import Awaitable, Callable
+from io import BytesIO
+
+import pytest
+
+from bar_code_reader import server
+from bar_code_reader.constants import SERVER_MAX_BODY_BYTES
+from bar_code_reader.decode_types import DecodeProfile
+from bar_code_reader.server import DecodeService, Response
+
+BOLETO_CODE = "23799552000003700003381260007827139500006330"
+
+
+def run_with_service(
+    scenario: Callable[[DecodeService], Awaitable[None]], workers: int = 1
+) -> None:
+    # Sobe os processos, executa o cenário e encerra, tudo sem abrir porta
+    async def main() -> None:
+        service = DecodeService(workers)
+        await service.start()
+        try:
+            await scenario(service)
+        finally:
+            await service.close()
+
+    asyncio.run(main())
+
+
+def body(response: Response) -> dict:
+    return json.loads(response.body)
+
+
+def boleto_png() -> bytes:
+    from benchmarks.synthetic import pad_canvas, render_i25
+
+    buffer = BytesIO()
+    pad_canvas(render_i25(BOLETO_CODE), 1200, 400).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def requires_zbar() -> None:
+    # O pyzbar levanta ImportError quando falta a biblioteca do zbar
+    pytest.importorskip("pyzbar.pyzbar", exc_type=ImportError)
+
+
+def _no_warm_up() -> None:
+    return
+
+
+def _crash_worker(data: bytes, profile: DecodeProfile) -> tuple[list[str], None]:
+    os._exit(1)
+
+
+def _fake_decode(data: bytes, profile: DecodeProfile) -> tuple[list[str], None]:
+    return [BOLETO_CODE], None
+
+
+def test_decode_reads_boleto():
+    requires_zbar()
+    image = boleto_png()
+
+    async def scenario(service: DecodeService) -> None:
+        response = await service.handle("POST", "/decode?profile=boleto", image)
+        assert response.status == 200
+        (code,) = body(response)["codes"]
+        assert code["barcode"] == BOLETO_CODE
+        assert code["line"] == "23793381286000782713695000063305955200000370000"
+
+    run_with_service(scenario)
+
+
+def test_decode_rejects_invalid_image():
+    requires_zbar()
+
+    async def scenario(service: DecodeService) -> None:
+        response = await service.handle("POST", "/decode", b"not an image")
+        assert response.status == 422
+        assert "UnidentifiedImageError" in body(response)["error"]
+
+    run_with_service(scenario)
+
+
+def test_bad_requests_answer_before_the_workers():
+    # Nenhuma dessas respostas passa pelos processos de leitura
+    async def scenario() -> None:
+        service = DecodeService(1)
+        empty = await service.handle("POST", "/decode", b"")
+        profile = await service.handle("POST", "/decode?profile=xx", b"1")
+        latin1 = await service.handle("POST", "/convert", "ção".encode("latin-1"))
+        method = await service.handle("GET", "/decode", b"")
+        assert (empty.status, profile.status, latin1.status) == (400, 400, 400)
+        assert method.status == 405
+        assert ("Allow", "POST") in method.headers
+
+    asyncio.run(scenario())
+
+
+def test_rejects_oversize_body():
+    async def scenario() -> None:
+        service = DecodeService(1)
+        response = await service.handle(
+            "POST", "/decode", bytes(SERVER_MAX_BODY_BYTES + 1)
+        )
+        assert response.status == 413
+
+    asyncio.run(scenario())
+
+
+def test_pool_failure_answers_500_and_rebuilds_pool(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(server, "_warm_worker", _no_warm_up)
+    monkeypatch.setattr(server, "_decode_upload", _crash_worker)
+
+    async def scenario(service: DecodeService) -> None:
+        broken = service._executor  # noqa: SLF001
+        response = await service.handle("POST", "/decode", b"image")
+        assert response.status == 500
+        assert "BrokenProcessPool" in body(response)["error"]
+        assert service._executor is not broken  # noqa: SLF001
+
+        # Os próximos pedidos já rodam no conjunto novo
+        monkeypatch.setattr(server, "_decode_upload", _fake_decode)
+        response = await service.handle("POST", "/decode", b"image")
+        assert response.status == 200
+        assert body(response)["codes"][0]["barcode"] == BOLETO_CODE
+
+    run_with_service(scenario)
+
+
+def test_convert_and_metrics():
+    async def scenario() -> None:
+        service = DecodeService(1)
+        line = "23793.38128 60007.827136 95000.063305 9 55200000370000"
+        response = await service.handle("POST", "/convert", f"{line}\nabc".encode())
+        valid, invalid = body(response)["codes"]
+        assert valid["barcode"] == BOLETO_CODE
+        assert invalid["barcode"] is None
+
+        metrics = body(await service.handle("GET", "/metrics", b""))
+        assert metrics["routes"]["POST /convert"]["count"] == 1
+
+    asyncio.run(scenario())
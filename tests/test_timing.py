@@ -0,0 +1,93 @@
+import json
+from pathlib import Path
+from time import perf_counter
+
+from bar_code_reader.timing import ScanTimer, ScanTiming, Span
+
+
+def test_disabled_timer_records_nothing():
+    timer = ScanTimer()
+    key = perf_counter()
+    timer.begin(key)
+    with timer.span(key, "decode"):
+        pass
+    timer.add(key, "queue_wait", 0.5)
+    assert timer.finish(key) is None
+    assert timer.recent() == []
+
+
+def test_spans_and_finish():
+    timer = ScanTimer()
+    timer.enabled = True
+    key = perf_counter()
+    timer.begin(key)
+    timer.add(key, "queue_wait", 0.25)
+    with timer.span(key, "decode"):
+        pass
+
+    scan = timer.finish(key)
+    assert isinstance(scan, ScanTiming)
+    assert [span.name for span in scan.spans] == ["queue_wait", "decode"]
+    assert scan.spans[0] == Span("queue_wait", 0.25)
+    assert scan.total >= scan.spans[1].seconds >= 0
+    assert timer.recent() == [scan]
+    # Já fechada: etapas e um segundo finish são ignorados
+    timer.add(key, "late", 1.0)
+    assert timer.finish(key) is None
+    assert [span.name for span in scan.spans] == ["queue_wait", "decode"]
+
+
+def test_unknown_and_discarded_scans_are_ignored():
+    timer = ScanTimer()
+    timer.enabled = True
+    key = perf_counter()
+    with timer.span(key, "decode"):  # Sem begin
+        pass
+    timer.begin(key)
+    timer.discard(key)
+    assert timer.finish(key) is None
+    assert timer.recent() == []
+
+
+def test_history_and_open_scans_are_bounded():
+    timer = ScanTimer(history=3)
+    timer.enabled = True
+    keys = [float(key) for key in range(5)]
+    for key in keys:
+        timer.begin(key)
+    # Só as 3 leituras abertas mais recentes sobrevivem
+    assert [timer.finish(key) is None for key in keys] == [True, True] + [False] * 3
+    for key in (10.0, 11.0):
+        timer.begin(key)
+        timer.finish(key)
+    assert [scan.key for scan in timer.recent()] == [4.0, 10.0, 11.0]
+
+
+def test_hooks_are_called_until_removed():
+    timer = ScanTimer()
+    timer.enabled = True
+    calls: list[ScanTiming] = []
+    timer.add_hook(calls.append)
+    timer.begin(1.0)
+    timer.finish(1.0)
+    timer.remove_hook(calls.append)
+    timer.begin(2.0)
+    timer.finish(2.0)
+    assert [scan.key for scan in calls] == [1.0]
+    assert [scan.key for scan in timer.recent()] == [1.0, 2.0]
+
+
+def test_dump_json(tmp_path: Path):
+    timer = ScanTimer()
+    timer.enabled = True
+    key = perf_counter()
+    timer.begin(key)
+    timer.add(key, "decode", 0.0125)
+    timer.finish(key)
+
+    path = tmp_path / "timing.json"
+    data = timer.dump_json(path)
+    assert path.read_text(encoding="utf-8") == data
+    (scan,) = json.loads(data)
+    assert scan["spans"] == {"decode": 12.5}
+    assert scan["total_ms"] >= 0
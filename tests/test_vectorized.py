@@ -0,0 +1,115 @@
+import numpy as np
+import pytest
+
+from bar_code_reader.check_digit import (
+    modulo10,
+    modulo11_collection,
+    modulo11_transfer,
+)
+from bar_code_reader.guides import CollectionGuide, TransferGuide, convert_code
+from bar_code_reader.vectorized import (
+    amounts_cents,
+    check_digits_valid,
+    digit_matrix,
+    due_dates,
+    due_dates_and_amounts,
+    has_amount,
+)
+
+TRANSFER_CODE = "23799552000003700003381260007827139500006330"
+COLLECTION_CODE = "83680000000566780048100018097565731300158963"
+
+
+def _transfer(factor: str, value: str) -> str:
+    # Boleto bancário com o DV geral recalculado para o fator e o valor
+    sem_dv = TRANSFER_CODE[:4] + factor + value + TRANSFER_CODE[19:]
+    return sem_dv[:4] + str(modulo11_transfer(sem_dv)) + sem_dv[4:]
+
+
+def _collection(currency: str) -> str:
+    sem_dv = COLLECTION_CODE[:2] + currency + COLLECTION_CODE[4:]
+    modulo = modulo10 if currency in "67" else modulo11_collection
+    return sem_dv[:3] + str(modulo(sem_dv)) + sem_dv[3:]
+
+
+def _flip_check_digit(code: str) -> str:
+    position = 3 if code.startswith("8") else 4
+    digit = str((int(code[position]) + 1) % 10)
+    return code[:position] + digit + code[position + 1 :]
+
+
+CODES = [
+    TRANSFER_CODE,
+    _transfer("0000", "0000012345"),  # Sem vencimento
+    _transfer("1000", "0000000000"),  # Novo ciclo do fator, valor em aberto
+    _transfer("9999", "9999999999"),
+    _flip_check_digit(TRANSFER_CODE),
+    *(_collection(currency) for currency in "6789"),
+    _flip_check_digit(_collection("8")),
+    _collection("5"),  # Código de moeda desconhecido
+    "0" * 44,
+]
+
+
+def _scalar_check_digit_valid(code: str) -> bool:
+    if code.startswith("8"):
+        guide = CollectionGuide(code)
+        return guide.modulo(code[:3] + code[4:]) == guide.check_digit
+    return str(modulo11_transfer(code[:4] + code[5:])) == code[4]
+
+
+def _scalar_due_date(code: str) -> np.datetime64:
+    guide = convert_code(code)
+    if isinstance(guide, TransferGuide) and int(guide.expiration_factor):
+        return np.datetime64(guide.vencimento, "D")
+    return np.datetime64("NaT", "D")
+
+
+def _scalar_cents(code: str) -> int:
+    amount = convert_code(code).amount
+    return -1 if amount is None else int(amount * 100)
+
+
+@pytest.fixture(params=["list", "array", "strided"])
+def codes(request: pytest.FixtureRequest) -> list[str] | np.ndarray:
+    if request.param == "list":
+        return CODES
+    array = np.array(CODES, dtype="S44")
+    if request.param == "array":
+        return array
+    # Cada código intercalado com um lixo: a vista [::2] não é contígua
+    interleaved = np.array([c for code in CODES for c in (code, "1" * 44)], "S44")
+    return interleaved[::2]
+
+
+def test_check_digits_match_scalar_code(codes: list[str] | np.ndarray):
+    expected = [_scalar_check_digit_valid(code) for code in CODES]
+    assert check_digits_valid(digit_matrix(codes)).tolist() == expected
+    assert expected.count(False) == 4
+
+
+def test_due_dates_and_amounts_match_scalar_code(codes: list[str] | np.ndarray):
+    digits = digit_matrix(codes)
+    expected_dates = np.array([_scalar_due_date(code) for code in CODES])
+    expected_cents = [_scalar_cents(code) for code in CODES]
+
+    np.testing.assert_array_equal(due_dates(digits), expected_dates)
+    assert has_amount(digits).tolist() == [cents >= 0 for cents in expected_cents]
+    cents = amounts_cents(digits)
+    assert cents[has_amount(digits)].tolist() == [c for c in expected_cents if c >= 0]
+
+    dates, cents = due_dates_and_amounts(codes)
+    np.testing.assert_array_equal(dates, expected_dates)
+    assert cents.tolist() == expected_cents
+
+
+def test_zero_factor_and_zero_amount():
+    dates, cents = due_dates_and_amounts(CODES[1:3])
+    assert np.isnat(dates[0])
+    assert dates[1] == np.datetime64("2025-02-22")  # Fator 1000 do novo ciclo
+    assert cents.tolist() == [12345, 0]
+
+
+def test_rejects_rows_that_are_not_44_digits():
+    digits = digit_matrix([TRANSFER_CODE, TRANSFER_CODE[:-1], TRANSFER_CODE + "0"])
+    assert check_digits_valid(digits).tolist() == [True, False, False]